@@ -3,25 +3,26 @@ from discord import app_commands
 from discord.ext import commands
 import random
 import os
-from data_manager import load_json, save_json
-from inventory_functions import add_item, remove_item, remove_ingredients, get_inventory
+from collections import Counter
+from data_manager import STORE, load_json, save_json
+from inventory_functions import get_inventory, apply_inventory_delta
 from bot_logging import logger
+from suggestions import recipe_autocomplete, resolve_recipe
+from craftability import CRAFTABILITY
 
 logger.info("✅ Alchemy module initialized")
 
-# ✅ Load required data files
-INGREDIENTS = load_json("ingredients.json") or {}
-RECIPES = load_json("recipes.json") or {}
-ENHANCED_RECIPES = load_json("enhanced_recipes.json") or {}
+MAX_BATCH = 25  # ✅ Most crafts one /craft_item can make at once
+CRITICAL_FAILURES = ["Toxic Sludge", "Explosive Mixture", "Weak Poison"]
 
 class CraftConfirmationView(discord.ui.View):
     """Confirmation UI for crafting items."""
-    def __init__(self, recipe_name, recipe_data, player_id, roll, interaction, cog):
+    def __init__(self, recipe_name, recipe_data, player_id, rolls, interaction, cog):
         super().__init__(timeout=30)
         self.recipe_name = recipe_name
         self.recipe_data = recipe_data
         self.player_id = player_id
-        self.roll = roll
+        self.rolls = rolls
         self.interaction = interaction
         self.cog = cog
 
@@ -31,7 +32,7 @@ class CraftConfirmationView(discord.ui.View):
             await interaction.response.send_message("❌ This isn't your crafting session!", ephemeral=True)
             return
 
-        success, message = self.cog.process_crafting(self.player_id, self.recipe_name, self.recipe_data)
+        success, message = await STORE.run(self.cog.process_crafting, self.player_id, self.recipe_name, self.recipe_data, self.rolls)
         await self.interaction.followup.send(message)
         self.stop()
 
@@ -46,19 +47,21 @@ class Alchemy(commands.Cog):
 
     @staticmethod
     def get_player_stats():
-        return load_json("player_stats.json") or {}
+        return load_json("player_stats.json", readonly=True) or {}
 
     @staticmethod
     def save_player_stats(self, stats):
         return save_json("player_stats.json", stats)
     
     @app_commands.command(name="alchemy", description="Provides alchemy-related help and lists available recipes.")
+    @app_commands.autocomplete(recipe=recipe_autocomplete)
     async def alchemy(self, interaction: discord.Interaction, recipe: str = None):
         """Provides alchemy guidance and recipe lookup."""
+        recipes = await STORE.get("recipes.json", readonly=True) or {}  # ✅ Cached since boot, re-read only after edits
         if recipe:
-            recipe = recipe.capitalize()
-            if recipe in RECIPES:
-                recipe_data = RECIPES[recipe]
+            recipe = await resolve_recipe(recipe)  # ✅ "potion of greater healing" → "Potion of Greater Healing"
+            if recipe in recipes:
+                recipe_data = recipes[recipe]
                 ingredients = ", ".join(recipe_data.get("modifiers", [])) or "None"
                 
                 embed = discord.Embed(title=f"Recipe: {recipe}", color=discord.Color.green())
@@ -75,32 +78,14 @@ class Alchemy(commands.Cog):
         embed = discord.Embed(title="Alchemy Guide", color=discord.Color.blue())
         embed.add_field(name="How to Craft", value="Use `/craft_item` with the correct ingredients.", inline=False)
         embed.add_field(name="View Recipes", value="Use `/alchemy [recipe]` to view specific recipes.", inline=False)
-        embed.add_field(name="Available Recipes", value=", ".join(RECIPES.keys()) if RECIPES else "No recipes found!", inline=False)
+        embed.add_field(name="Available Recipes", value=", ".join(recipes.keys()) if recipes else "No recipes found!", inline=False)
         await interaction.response.send_message(embed=embed)
 
     @app_commands.command(name="craftable", description="Check which potions and poisons you can craft based on your ingredients.")
     async def craftable(self, interaction: discord.Interaction):
         """Lists the potions and poisons the player can craft based on their available ingredients."""
         player_id = str(interaction.user.id)
-        inventory = get_inventory(player_id)  # ✅ Get shared inventory
-
-        if not inventory:
-            await interaction.response.send_message("❌ Your inventory is empty! Gather some ingredients first.")
-            return
-
-        craftable_recipes = []
-        
-        for recipe_name, recipe_data in RECIPES.items():
-            base_ingredient = recipe_data.get("base")
-            modifiers = recipe_data.get("modifiers", [])
-
-            # ✅ Check if player has base ingredient
-            if inventory.get(base_ingredient, 0) > 0:
-                missing_modifiers = [mod for mod in modifiers if inventory.get(mod, 0) == 0]
-
-                # ✅ Allow crafting even if some modifiers are missing
-                if len(missing_modifiers) < len(modifiers):
-                    craftable_recipes.append((recipe_name, missing_modifiers))
+        craftable_recipes = await STORE.run(CRAFTABILITY.craftable, player_id)  # ✅ Precomputed, no inventory scan
 
         if not craftable_recipes:
             await interaction.response.send_message("🧪 You don’t have enough ingredients to craft any potions or poisons yet.")
@@ -108,26 +93,29 @@ class Alchemy(commands.Cog):
 
         embed = discord.Embed(title="🧪 Craftable Potions & Poisons", color=discord.Color.purple())
         
-        for recipe_name, missing_mods in craftable_recipes:
-            missing_text = f"\n⚠️ Missing: {', '.join(missing_mods)}" if missing_mods else ""
-            embed.add_field(name=f"• **{recipe_name}**", value=f"✅ Craftable!{missing_text}", inline=False)
+        for recipe_name, times, missing_mods in craftable_recipes:
+            status = f"✅ Craftable x{times}" if times else f"⚠️ Missing: {', '.join(missing_mods)}"
+            embed.add_field(name=f"• **{recipe_name}**", value=status, inline=False)
 
         await interaction.response.send_message(embed=embed)
 
     @app_commands.command(name="craft_item", description="Attempt to craft a potion or poison with your own d20 roll.")
-    async def craft_item(self, interaction: discord.Interaction, recipe: str, roll: int = None, auto: bool = False):
+    @app_commands.autocomplete(recipe=recipe_autocomplete)
+    @app_commands.describe(quantity=f"How many to craft at once (up to {MAX_BATCH}); your roll counts for the first")
+    async def craft_item(self, interaction: discord.Interaction, recipe: str, roll: int = None, auto: bool = False, quantity: int = 1):
         """Handles crafting attempts where players roll their own d20."""
         player_id = str(interaction.user.id)
-        inventory = get_inventory(player_id)
+        inventory = await STORE.run(get_inventory, player_id)
 
         roll = roll or random.randint(1, 20) 
 
-        recipe_name = recipe.capitalize()
-        if recipe_name not in RECIPES:
+        recipes = await STORE.get("recipes.json", readonly=True) or {}
+        recipe_name = await resolve_recipe(recipe)
+        if recipe_name not in recipes:
             await interaction.response.send_message("❌ That recipe does not exist!")
             return
 
-        recipe_data = RECIPES[recipe_name]
+        recipe_data = recipes[recipe_name]
         base = recipe_data["base"]
         modifiers = recipe_data.get("modifiers", [])
 
@@ -136,34 +124,51 @@ class Alchemy(commands.Cog):
             await interaction.response.send_message("❌ Invalid roll! Please provide a d20 roll between 1 and 20.")
             return
 
-        # Ensure player has ingredients
-        if inventory.get(base, 0) < 1 or any(inventory.get(mod, 0) < 1 for mod in modifiers):
-            missing = [mod for mod in modifiers if inventory.get(mod, 0) == 0]
+        if quantity < 1 or quantity > MAX_BATCH:
+            await interaction.response.send_message(f"❌ You can craft between 1 and {MAX_BATCH} at a time.")
+            return
+
+        # Ensure player has ingredients for every craft in the batch
+        needs = Counter([base, *modifiers])
+        missing = [
+            f"{item} ({inventory.get(item, 0)}/{amount * quantity})"
+            for item, amount in needs.items() if inventory.get(item, 0) < amount * quantity
+        ]
+        if missing:
             await interaction.response.send_message(f"❌ You lack the required ingredients: {', '.join(missing)}.")
             return
 
+        # ✅ The player's roll counts for the first craft, the rest are rolled for them
+        rolls = [roll] + [random.randint(1, 20) for _ in range(quantity - 1)]
+
         # Process crafting with player's roll
         if auto:
             # ✅ Skip confirmation and process crafting immediately
-            success, message = self.process_crafting(player_id, recipe_name, recipe_data, roll)
+            success, message = await STORE.run(self.process_crafting, player_id, recipe_name, recipe_data, rolls)
             await interaction.response.send_message(message)
         else:
             # ✅ Require confirmation before crafting
-            view = CraftConfirmationView(recipe_name, recipe_data, player_id, interaction, self)
-            await interaction.response.send_message(
-                f"🛠️ **You rolled {roll}.** Do you want to craft **{recipe_name}**? This will use your materials.",
-                view=view,
-                ephemeral=True
+            view = CraftConfirmationView(recipe_name, recipe_data, player_id, rolls, interaction, self)
+            prompt = (
+                f"🛠️ **You rolled {roll}.** Do you want to craft **{recipe_name}**? This will use your materials."
+                if quantity == 1 else
+                f"🛠️ **Your rolls: {', '.join(map(str, rolls))}.** Do you want to craft **{quantity}x {recipe_name}**? "
+                f"This will use {quantity} sets of materials."
             )
+            await interaction.response.send_message(prompt, view=view, ephemeral=True)
 
-    def process_crafting(self, player_id, recipe_name, recipe_data, d20_roll):
-        """Processes the crafting attempt, handles failures and successes."""
+    def process_crafting(self, player_id, recipe_name, recipe_data, rolls):
+        """Resolves one craft per d20 roll and applies every ingredient & product change in one write.
+
+        Returns (success, reply). Blocking: handlers run it through `STORE`.
+        """
         stats = self.get_player_stats().get(player_id, {})
-        inventory = get_inventory(player_id)
 
         base = recipe_data["base"]
         modifiers = recipe_data.get("modifiers", [])
         dc = recipe_data["DC"]
+        enhanced_name = f"Enhanced {recipe_name}"
+        enhanced_recipes = load_json("enhanced_recipes.json", readonly=True) or {}
 
         # ✅ Calculate bonuses
         wis_mod = stats.get("wisdom", 0)
@@ -173,36 +178,60 @@ class Alchemy(commands.Cog):
         tools_bonus = 2 if stats.get("alchemist_tools", False) else 0
         total_bonus = best_mod + proficiency_bonus + tools_bonus
 
-        # ✅ Roll crafting attempt
-        final_roll = d20_roll + total_bonus
+        # ✅ Handle crafting outcomes (ingredients are consumed whatever happens)
+        results, products, botched = Counter(), Counter(), Counter()
+        for d20_roll in rolls:
+            if d20_roll == 1:
+                results["critical"] += 1
+                botched[random.choice(CRITICAL_FAILURES)] += 1
+            elif d20_roll + total_bonus < dc:
+                results["failed"] += 1
+            elif d20_roll == 20 and enhanced_name in enhanced_recipes:
+                results["enhanced"] += 1
+                products[enhanced_name] += 2
+            else:
+                results["success"] += 1
+                products[recipe_name] += 1
 
-        # ✅ Handle crafting outcomes
-        if d20_roll == 1:
-            # ❌ **Critical Failure** - Ingredients wasted, bad result created
-            failed_result = random.choice(["Toxic Sludge", "Explosive Mixture", "Weak Poison"])
-            remove_ingredients(player_id, base, modifiers)  # 🚨 Ingredients are **consumed** on critical failure!
-            logger.warning(f"Critical Failure! Player {player_id} botched {recipe_name} and created {failed_result} instead.")
-            return False, f"💀 **Critical Failure!** You messed up and created **{failed_result}** instead of {recipe_name}!"
+        delta = Counter()
+        for item in [base, *modifiers]:
+            delta[item] -= len(rolls)
+        for item, quantity in products.items():
+            delta[item] += quantity
+
+        if not apply_inventory_delta(player_id, dict(delta), action="craft"):  # ✅ One validated write for the whole batch
+            return False, f"❌ You no longer have the ingredients for {len(rolls)}x **{recipe_name}**."
+
+        logger.info(f"Player {player_id} crafted {recipe_name} x{len(rolls)}: {dict(results)}.")
+        if len(rolls) == 1:
+            return self.single_craft_reply(recipe_name, enhanced_name, results, botched)
+        return bool(products), self.batch_craft_reply(recipe_name, results, products, botched)
 
-        elif final_roll < dc:
+    @staticmethod
+    def single_craft_reply(recipe_name, enhanced_name, results, botched):
+        if results["critical"]:
+            # ❌ **Critical Failure** - Ingredients wasted, bad result created
+            return False, f"💀 **Critical Failure!** You messed up and created **{next(iter(botched))}** instead of {recipe_name}!"
+        if results["failed"]:
             # ❌ **Failure** - Ingredients wasted, but nothing gained
-            remove_ingredients(player_id, base, modifiers)  # 🚨 Ingredients are **wasted** on failure!
-            logger.info(f"Player {player_id} failed to craft {recipe_name}.")
             return False, f"❌ **Crafting Failed!** The potion failed to form correctly."
-
-        elif d20_roll == 20 and f"Enhanced {recipe_name}" in ENHANCED_RECIPES:
+        if results["enhanced"]:
             # 🌟 **Critical Success** - Enhanced potion with extra effect
-            enhanced_name = f"Enhanced {recipe_name}"
-            remove_ingredients(player_id, base, modifiers)
-            add_item(player_id, enhanced_name, 2)
-            logger.info(f"🌟 Critical Success! Player {player_id} crafted **{enhanced_name}**.")
             return True, f"🌟 **Critical Success!** You crafted **{enhanced_name}**!"
-        
-        else:
-            remove_ingredients(player_id, base, modifiers)
-            add_item(player_id, recipe_name, 1)
-            logger.info(f"Player {player_id} successfully crafted {recipe_name}.")
-            return True, f"✅ **Crafting Success!** You crafted **{recipe_name}** successfully."
+        return True, f"✅ **Crafting Success!** You crafted **{recipe_name}** successfully."
+
+    @staticmethod
+    def batch_craft_reply(recipe_name, results, products, botched):
+        table = "\n".join(
+            f"{label:<15}{results[key]:>5}"
+            for key, label in (("success", "Success"), ("enhanced", "Enhanced"), ("failed", "Failed"), ("critical", "Critical fail"))
+        )
+        reply = f"🧪 **Batch crafting: {sum(results.values())}x {recipe_name}**\n```\n{'Result':<15}{'Count':>5}\n{table}\n```"
+        if products:
+            reply += "\n✅ **You gained:** " + ", ".join(f"{item} x{quantity}" for item, quantity in products.items())
+        if botched:
+            reply += "\n💀 **Botched into:** " + ", ".join(f"{item} x{quantity}" for item, quantity in botched.items())
+        return reply
 
 async def setup(bot):
     cog = Alchemy(bot)
@@ -1,17 +1,27 @@
+import time
+BOOT_STARTED = time.perf_counter()  # ✅ Before the heavy imports, so the startup breakdown includes them
+
 import discord
 from discord import app_commands
 from discord.ext import commands
-import time
+import functools
 import os
 import asyncio
 import traceback 
 import random
-from bot_logging import logger
-from data_manager import ensure_file_exists, load_json
 from dotenv import load_dotenv
 
-# Load environment variables
+# Load environment variables (before data_manager, so STORAGE_IO_THREADS & STORAGE_BACKEND apply when it loads)
 load_dotenv()
+
+from bot_logging import logger
+from data_manager import ensure_file_exists, load_json, STORE, WRITES, BASIL_DATA_FOLDER, REQUIRED_FILES as DOCUMENTS
+from shared_inventories.inventory_service import INVENTORY
+from shared_inventories.startup import StartupTimer, prewarm, sync_if_changed
+from shared_inventories.wallet import WALLETS
+from suggestions import SUGGESTIONS
+from terrain_index import terrain_tables
+
 TOKEN = os.getenv("BOT_TOKEN")
 GUILD_ID = os.getenv("GUILD_ID")
 GUILD_ID = int(GUILD_ID) if GUILD_ID and GUILD_ID.isdigit() else None
@@ -29,9 +39,55 @@ REQUIRED_FILES = [
 for file in REQUIRED_FILES:
     ensure_file_exists(file)
 
+STARTUP = StartupTimer(BOOT_STARTED)
+COMMAND_SYNC_FILE = os.path.join(BASIL_DATA_FOLDER, "command_sync.json")  # ✅ Hash of the last synced command tree
+
+def prewarm_loads():
+    """What the first commands read: every document (into the cache), inventories, wallets and lookup indexes."""
+    loads = {name: functools.partial(load_json, name, readonly=True) for name in DOCUMENTS}
+    loads.update({
+        "inventories": INVENTORY.document.current,
+        "wallets": WALLETS.document.current,
+        "terrain tables": terrain_tables,
+        "recipe suggestions": functools.partial(SUGGESTIONS.index, "recipes"),
+        "ingredient suggestions": functools.partial(SUGGESTIONS.index, "ingredients"),
+    })
+    return loads
+
+class BasilBot(commands.Bot):
+    async def setup_hook(self):
+        """Runs once, before connecting: `on_ready` fires again on every reconnect."""
+        STARTUP.mark("login")
+        await prewarm(prewarm_loads())  # ✅ Side by side on the storage pool
+        STARTUP.mark("prewarm")
+
+        for cog in COGS:
+            try:
+                await self.load_extension(cog)
+                logger.info(f"✅ Loaded {cog}.py")
+            except Exception as e:
+                logger.error(f"❌ Failed to load {cog}.py:\n{traceback.format_exc()}")  # ✅ Logs full error trace
+        STARTUP.mark("extensions")
+
+        logger.info("🔄 Checking bot commands...")
+        try:
+            guild = discord.Object(id=GUILD_ID) if GUILD_ID else None
+            if guild:
+                self.tree.copy_global_to(guild=guild)
+            await sync_if_changed(self.tree, guild, COMMAND_SYNC_FILE)  # ✅ Only when the definitions changed
+        except Exception as e:
+            logger.error(f"❌ Error syncing commands:\n{traceback.format_exc()}")
+        STARTUP.mark("command sync")
+
+    async def close(self):
+        """Writes any queued saves to disk before disconnecting."""
+        flushed = await STORE.run(WRITES.flush)
+        logger.info(f"💾 Flushed {flushed} queued file(s) on shutdown. Write-behind: {WRITES.metrics()}")
+        await super().close()
+
 # Define bot intents and setup
 intents = discord.Intents.all()
-bot = commands.Bot(command_prefix="/", intents=intents)
+bot = BasilBot(command_prefix="/", intents=intents)
 
 COGS = [
     "admin_commands", 
@@ -61,30 +117,9 @@ async def on_ready():
     logger.info(f"🌿 Basil is online! Logged in as {bot.user}")
     await bot.change_presence(activity=discord.Game(name=random.choice(PRESENCE_MESSAGES)))
 
-    # Track setup timing
-    start_time = time.time()
-
-    for cog in COGS:
-        try:
-            await bot.load_extension(cog)
-            logger.info(f"✅ Loaded {cog}.py")
-        except Exception as e:
-            logger.error(f"❌ Failed to load {cog}.py:\n{traceback.format_exc()}")  # ✅ Logs full error trace
-    
-    logger.info("🔄 Syncing bot commands...")
-    try:
-        if GUILD_ID:
-            bot.tree.copy_global_to(guild=discord.Object(id=GUILD_ID))
-            synced = await bot.tree.sync(guild=discord.Object(id=GUILD_ID))
-        else:
-            synced = await bot.tree.sync()
-   
-        logger.info(f"✅ Synced {len(synced)} commands successfully!")
-    
-        elapsed_time = time.time() - start_time
-        logger.info(f"🚀 Basil fully loaded in {elapsed_time:.2f} seconds!")
-    except Exception as e:
-        logger.error(f"❌ Error syncing commands:\n{traceback.format_exc()}")
+    if "gateway" not in dict(STARTUP.phases):  # ✅ First connect only, not reconnects
+        STARTUP.mark("gateway")
+        logger.info(f"🚀 Basil fully loaded: {STARTUP.summary()}")
         
 @bot.tree.command(name="basil_help", description="Displays Basil's available commands.")
 async def basil_help(interaction: discord.Interaction):
@@ -129,7 +164,7 @@ async def basil_help(interaction: discord.Interaction):
 async def sync(interaction: discord.Interaction):
     """Manually sync slash commands (Admin only)."""
     try:
-        synced = await bot.tree.sync(guild=discord.Object(id=GUILD_ID))
+        synced = await sync_if_changed(bot.tree, discord.Object(id=GUILD_ID), COMMAND_SYNC_FILE, force=True)  # ✅ Records the hash too
         await interaction.response.send_message(f"✅ Synced `{len(synced)}` commands successfully!", ephemeral=True)
     except Exception as e:
         await interaction.response.send_message(f"❌ Error syncing commands: {e}", ephemeral=True)
@@ -137,6 +172,7 @@ async def sync(interaction: discord.Interaction):
 if __name__ == "__main__":
     try:
         logger.info("🚀 Starting Basil...")
+        STARTUP.mark("imports")
         bot.run(TOKEN)
     except Exception as e:
         logger.critical(f"🔥 Critical error on startup:\n{traceback.format_exc()}")  # ✅ Logs full traceback
\ No newline at end of file
@@ -0,0 +1,127 @@
+import heapq
+import re
+import threading
+from data_manager import load_json, save_json, lock_files, save_record, save_many
+
+COOLDOWNS_FILE = "player_cooldowns.json"
+TIMED_COOLDOWNS_FILE = "cooldowns.json"
+MAX_GATHER_ATTEMPTS = 3
+LEGACY_IDENTIFY_KEY = re.compile(r"^identify_(.+)_day$")
+
+def gather_attempts_left(record, today):
+    """Gather attempts a player has left on in-game day `today`.
+
+    Records are stamped with the day they were last used, so a new day restores the
+    attempts without anything being rewritten (older unstamped records count as stale).
+    """
+    if record.get("gather_day") != today:
+        return MAX_GATHER_ATTEMPTS
+    return max(0, min(record.get("gather_attempts", MAX_GATHER_ATTEMPTS), MAX_GATHER_ATTEMPTS))
+
+def use_gather_attempt(player_id, today):
+    """Spends one of the player's attempts for today. Returns how many are left, or None if none were."""
+    with lock_files(COOLDOWNS_FILE):
+        record = dict(load_json(COOLDOWNS_FILE, readonly=True).get(player_id, {}))
+        left = gather_attempts_left(record, today)
+        if left <= 0:
+            return None
+
+        record.update(gather_attempts=left - 1, gather_day=today)
+        save_record(COOLDOWNS_FILE, player_id, record)  # ✅ Only this player's record changes
+        return left - 1
+
+class CooldownStore:
+    """Timed cooldowns keyed by (player, action, target), expiring at an in-game hour.
+
+    Lookups are a dict hit; a min-heap ordered by expiry lets `sweep` drop expired entries
+    without scanning, so the persisted file only ever holds live cooldowns.
+    Persisted as `{"entries": [[player_id, action, target, expires_at], ...]}`.
+    """
+
+    def __init__(self, filename=TIMED_COOLDOWNS_FILE):
+        self.filename = filename
+        self._expiries = None  # (player_id, action, target) → in-game hour it expires at
+        self._heap = []
+        self._lock = threading.RLock()
+
+    @staticmethod
+    def key(player_id, action, target=""):
+        return (str(player_id), action, target.lower().strip())
+
+    def _ensure_loaded(self):
+        if self._expiries is not None:
+            return
+        self._expiries, self._heap = {}, []
+        for player_id, action, target, expires_at in load_json(self.filename, readonly=True).get("entries", []):
+            self._set(self.key(player_id, action, target), expires_at)
+        self._migrate_legacy()
+
+    def _migrate_legacy(self):
+        """Moves old `identify_<ingredient>_day` keys out of player_cooldowns.json (one-off)."""
+        with lock_files(COOLDOWNS_FILE, self.filename):
+            player_cooldowns = load_json(COOLDOWNS_FILE)
+            migrated = 0
+            for player_id, record in player_cooldowns.items():
+                for name in [name for name in record if LEGACY_IDENTIFY_KEY.match(name)]:
+                    target = LEGACY_IDENTIFY_KEY.match(name).group(1).replace("_", " ")
+                    self._set(self.key(player_id, "identify", target), (record.pop(name) + 1) * 24)  # ✅ Expired at the next day
+                    migrated += 1
+            if migrated:
+                save_many({COOLDOWNS_FILE: player_cooldowns, self.filename: self._snapshot()})
+
+    def _set(self, key, expires_at):
+        self._expiries[key] = expires_at
+        heapq.heappush(self._heap, (expires_at, key))
+
+    def _snapshot(self):
+        return {"entries": sorted([*key, expires_at] for key, expires_at in self._expiries.items())}
+
+    def remaining(self, player_id, action, target, now):
+        """In-game hours left on a cooldown (0 if it isn't running)."""
+        with self._lock:
+            self._ensure_loaded()
+            return max(0, self._expiries.get(self.key(player_id, action, target), now) - now)
+
+    def start(self, player_id, action, target, expires_at, now):
+        """Starts (or replaces) a cooldown ending at in-game hour `expires_at`, then persists."""
+        with self._lock:
+            self._ensure_loaded()
+            self._set(self.key(player_id, action, target), expires_at)
+            self._sweep(now)
+            save_json(self.filename, self._snapshot())
+
+    def try_start(self, player_id, action, target, expires_at, now):
+        """Starts a cooldown unless one is running, checked and started under one lock.
+
+        Returns the in-game hours left on the running cooldown, or 0 if this call started it.
+        """
+        with self._lock:
+            left = self.remaining(player_id, action, target, now)
+            if not left:
+                self.start(player_id, action, target, expires_at, now)
+            return left
+
+    def sweep(self, now):
+        """Drops every cooldown that has expired by in-game hour `now`. Returns how many went."""
+        with self._lock:
+            self._ensure_loaded()
+            removed = self._sweep(now)
+            if removed:
+                save_json(self.filename, self._snapshot())
+            return removed
+
+    def _sweep(self, now):
+        removed = 0
+        while self._heap and self._heap[0][0] <= now:
+            expires_at, key = heapq.heappop(self._heap)
+            if self._expiries.get(key) == expires_at:  # ✅ Skip stale entries from a replaced cooldown
+                del self._expiries[key]
+                removed += 1
+        return removed
+
+    def __len__(self):
+        with self._lock:
+            self._ensure_loaded()
+            return len(self._expiries)
+
+COOLDOWNS = CooldownStore()
@@ -0,0 +1,121 @@
+import threading
+from collections import Counter
+from data_manager import load_json, document_version
+from shared_inventories.inventory_service import INVENTORY, canonical_item
+
+RECIPES_FILE = "recipes.json"
+
+class CraftabilityIndex:
+    """Which recipes each player can craft, kept current as their inventory changes.
+
+    An inverted index (ingredient → recipes using it) means a change to one ingredient
+    only re-checks the recipes that need it. Per player it keeps a bitmap of fully
+    craftable recipes, how many times each can be crafted, and a bitmap of recipes
+    that are only missing some modifiers. Inventory writes made by
+    Stanley (or another process) are caught by the inventory's version token and
+    the affected players are re-derived on demand.
+    """
+
+    def __init__(self):
+        self._lock = threading.RLock()
+        self._recipes_version = None
+        self._inventory_version = None
+        self._names, self._needs, self._uses = [], [], {}
+        self._players = {}
+
+    def _build(self):
+        recipes = load_json(RECIPES_FILE, readonly=True) or {}
+        self._names = list(recipes.keys())
+        self._needs = [
+            Counter(canonical_item(item) for item in [data["base"], *data.get("modifiers", [])])
+            for data in recipes.values()
+        ]
+        self._uses = {}
+        for index, needs in enumerate(self._needs):
+            for item in needs:
+                self._uses.setdefault(item, []).append(index)
+        self._players.clear()
+
+    def _refresh(self):
+        recipes_version = document_version(RECIPES_FILE)
+        if recipes_version != self._recipes_version or not self._names:
+            self._build()
+            self._recipes_version = recipes_version
+
+        inventory_version = INVENTORY.version()
+        if inventory_version != self._inventory_version:
+            self._players.clear()  # ✅ Changed behind our back: re-derive players as they're asked for
+            self._inventory_version = inventory_version
+
+    def _player(self, player_id):
+        state = self._players.get(player_id)
+        if state is None:
+            inventory = INVENTORY.get_inventory(player_id)
+            state = {
+                "counts": {item: inventory.get(item, 0) for item in self._uses},
+                "times": [0] * len(self._names),
+                "craftable": 0,  # bitmap: recipe index → has everything
+                "partial": 0,  # bitmap: base plus some (not all) modifiers
+            }
+            for index in range(len(self._names)):
+                self._evaluate(state, index)
+            self._players[player_id] = state
+        return state
+
+    def _evaluate(self, state, index):
+        counts, needs = state["counts"], self._needs[index]
+        times = min(counts[item] // amount for item, amount in needs.items())
+        state["times"][index] = times
+        bit = 1 << index
+
+        base, *modifiers = list(needs.elements())
+        partial = not times and counts[base] > 0 and any(counts[mod] > 0 for mod in modifiers)
+        state["craftable"] = state["craftable"] | bit if times else state["craftable"] & ~bit
+        state["partial"] = state["partial"] | bit if partial else state["partial"] & ~bit
+
+    def apply_change(self, player_id, quantities, version_before, version_after):
+        """Records new `quantities` (item → count) for a player after a write we made ourselves.
+
+        Only recipes using those items are re-checked. If the file had changed since we
+        last saw it (`version_before` doesn't match), everything is re-derived instead.
+        """
+        with self._lock:
+            if self._inventory_version != version_before:
+                self._inventory_version = None  # ✅ Missed a write; rebuild lazily
+                return
+            self._inventory_version = version_after
+
+            state = self._players.get(player_id)
+            if state is None:
+                return  # ✅ Not derived yet, nothing to keep current
+            affected = set()
+            for item, quantity in quantities.items():
+                if item in state["counts"]:
+                    state["counts"][item] = quantity
+                    affected.update(self._uses[item])
+            for index in affected:
+                self._evaluate(state, index)
+
+    def on_inventory_change(self, quantities, version_before, version_after):
+        """`INVENTORY` listener: `quantities` is {player_id: {item: count}} for one write."""
+        for player_id, items in quantities.items():
+            self.apply_change(player_id, items, version_before, version_after)
+            version_before = version_after  # ✅ The index caught up with the write on the first call
+
+    def craftable(self, player_id):
+        """Lists (recipe, times craftable, missing modifiers) for a player, craftable ones first."""
+        with self._lock:
+            self._refresh()
+            state = self._player(player_id)
+            results = []
+            for index, name in enumerate(self._names):
+                if state["craftable"] >> index & 1:
+                    results.append((name, state["times"][index], []))
+            for index, name in enumerate(self._names):
+                if state["partial"] >> index & 1:
+                    missing = [item for item in self._needs[index] if state["counts"][item] == 0]
+                    results.append((name, 0, missing))
+            return results
+
+CRAFTABILITY = CraftabilityIndex()
+INVENTORY.add_listener(CRAFTABILITY.on_inventory_change)
@@ -0,0 +1,182 @@
+import random
+from collections import Counter
+
+try:
+    import numpy as np
+except ImportError:  # ✅ Optional: the pure-Python engine gives the same outcomes, just slower
+    np = None
+
+CRAFTING_BONUS = 8  # ✅ Added to Basil's d20
+ALCHEMY_MODIFIER = 5  # ✅ Substituted into enhancement text
+IMPROVISE_CHANCE = 0.4  # ✅ Chance Basil crafts anyway when ingredients are missing
+CRITICAL_FAILURES = ["Toxic Sludge", "Explosive Mixture", "Weak Poison"]
+VECTORISE_THRESHOLD = 500  # ✅ Below this, array setup costs more than the plain loop
+
+def _new_outcome(attempts):
+    return {
+        "attempts": attempts,
+        "crafted": Counter(),  # recipe → quantity
+        "enhanced": Counter(),  # (enhanced recipe, effect) → quantity
+        "critical_failures": Counter(),  # failure result → quantity
+        "failed": 0,
+        "skipped": 0,
+        "used": Counter(),  # ingredient → quantity consumed
+    }
+
+def _enhancement(enhanced_recipes, recipe, pick):
+    enhanced_name = f"Enhanced {recipe}"
+    options = enhanced_recipes[enhanced_name]["enhancements"]
+    return enhanced_name, options[pick(len(options))].replace("Alchemy Modifier", str(ALCHEMY_MODIFIER))
+
+def simulate_crafting(attempts, recipes, enhanced_recipes, stock, seed=None):
+    """Simulates `attempts` crafting attempts by Basil against `stock` (ingredient → count).
+
+    Nothing is modified or saved; apply the result with `apply_crafting_outcome`.
+    Uses NumPy for large batches when it's available.
+    """
+    if attempts <= 0 or not recipes:
+        return _new_outcome(max(0, attempts))
+    if np is not None and attempts >= VECTORISE_THRESHOLD:
+        return _simulate_vectorised(attempts, recipes, enhanced_recipes, stock, seed)
+    return _simulate_sequential(attempts, recipes, enhanced_recipes, stock, seed)
+
+def _simulate_sequential(attempts, recipes, enhanced_recipes, stock, seed):
+    """Attempt-by-attempt reference engine (used when NumPy isn't installed)."""
+    rng = random.Random(seed)
+    names = list(recipes.keys())
+    remaining = {item: max(0, count) for item, count in stock.items()}
+    outcome = _new_outcome(attempts)
+
+    for _ in range(attempts):
+        recipe = rng.choice(names)
+        recipe_data = recipes[recipe]
+        needed = [recipe_data["base"], *recipe_data.get("modifiers", [])]
+        has_ingredients = all(remaining.get(item, 0) > 0 for item in needed)
+        improvises = rng.random() < IMPROVISE_CHANCE
+        roll = rng.randint(1, 20)
+
+        if not has_ingredients and not improvises:
+            outcome["skipped"] += 1
+            continue
+
+        for item in needed:
+            if remaining.get(item, 0) > 0:
+                remaining[item] -= 1
+                outcome["used"][item] += 1
+
+        if roll == 1:
+            outcome["critical_failures"][rng.choice(CRITICAL_FAILURES)] += 1
+        elif roll + CRAFTING_BONUS < recipe_data["DC"]:
+            outcome["failed"] += 1
+        elif roll == 20 and f"Enhanced {recipe}" in enhanced_recipes:
+            outcome["enhanced"][_enhancement(enhanced_recipes, recipe, rng.randrange)] += 1
+        else:
+            outcome["crafted"][recipe] += 1
+
+    return outcome
+
+def _simulate_vectorised(attempts, recipes, enhanced_recipes, stock, seed):
+    """Draws every roll and recipe pick up front and resolves them as arrays.
+
+    Stocks only ever go down, so the attempts are processed in runs that end whenever an
+    ingredient runs out; each run is resolved in one pass, and there are at most as many
+    short runs as there are ingredients.
+    """
+    rng = np.random.default_rng(seed)
+    names = list(recipes.keys())
+    ingredients = sorted(set(stock) | {
+        item for data in recipes.values() for item in (data["base"], *data.get("modifiers", []))
+    })
+    column = {item: i for i, item in enumerate(ingredients)}
+
+    needs = np.zeros((len(names), len(ingredients)), dtype=bool)  # recipe × ingredient
+    for row, recipe in enumerate(names):
+        data = recipes[recipe]
+        for item in (data["base"], *data.get("modifiers", [])):
+            needs[row, column[item]] = True
+    dcs = np.array([recipes[recipe]["DC"] for recipe in names])
+    has_enhanced = np.array([f"Enhanced {recipe}" in enhanced_recipes for recipe in names])
+
+    picks = rng.integers(0, len(names), attempts)
+    improvises = rng.random(attempts) < IMPROVISE_CHANCE
+    rolls = rng.integers(1, 21, attempts)
+
+    remaining = np.array([max(0, stock.get(item, 0)) for item in ingredients], dtype=np.int64)
+    proceeds = np.empty(attempts, dtype=bool)
+    position, window = 0, 256
+    while position < attempts:
+        lacking = (needs & (remaining <= 0)).any(axis=1)
+        in_stock = remaining > 0
+        if not in_stock.any():
+            proceeds[position:] = ~lacking[picks[position:]] | improvises[position:]
+            break  # ✅ Nothing left to run out of
+
+        stop = min(attempts, position + window)
+        run_picks = picks[position:stop]
+        run_proceeds = ~lacking[run_picks] | improvises[position:stop]
+        usage = needs[run_picks][:, in_stock] & run_proceeds[:, None]
+        left = remaining[in_stock] - np.cumsum(usage, axis=0, dtype=np.int64)
+
+        exhausted = np.flatnonzero((left <= 0).any(axis=1))
+        if exhausted.size:
+            end = exhausted[0] + 1  # ✅ Later attempts may now lack ingredients
+        else:
+            end = len(run_picks)
+            window *= 2
+
+        proceeds[position:position + end] = run_proceeds[:end]
+        remaining[in_stock] = left[end - 1]
+        position += end
+
+    outcome = _new_outcome(attempts)
+    consumed = np.array([max(0, stock.get(item, 0)) for item in ingredients], dtype=np.int64) - remaining
+    outcome["used"] = Counter({ingredients[i]: int(n) for i, n in enumerate(consumed) if n})
+    outcome["skipped"] = int(attempts - proceeds.sum())
+
+    critical = proceeds & (rolls == 1)
+    failed = proceeds & ~critical & (rolls + CRAFTING_BONUS < dcs[picks])
+    enhanced = proceeds & ~critical & ~failed & (rolls == 20) & has_enhanced[picks]
+    crafted = proceeds & ~critical & ~failed & ~enhanced
+
+    outcome["failed"] = int(failed.sum())
+    for index, count in enumerate(np.bincount(rng.integers(0, len(CRITICAL_FAILURES), int(critical.sum())), minlength=len(CRITICAL_FAILURES))):
+        if count:
+            outcome["critical_failures"][CRITICAL_FAILURES[index]] = int(count)
+    for row, count in enumerate(np.bincount(picks[crafted], minlength=len(names))):
+        if count:
+            outcome["crafted"][names[row]] = int(count)
+    for row, count in enumerate(np.bincount(picks[enhanced], minlength=len(names))):
+        if count:
+            enhanced_name = f"Enhanced {names[row]}"
+            options = enhanced_recipes[enhanced_name]["enhancements"]
+            for option, times in enumerate(np.bincount(rng.integers(0, len(options), count), minlength=len(options))):
+                if times:
+                    effect = options[option].replace("Alchemy Modifier", str(ALCHEMY_MODIFIER))
+                    outcome["enhanced"][(enhanced_name, effect)] += int(times)
+
+    return outcome
+
+def combine_outcomes(*outcomes):
+    """Adds several simulation results together (e.g. runs before and after a market refresh)."""
+    combined = _new_outcome(0)
+    for outcome in outcomes:
+        for key, value in outcome.items():
+            combined[key] += value
+    return combined
+
+def apply_crafting_outcome(outcome, market, crafted_items):
+    """Applies a simulation result as one delta: ingredient stock out of `market`, potions into `crafted_items`."""
+    for item, count in outcome["used"].items():
+        if isinstance(market.get(item), dict):
+            market[item]["stock"] = max(0, market[item].get("stock", 0) - count)
+
+    for recipe, count in outcome["crafted"].items():
+        crafted_items[recipe] = crafted_items.get(recipe, 0) + count
+
+    for (enhanced_name, effect), count in outcome["enhanced"].items():
+        entries = crafted_items.setdefault(enhanced_name, [])
+        existing = next((entry for entry in entries if entry.get("effect") == effect), None)
+        if existing:
+            existing["quantity"] = existing.get("quantity", 0) + count
+        else:
+            entries.append({"effect": effect, "quantity": count})
@@ -1,6 +1,10 @@
 import json
 import os
+import sys
 import logging
+import threading
+from contextlib import contextmanager
+from types import MappingProxyType
 from logging import getLogger
 
 logger = getLogger(__name__)
@@ -11,6 +15,28 @@ SHARED_FOLDER = os.path.abspath(os.path.join(BASE_DIR, "..", "shared_inventories
 BASIL_DATA_FOLDER = os.path.join(BASE_DIR, "basil_data")  # ✅ Basil-specific files
 DEFAULTS_FOLDER = os.path.join(BASE_DIR, "default_game_files")  # ✅ Backup files
 
+if os.path.dirname(BASE_DIR) not in sys.path:
+    sys.path.append(os.path.dirname(BASE_DIR))  # ✅ Makes the `shared_inventories` helpers importable
+
+from shared_inventories.atomic_io import (
+    atomic_write_json, atomic_write_bytes, atomic_write_many, recover_pending_commits,
+    restore_latest_backup, quarantine_file
+    )
+from shared_inventories.async_store import AsyncStore
+from shared_inventories.changes import clone, file_signature, update_document
+from shared_inventories.document_codec import encode, read_document
+from shared_inventories.file_lock import file_lock, file_locks
+from shared_inventories.journal import JOURNAL
+from shared_inventories.storage import get_record_store
+from shared_inventories.shared_document import version_token, write_record
+from shared_inventories.state_client import StateDaemonError, get_state_client, on_change
+from shared_inventories.write_behind import WriteBehind
+
+JOURNAL.source = "basil"  # ✅ Journal entries written from this process say which bot made them
+
+# ✅ Rolling `.bakN` copies kept for shared files (the ones both bots write to)
+BACKUP_GENERATIONS = 2
+
 # ✅ Required Files & Default Data
 REQUIRED_FILES = {
     "enhanced_recipes.json": (BASIL_DATA_FOLDER, {}),  
@@ -18,6 +44,7 @@ REQUIRED_FILES = {
     "ingredients.json": (BASIL_DATA_FOLDER, {}),  
     "market.json": (BASIL_DATA_FOLDER, {"last_update": 0}),  
     "player_cooldowns.json": (BASIL_DATA_FOLDER, {}),  # ✅ Tracks player cooldowns
+    "cooldowns.json": (BASIL_DATA_FOLDER, {"entries": []}),  # ✅ Timed (player, action, target) cooldowns
     "recipes.json": (BASIL_DATA_FOLDER, {}),  
     "responses.json": (BASIL_DATA_FOLDER, {}),
     "terrain_tables.json": (BASIL_DATA_FOLDER, {}),  
@@ -27,6 +54,51 @@ REQUIRED_FILES = {
     "player_inventories.json": (SHARED_FOLDER, {})
 }
 
+# ✅ Basil-only files saved over and over in one command (time, cooldowns, market): written behind.
+# Shared files stay write-through; with the state daemon running it batches those itself.
+WRITE_BEHIND_FILES = {"in_game_time.json", "player_cooldowns.json", "cooldowns.json", "market.json"}
+
+# ✅ Finish any multi-file commit a crash interrupted, before anything reads the files
+for folder in (SHARED_FOLDER, BASIL_DATA_FOLDER):
+    recover_pending_commits(folder)
+
+# ✅ Process-wide document cache: filename -> {"signature", "data", "frozen"}
+_document_cache = {}
+_cache_lock = threading.RLock()
+
+def _freeze(data):
+    """Builds a read-only view of JSON data (dicts become mapping proxies, lists become tuples)."""
+    if isinstance(data, dict):
+        return MappingProxyType({key: _freeze(value) for key, value in data.items()})
+    if isinstance(data, list):
+        return tuple(_freeze(value) for value in data)
+    return data
+
+def _cache_store(filename, signature, data):
+    """Stores a private copy of `data` in the document cache."""
+    entry = {"signature": signature, "data": data, "frozen": None}
+    with _cache_lock:
+        _document_cache[filename] = entry
+    return entry
+
+def _cache_view(entry, readonly):
+    """Hands out a view of a cache entry that callers can't use to corrupt the cache."""
+    if not readonly:
+        return clone(entry["data"])  # ✅ Callers own the copy and may mutate it freely
+
+    with _cache_lock:
+        if entry["frozen"] is None:
+            entry["frozen"] = _freeze(entry["data"])  # ✅ Built once, shared by all readers
+        return entry["frozen"]
+
+def invalidate_cache(filename=None):
+    """Drops one document (or every document) from the cache so the next load re-reads disk."""
+    with _cache_lock:
+        if filename is None:
+            _document_cache.clear()
+        else:
+            _document_cache.pop(filename, None)
+
 def ensure_file_exists(filename):
     """Ensures a required file exists, copying from defaults or creating an empty one."""
     if filename not in REQUIRED_FILES:
@@ -41,39 +113,114 @@ def ensure_file_exists(filename):
         os.makedirs(folder, exist_ok=True)  # ✅ Ensure directory exists
 
         if os.path.exists(default_path):
-            with open(default_path, "r", encoding="utf-8") as src, open(file_path, "w", encoding="utf-8") as dst:
-                dst.write(src.read())  # ✅ Copy default file
+            with open(default_path, "rb") as src:
+                atomic_write_bytes(file_path, src.read())  # ✅ Copy default file
             logger.info(f"📄 Created `{filename}` from defaults.")
         else:
-            with open(file_path, "w", encoding="utf-8") as dst:
-                json.dump(default_content, dst, indent=4)  # ✅ Create empty file
+            atomic_write_json(file_path, default_content)  # ✅ Create empty file
             logger.warning(f"⚠️ `{filename}` was missing! Created an empty one.")
 
-def load_json(filename, retry=True):
-    """Loads a JSON file, ensuring it exists first."""
+def load_json(filename, retry=True, readonly=False):
+    """Loads a JSON file, ensuring it exists first.
+
+    Repeat loads are served from the document cache until the file changes on disk.
+    By default the caller gets its own mutable copy; pass `readonly=True` for a shared,
+    immutable view that skips the copy (for lookups that never modify the data).
+    """
     if filename not in REQUIRED_FILES:
         logger.error(f"⚠️ `{filename}` is not in REQUIRED_FILES! Check path definitions.")
         return None
 
+    client = get_state_client(filename)
+    if client:
+        return _load_from_daemon(filename, client, readonly)  # ✅ SHARED_STATE_SOCKET
+
+    store = get_record_store(filename)
+    if store:
+        return _load_from_store(filename, store, readonly)  # ✅ STORAGE_BACKEND=sqlite / sharded
+
     folder, _ = REQUIRED_FILES[filename]  # ✅ Get correct folder
     file_path = os.path.join(folder, filename)
 
-    ensure_file_exists(filename)  # ✅ Ensure file exists before loading
+    signature = file_signature(file_path)
+    if signature is None:
+        ensure_file_exists(filename)  # ✅ Ensure file exists before loading
+        signature = file_signature(file_path)
+
+    pending = WRITES.get(filename)
+    with _cache_lock:
+        entry = _document_cache.get(filename)
+        if pending is not None and not (entry and entry["data"] is pending):
+            entry = _cache_store(filename, None, pending)  # ✅ Saved but not flushed yet: newer than disk
+        if entry and (entry["signature"] == signature or entry["data"] is pending):
+            return _cache_view(entry, readonly)  # ✅ Cache hit (or a save not yet on disk), no disk I/O
 
     try:
-        with open(file_path, "r", encoding="utf-8") as file:
-            return json.load(file)
+        with file_lock(file_path, shared=True):
+            signature = file_signature(file_path)  # ✅ Re-stat under the lock, a writer may have just finished
+            data = read_document(file_path)  # ✅ Whichever codec wrote it
     except json.JSONDecodeError as e:
         if retry:  # Prevent infinite recursion
-            logger.error(f"❌ `{filename}` is corrupted! Resetting to default. Error: {e}")
-            os.remove(file_path)
-            return load_json(filename, retry=False)  # ✅ Try once more
+            logger.error(f"❌ `{filename}` is corrupted! Moved it to `{quarantine_file(file_path)}`. Error: {e}")
+            invalidate_cache(filename)
+            restore_latest_backup(file_path, _backup_generations(filename))  # ✅ Falls back to defaults if none
+            return load_json(filename, retry=False, readonly=readonly)  # ✅ Try once more
         else:
             logger.critical(f"⚠️ `{filename}` failed to reload! Creating a blank version.")
-            return REQUIRED_FILES.get(filename, (None, {}))[1]  # ✅ Return default structure
+            data = clone(REQUIRED_FILES.get(filename, (None, {}))[1])  # ✅ Return default structure
+            return _freeze(data) if readonly else data
+
+    return _cache_view(_cache_store(filename, signature, data), readonly)
+
+def _load_from_store(filename, store, readonly):
+    """Loads a document from the SQLite or sharded backend, re-using the cache until any bot commits."""
+    signature = (store.kind, store.version())
+    with _cache_lock:
+        entry = _document_cache.get(filename)
+        if entry and entry["signature"] == signature:
+            return _cache_view(entry, readonly)
+
+    return _cache_view(_cache_store(filename, signature, store.load_document(filename)), readonly)
+
+def _load_from_daemon(filename, client, readonly):
+    """Loads a document held by the state daemon; it only re-sends it after a change.
+
+    Read-only loads are answered from the cache while it matches the version the daemon
+    last pushed; read-modify-writes always ask, so they never start from a stale copy.
+    """
+    pushed = client.pushed_version(filename) if readonly else None
+    if pushed:
+        with _cache_lock:
+            entry = _document_cache.get(filename)
+            if entry and entry["signature"] == ("daemon", pushed):
+                return _cache_view(entry, readonly)  # ✅ No round trip
+
+    version, data = client.load(filename, copy=False)
+    signature = ("daemon", version)
+    with _cache_lock:
+        entry = _document_cache.get(filename)
+        if entry and entry["signature"] == signature:
+            return _cache_view(entry, readonly)
+
+    return _cache_view(_cache_store(filename, signature, data), readonly)  # ✅ The client never mutates it
+
+def _drop_changed(document, version):
+    """Forgets cached daemon documents as soon as the daemon says they changed."""
+    with _cache_lock:
+        for filename, entry in list(_document_cache.items()):
+            signature = entry["signature"]
+            if signature and signature[0] == "daemon" and document in (None, filename) and signature != ("daemon", version):
+                del _document_cache[filename]
+
+on_change(_drop_changed)
+
+def _backup_generations(filename):
+    """Number of rolling backups kept for a file (only shared files are backed up)."""
+    folder, _ = REQUIRED_FILES[filename]
+    return BACKUP_GENERATIONS if folder == SHARED_FOLDER else 0
 
 def save_json(filename, data):
-    """Saves data to a JSON file."""
+    """Saves data to a JSON file atomically (temp file + fsync + rename)."""
     if filename not in REQUIRED_FILES:
         logger.error(f"⚠️ `{filename}` is not in REQUIRED_FILES! Check path definitions.")
         return
@@ -81,14 +228,139 @@ def save_json(filename, data):
     folder, _ = REQUIRED_FILES[filename]  # ✅ Get correct folder
     file_path = os.path.join(folder, filename)
 
+    client = get_state_client(filename)
+    if client:
+        try:
+            version = client.save({filename: data})[filename]
+            _cache_store(filename, ("daemon", version), clone(data))
+            logger.info(f"✅ Saved `{filename}` to the state daemon.")
+        except Exception as e:
+            invalidate_cache(filename)
+            logger.error(f"❌ Failed to save `{filename}` to the state daemon. Error: {e}")
+        return
+
+    store = get_record_store(filename)
+    if store:
+        try:
+            changed = store.save_document(filename, data)  # ✅ Only changed rows are written
+            _cache_store(filename, (store.kind, store.version()), clone(data))
+            logger.info(f"✅ Saved `{filename}` to {store.label} ({changed} rows changed).")
+        except Exception as e:
+            invalidate_cache(filename)
+            logger.error(f"❌ Failed to save `{filename}` to {store.label}. Error: {e}")
+        return
+
+    if filename in WRITE_BEHIND_FILES and WRITES.enabled():
+        entry = _cache_store(filename, None, clone(data))
+        WRITES.save(filename, entry["data"])  # ✅ Written once the window closes, with any later saves
+        return
+
     try:
-        os.makedirs(folder, exist_ok=True)  # ✅ Ensure directory exists
-        with open(file_path, "w", encoding="utf-8") as file:
-            json.dump(data, file, indent=4)
+        with file_lock(file_path):
+            atomic_write_bytes(file_path, encode(filename, data), backups=_backup_generations(filename))
+            _cache_store(filename, file_signature(file_path), clone(data))  # ✅ Write-through
         logger.info(f"✅ Saved `{filename}` to `{folder}`.")
     except Exception as e:
+        invalidate_cache(filename)
         logger.error(f"❌ Failed to save `{filename}` to `{folder}`. Error: {e}")
 
+def _write_behind(filename, data):
+    """Writes a queued document (the caller holds its lock) and marks the cached copy as on disk."""
+    file_path = _file_path(filename)
+    atomic_write_bytes(file_path, encode(filename, data), backups=_backup_generations(filename))
+    with _cache_lock:
+        entry = _document_cache.get(filename)
+        if entry and entry["data"] is data:
+            entry["signature"] = file_signature(file_path)
+    logger.info(f"✅ Flushed `{filename}` to disk.")
+
+def save_many(documents):
+    """Saves several documents as one commit: after a crash either all of them change or none do.
+
+    Hold `lock_files(...)` on them around the read-modify-write that produced `documents`.
+    Raises `StateDaemonError` if only some of them are held by the state daemon: those
+    couldn't be committed together.
+    """
+    held = [filename for filename in documents if get_state_client(filename)]
+    if held and len(held) < len(documents):
+        raise StateDaemonError(f"Can't save {', '.join(held)} (state daemon) in one commit with files.")
+
+    store, store_documents, payloads, backups = None, {}, {}, {}
+    daemon_documents, versions = {}, {}
+    for filename, data in documents.items():
+        if get_state_client(filename):
+            daemon_documents[filename] = data  # ✅ Saved together by the daemon, not by this commit
+        elif get_record_store(filename):
+            store = get_record_store(filename)
+            store_documents[filename] = data
+        else:
+            payloads[_file_path(filename)] = encode(filename, data)
+            backups[_file_path(filename)] = _backup_generations(filename)
+
+    try:
+        with file_locks(list(payloads)):
+            if daemon_documents:
+                client = get_state_client(next(iter(daemon_documents)))
+                versions = {name: ("daemon", version) for name, version in client.save(daemon_documents).items()}
+            if store_documents:
+                store.save_documents(store_documents)  # ✅ One SQLite transaction / shard commit
+            atomic_write_many(payloads, backups)  # ✅ One journaled commit across the JSON files
+            WRITES.discard(documents)  # ✅ Anything still queued for these files is older than this commit
+            for filename, data in documents.items():
+                if filename in versions:
+                    signature = versions[filename]
+                elif filename in store_documents:
+                    signature = (store.kind, store.version())
+                else:
+                    signature = file_signature(_file_path(filename))
+                _cache_store(filename, signature, clone(data))
+        logger.info(f"✅ Saved {', '.join(f'`{name}`' for name in documents)} in one commit.")
+    except Exception as e:
+        for filename in documents:
+            invalidate_cache(filename)
+        logger.error(f"❌ Failed to save {', '.join(f'`{name}`' for name in documents)}. Error: {e}")
+
+def _file_path(filename):
+    folder, _ = REQUIRED_FILES[filename]
+    return os.path.join(folder, filename)
+
+@contextmanager
+def lock_files(*filenames):
+    """Holds exclusive cross-process locks on several files for a read-modify-write.
+
+    Loads & saves inside the block re-use the held locks. Don't `await` inside it.
+    """
+    with file_locks([_file_path(filename) for filename in filenames]):
+        yield
+
+def update_json(filename):
+    """Read-modify-write one file under an exclusive lock, saving only if the data changed.
+
+        with update_json("player_stats.json") as stats:
+            stats[user_id]["level"] += 1
+    """
+    return update_document(filename, lock_files, load_json, save_json)
+
+def document_version(filename):
+    """A cheap token that changes whenever a document changes (for indexes built on top of it)."""
+    return version_token(filename, _file_path(filename))
+
+def save_record(filename, key, value):
+    """Writes one top-level entry (e.g. one player's inventory) without rewriting the others.
+
+    Row-level on the SQLite & sharded backends; a locked read-modify-write of the file otherwise.
+    Passing `value=None` removes the entry.
+    """
+    if write_record(filename, key, value, update_json):
+        invalidate_cache(filename)  # ✅ Written past the document cache
+
+# ✅ Awaitable versions of the calls above for the cogs, run on the storage thread pool
+STORE = AsyncStore(load_json, save_json, update_json)
+
+# ✅ Queued saves of WRITE_BEHIND_FILES; flushed on `bot.close()`, SIGTERM and exit
+WRITES = WriteBehind(_file_path, _write_behind)
+WRITES.flush_at_exit()
+
 def reset_data(target: str):
     """Resets recipes, ingredients, or both."""
     if target.lower() not in ["recipes", "ingredients", "all"]:
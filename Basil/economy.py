@@ -4,57 +4,44 @@ from discord.ext import commands
 import random
 import time
 import os
-from data_manager import load_json, save_json 
-from inventory_functions import add_item, remove_item, get_inventory
+from data_manager import STORE, document_version
+from inventory_functions import add_item, apply_inventory_delta
 from bot_logging import logger
+from market_state import MARKET_FILE, INGREDIENTS_FILE, MARKET_PAGES, ingredients, generate_market, load_market, save_market
+from suggestions import ingredient_autocomplete, resolve_ingredient
+from shared_inventories.render_cache import paginate_lines
+from shared_inventories.pagination import send_pages
+from shared_inventories.wallet import WALLETS, Money
 
 logger.info("✅ Economy module initialized")
 
 # ✅ File paths
-MARKET_FILE = "market.json"
-GOLD_FILE = "gold_data.json"
 STATS_FILE = "player_stats.json"
 
-INGREDIENTS = load_json("ingredients.json") or {}
-
-def generate_market():
-    """Generates a fresh market with randomized base prices that last for one week."""
-    market = {}
-    for ingredient, data in INGREDIENTS.items():
-        rarity = data.get("rarity", "Common")
-        price_ranges = {"Common": (5, 15), "Uncommon": (15, 30), "Rare": (30, 50), "Very Rare": (50, 100)}
-        base_price = random.randint(*price_ranges.get(rarity, (5, 15)))  # ✅ Base price independent of player stats
-
-        market[ingredient] = {
-            "base_price": base_price,  # ✅ Fixed market price for the week
-            "stock": random.randint(1, 5)
-        }
-
-    market["last_update"] = time.time()  # ✅ Track last update
-    save_market(market)
-    return market
-
-def load_market():
-    """Loads the market, regenerating it if a week has passed."""
-    market = load_json(MARKET_FILE) or {}
-
-    # ✅ Refresh if it's been more than 7 days
-    if time.time() - market.get("last_update", 0) > 7 * 24 * 60 * 60:
-        logger.info("🔄 Market prices refreshed after one week!")
-        return generate_market()
-    
-    return market
-
-def save_market(market_data):
-    """Saves the current market state to file."""
-    save_json(MARKET_FILE, market_data)
-    logger.info("✅ Market state saved.")
+def render_market(market):
+    """Builds the market's page embeds."""
+    ingredient_data = ingredients()
+    lines = [
+        f"**{item}** (Stock: {market[item]['stock'] if market[item]['stock'] > 0 else '❌ Out of Stock'})"
+        f" - {ingredient_data.get(item, {}).get('rarity', 'Common')} - `{market[item]['base_price']} gp`"
+        for item in market if item != "last_update"
+    ]
+    pages = paginate_lines(lines)
+    return [
+        discord.Embed(title="🛒 Market Inventory", description=page, color=discord.Color.blue())
+        .set_footer(text=f"Page {number}/{len(pages)}")
+        for number, page in enumerate(pages, start=1)
+    ]
 
 class Economy(commands.Cog):
     def __init__(self, bot):
         self.bot = bot
         self.market = load_market() or generate_market()
 
+    def snapshot(self):
+        """A copy of the market for worker threads: `self.market` is only changed on the event loop."""
+        return {item: dict(data) if isinstance(data, dict) else data for item, data in self.market.items()}
+
     @app_commands.command(name="market", description="View available ingredients for purchase.")
     async def market(self, interaction: discord.Interaction):
         """Displays the current market inventory."""
@@ -62,42 +49,36 @@ class Economy(commands.Cog):
             await interaction.response.send_message("🛒 The market is empty. Check back later!")
             return
 
-        market_items = "\n".join([
-            f"**{item}** (Stock: {self.market[item]['stock'] if self.market[item]['stock'] > 0 else '❌ Out of Stock'})"
-            f" - {INGREDIENTS.get(item, {}).get('rarity', 'Common')} - `{self.market[item]['base_price']} gp`"
-            for item in self.market if item != "last_update"
-        ])
-        
-        embed = discord.Embed(title="🛒 Market Inventory", description=market_items, color=discord.Color.blue())
+        market = self.snapshot()  # ✅ Rendered on a worker while /buy & /sell keep changing `self.market` on the loop
+        pages = await STORE.run(MARKET_PAGES.get, "market", lambda: document_version(MARKET_FILE), lambda: render_market(market))
         logger.info(f"User {interaction.user} viewed the market inventory.")
-        await interaction.response.send_message(embed=embed)
+        await send_pages(interaction.response.send_message, pages, interaction.user)
 
     @app_commands.command(name="quote", description="Get the current price for selling an ingredient.")
+    @app_commands.autocomplete(ingredient=ingredient_autocomplete)
     async def quote(self, interaction: discord.Interaction, ingredient: str):
         """Provides a quote for the selling price of an ingredient, based on player stats."""
-        ingredient = ingredient.capitalize()
+        ingredient = await resolve_ingredient(ingredient)
         user_id = str(interaction.user.id)
-        stats = load_json(STATS_FILE).get(user_id, {})
+        stats = (await STORE.get(STATS_FILE, readonly=True)).get(user_id, {})
+        ingredient_data = await STORE.get(INGREDIENTS_FILE, readonly=True) or {}
 
         # ✅ Base player stats
         cha_mod = stats.get("charisma", 0)
         persuasion_bonus = 2 if stats.get("proficient_persuasion", False) else 0
 
-        base_price = self.market.get(ingredient, {}).get("base_price", INGREDIENTS.get(ingredient, {}).get("base_price", 15))
+        base_price = self.market.get(ingredient, {}).get("base_price", ingredient_data.get(ingredient, {}).get("base_price", 15))
 
         final_price = max(1, base_price + cha_mod + persuasion_bonus)  # ✅ Ensures non-negative price
 
         await interaction.response.send_message(f"💰 Current selling price for **{ingredient}**: `{final_price} gp`.")
         
     @app_commands.command(name="buy", description="Purchase an ingredient from the market.")
+    @app_commands.autocomplete(ingredient=ingredient_autocomplete)
     async def buy(self, interaction: discord.Interaction, ingredient: str):
         """Allows players to buy ingredients from the market."""
-        ingredient = ingredient.capitalize()
+        ingredient = await resolve_ingredient(ingredient)
         user_id = str(interaction.user.id)
-        gold_data = load_json(GOLD_FILE) or {}
-
-        # ✅ Ensure player gold entry exists
-        gold_data.setdefault(user_id, {"gp": 0, "sp": 0, "cp": 0})
 
         # ✅ Check if the item is in the market
         if ingredient not in self.market or self.market[ingredient]["stock"] <= 0:
@@ -106,55 +87,49 @@ class Economy(commands.Cog):
 
         price = self.market[ingredient]["base_price"]
 
-        if gold_data[user_id]["gp"] < price:
+        # ✅ Reduce stock in market before awaiting anything, so two buyers can't both get the last one
+        self.market[ingredient]["stock"] -= 1
+
+        # ✅ One locked integer update, shared with Stanley's wallet
+        if not await STORE.run(WALLETS.debit, user_id, Money.of(gp=price), action="buy"):
+            self.market[ingredient]["stock"] += 1
             await interaction.response.send_message("❌ You don't have enough gold!")
             return
 
-        # ✅ Deduct gold and update inventory
-        gold_data[user_id]["gp"] -= price
-        save_json(GOLD_FILE, gold_data, folder=SHARED_FOLDER)
-        add_item(user_id, ingredient, 1)
-
-        # ✅ Reduce stock in market
-        self.market[ingredient]["stock"] -= 1
-        save_market(self.market)
+        await STORE.run(add_item, user_id, ingredient, 1, action="buy")
+        await STORE.run(save_market, self.snapshot())
 
         logger.info(f"User {interaction.user} purchased {ingredient} for {price} gp.")
         await interaction.response.send_message(f"✅ You purchased **{ingredient}** for `{price} gp`!")
 
     @app_commands.command(name="sell", description="Sell an ingredient.")
+    @app_commands.autocomplete(ingredient=ingredient_autocomplete)
     async def sell(self, interaction: discord.Interaction, ingredient: str):
         """Allows players to sell ingredients to the market."""
-        ingredient = ingredient.capitalize()
+        ingredient = await resolve_ingredient(ingredient)
         user_id = str(interaction.user.id)
-        gold_data = load_json(GOLD_FILE) or {}
-        stats = load_json(STATS_FILE).get(user_id, {})
-
-        # ✅ Check if the player owns the item
-        player_inventory = get_inventory(user_id)
-        if ingredient not in player_inventory or player_inventory[ingredient] <= 0:
-            logger.warning(f"User {interaction.user} tried to sell {ingredient} but has none.")
-            await interaction.response.send_message(f"❌ You don't have any **{ingredient}** to sell.")
-            return
+        stats = (await STORE.get(STATS_FILE, readonly=True)).get(user_id, {})
+        ingredient_data = await STORE.get(INGREDIENTS_FILE, readonly=True) or {}
 
         # ✅ Get base market price
-        self.market.setdefault(ingredient, {"base_price": INGREDIENTS.get(ingredient, {}).get("base_price", 10), "stock": 0})
-
-        base_price = self.market[ingredient]["base_price"]
+        base_price = self.market.get(ingredient, {}).get("base_price", ingredient_data.get(ingredient, {}).get("base_price", 10))
 
         # ✅ Apply Charisma & Persuasion bonuses dynamically
         cha_mod = stats.get("charisma", 0)
         persuasion_bonus = 2 if stats.get("proficient_persuasion", False) else 0
         final_price = max(1, base_price + cha_mod + persuasion_bonus)  # ✅ Ensures non-negative price
 
-        # ✅ Remove item & add gold
-        remove_item(user_id, ingredient, 1)
-        gold_data[user_id]["gp"] += final_price
-        save_json(GOLD_FILE, gold_data, folder=SHARED_FOLDER)
+        # ✅ Remove item & add gold (the removal is checked in the same locked write, so it can't be sold twice)
+        if not await STORE.run(apply_inventory_delta, user_id, {ingredient: -1}, action="sell"):
+            logger.warning(f"User {interaction.user} tried to sell {ingredient} but has none.")
+            await interaction.response.send_message(f"❌ You don't have any **{ingredient}** to sell.")
+            return
+        await STORE.run(WALLETS.credit, user_id, Money.of(gp=final_price), action="sell")
 
         # ✅ Add item to market
+        self.market.setdefault(ingredient, {"base_price": base_price, "stock": 0})
         self.market[ingredient]["stock"] += 1
-        save_market(self.market)
+        await STORE.run(save_market, self.snapshot())
 
         logger.info(f"User {interaction.user} (ID: {user_id}) sold {ingredient} for {final_price} gp.")
         await interaction.response.send_message(f"💰 You sold **{ingredient}** for `{final_price} gp`.")
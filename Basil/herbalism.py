@@ -1,22 +1,25 @@
 import discord
 from discord import ui, app_commands
 from discord.ext import commands
+import asyncio
 import random
 import os
-from data_manager import load_json, save_json
+from data_manager import STORE
 from inventory_functions import add_item, remove_item
 from bot_logging import logger
+from suggestions import SUGGESTIONS, ingredient_autocomplete
+from cooldowns import COOLDOWNS, use_gather_attempt
+from world_clock import HOURS_PER_DAY, in_game_hour
+from terrain_index import terrain_tables
 
 logger.info("✅ Herbalism module initialized")
 
 class TerrainSelect(ui.Select):
     """Dropdown menu for selecting a terrain type."""
     def __init__(self, interaction, roll):
-        terrain_tables = load_json("terrain_tables.json")
-
         options = [
             discord.SelectOption(label=terrain, value=terrain)
-            for terrain in terrain_tables.keys()
+            for terrain in terrain_tables().keys()
         ]
 
         super().__init__(placeholder="Choose a terrain to gather herbs...", min_values=1, max_values=1, options=options)
@@ -54,51 +57,17 @@ class Herbalism(commands.Cog):
             return
 
         player_id = str(interaction.user.id)
-        player_cooldowns = load_json("player_cooldowns.json") or {}
-        in_game_time = load_json("in_game_time.json")
-        terrain_tables = load_json("terrain_tables.json")
-        MAX_GATHER_ATTEMPTS = 3
-        cooldowns_modified = False
-
-        if player_id not in player_cooldowns:
-            player_cooldowns[player_id] = {"gather_attempts": 3, "last_gather_hour": -999}
-            cooldowns_modified = True
-
-        # ✅ Ensure in-game time is tracked
-        if "hours" not in in_game_time:
-            in_game_time["hours"], in_game_time["days"] = 0, 0
-            save_json("in_game_time.json", in_game_time)
-
-        if in_game_time["hours"] >= 24:
-            in_game_time["days"] += in_game_time["hours"] // 24  # ✅ Correctly increment days
-            in_game_time["hours"] %= 24  # ✅ Carry over remaining hours
-
-            for player in player_cooldowns:
-                player_cooldowns[player]["gather_attempts"] = 3  # ✅ Reset for all players
-                cooldowns_modified = True
-
-            save_json("in_game_time.json", in_game_time)
-
-        # ✅ Check if gather attempts should reset before limiting it
-        if player_cooldowns[player_id]["gather_attempts"] > MAX_GATHER_ATTEMPTS:
-            player_cooldowns[player_id]["gather_attempts"] = MAX_GATHER_ATTEMPTS
-            cooldowns_modified = True
-
-        # ✅ Prevent gathering if attempts are 0
-        if player_cooldowns[player_id]["gather_attempts"] <= 0:
-            await interaction.response.send_message("❌ You've gathered enough for now. Try again after a long rest.")
-            return
+        today = (await STORE.get("in_game_time.json", readonly=True)).get("days", 0)
 
-        if not terrain_tables:
+        if not await STORE.run(terrain_tables):
             await interaction.response.send_message("❌ No terrain data found. Admin should update `terrain_tables.json`.")
             return
 
-        # ✅ Deduct one attempt
-        player_cooldowns[player_id]["gather_attempts"] -= 1
-        cooldowns_modified = True
-        
-        if cooldowns_modified:
-            save_json("player_cooldowns.json", player_cooldowns)
+        # ✅ Deduct one attempt (attempts refill lazily when the in-game day changes)
+        if await STORE.run(use_gather_attempt, player_id, today) is None:
+            await interaction.response.send_message("❌ You've gathered enough for now. Try again after a long rest.")
+            return
+
         await interaction.response.send_message(
             "🌍 **Select a terrain to gather herbs from:**",
             view=TerrainView(interaction, roll),
@@ -106,6 +75,7 @@ class Herbalism(commands.Cog):
         )
 
     @app_commands.command(name="identify", description="Identify an unknown herb with an Herbalism check.")
+    @app_commands.autocomplete(ingredient=ingredient_autocomplete)
     async def identify(self, interaction: discord.Interaction, ingredient: str, roll: int = None):
         """Allows players to identify herbs using their stats."""
         roll = roll or random.randint(1, 20)
@@ -115,10 +85,12 @@ class Herbalism(commands.Cog):
             return
     
         player_id = str(interaction.user.id)
-        stats = load_json("player_stats.json").get(player_id, {})
-        ingredients = load_json("ingredients.json")
-        player_cooldowns = load_json("player_cooldowns.json")
-        in_game_time = load_json("in_game_time.json")
+        all_stats, ingredients, in_game_time = await asyncio.gather(  # ✅ Read side by side on the storage pool
+            STORE.get("player_stats.json", readonly=True),
+            STORE.get("ingredients.json", readonly=True),
+            STORE.get("in_game_time.json", readonly=True),
+        )
+        stats = all_stats.get(player_id, {})
 
         ingredient = ingredient.lower().strip().replace(" ", "_")
 
@@ -128,7 +100,7 @@ class Herbalism(commands.Cog):
             identified_ingredient = random.choice(possible_common_ingredients)  # Pick one at random
             ingredient_to_remove = "Common Ingredient"  # Correct name in inventory
         else:
-            identified_ingredient = next((key for key in ingredients.keys() if key.lower() == ingredient), None)
+            identified_ingredient = await STORE.run(SUGGESTIONS.canonical, "ingredients", ingredient.replace("_", " "))
             ingredient_to_remove = identified_ingredient
 
         if not identified_ingredient:
@@ -142,8 +114,9 @@ class Herbalism(commands.Cog):
             await interaction.response.send_message("❌ I can't seem to find details on this ingredient. Check your spelling!")
             return
 
-        last_identify_day = player_cooldowns.get(player_id, {}).get(f"identify_{ingredient}_day", -999)
-        if in_game_time["days"] - last_identify_day < 1:
+        now = in_game_hour(in_game_time)
+        next_day = (in_game_time["days"] + 1) * HOURS_PER_DAY  # ✅ One attempt per ingredient per in-game day
+        if await STORE.run(COOLDOWNS.try_start, player_id, "identify", ingredient_to_remove, next_day, now):
             await interaction.response.send_message(f"❌ You have already attempted to identify **{ingredient}** today. Try again tomorrow.")
             return
 
@@ -159,24 +132,19 @@ class Herbalism(commands.Cog):
         if roll >= dc:
             # ✅ Success: Update inventory
             logger.info(f"User {interaction.user} successfully identified {identified_ingredient}.")
-            remove_item(player_id, ingredient_to_remove, 1)  # Remove the unidentified version
-            add_item(player_id, identified_ingredient, 1)  # Add identified herb
-            player_cooldowns.setdefault(player_id, {})[f"identify_{ingredient}_day"] = in_game_time["days"]
-            save_json("player_cooldowns.json", player_cooldowns)
+            await STORE.run(remove_item, player_id, ingredient_to_remove, 1, action="identify")  # Remove the unidentified version
+            await STORE.run(add_item, player_id, identified_ingredient, 1, action="identify")  # Add identified herb
 
             await interaction.response.send_message(f"✅ Success! You identify **{identified_ingredient}**: {ingredients[identified_ingredient]['effect']}")
         else:
             # ❌ Failure
             logger.info(f"User {interaction.user} failed to identify {ingredient}.")
-            player_cooldowns.setdefault(player_id, {})[f"identify_{ingredient}_day"] = in_game_time["days"]
-            save_json("player_cooldowns.json", player_cooldowns)
             await interaction.response.send_message("❌ You failed to identify the herb. Try again later!")
             
 async def gather_execute(interaction: discord.Interaction, terrain: str, roll_value: int = None):
     """Handles the actual herb gathering logic."""
     player_id = str(interaction.user.id)
-    stats = load_json("player_stats.json").get(player_id, {})
-    terrain_tables = load_json("terrain_tables.json")
+    stats = (await STORE.get("player_stats.json", readonly=True)).get(player_id, {})
 
     roll_value = roll_value or random.randint(1,20)
 
@@ -185,7 +153,8 @@ async def gather_execute(interaction: discord.Interaction, terrain: str, roll_va
             return
 
     # Validate terrain exists in our tables.
-    if terrain not in terrain_tables:
+    table = (await STORE.run(terrain_tables)).get(terrain)
+    if not table:
         await interaction.response.send_message("❌ Invalid terrain selection!")
         return
 
@@ -195,24 +164,19 @@ async def gather_execute(interaction: discord.Interaction, terrain: str, roll_va
     kit_bonus = 2 if stats.get("herbalism_kit", False) else 0
     total_roll = roll_value + best_mod + proficiency_bonus + kit_bonus
 
-    # Look up the terrain data.
-    terrain_data = terrain_tables[terrain]
-    # Convert keys to integers (assuming keys are stored as strings of numbers).
-    valid_keys = [int(k) for k in terrain_data.keys() if int(k) <= total_roll]
-
-    ingredient_name = terrain_data.get(str(max(valid_keys))) if valid_keys else "Nothing found"
+    # ✅ One array index into the precompiled table (ingredient & rarity already joined)
+    found = table.lookup(total_roll)
+    ingredient_name, rarity = found if found else ("Nothing found", None)
     quantity = random.randint(1, 4)
 
     logger.info(f"User {interaction.user} rolled {total_roll} = {best_mod} (stat) + {proficiency_bonus} (prof) + {kit_bonus} (kit). Found: {ingredient_name}.")
 
-    if ingredient_name == "Nothing found":
+    if not found:
         await interaction.response.send_message("❌ The area seems barren. You found nothing.")
         return
     
     # ✅ Add the found ingredient
-    ingredient_info = load_json("ingredients.json").get(ingredient_name, {})
-    rarity = ingredient_info.get("rarity", "Unknown")
-    add_item(player_id, ingredient_name, quantity)
+    await STORE.run(add_item, player_id, ingredient_name, quantity, action="gather")
     logger.info(f"User {interaction.user} gathered {quantity}x {ingredient_name} in {terrain}.")
 
     await interaction.response.send_message(
@@ -2,7 +2,8 @@ import discord
 from discord import app_commands
 from discord.ext import commands
 import os
-from inventory_functions import add_item, remove_item, get_inventory
+from data_manager import STORE
+from inventory_functions import add_item, remove_item, get_inventory, canonical_item
 from bot_logging import logger
 
 logger.info("✅ Inventory module initialized")
@@ -15,7 +16,7 @@ class Inventory(commands.Cog):
     async def basil_inventory(self, interaction: discord.Interaction):
         """Displays the user's inventory."""
         player_id = str(interaction.user.id)
-        inventory = get_inventory(player_id) or {}
+        inventory = await STORE.run(get_inventory, player_id) or {}
         
         if not inventory:
             await interaction.response.send_message("Your inventory is empty.")
@@ -45,7 +46,7 @@ class Inventory(commands.Cog):
             return
 
         player_id = str(member.id)
-        add_item(player_id, item, quantity)
+        await STORE.run(add_item, player_id, item, quantity)
 
         logger.info(f"Admin {interaction.user} added {quantity}x {item} to {member}.")
         await interaction.response.send_message(f"Added {quantity}x {item} to {member.mention}'s inventory.", ephemeral=True)
@@ -59,14 +60,15 @@ class Inventory(commands.Cog):
             return
 
         player_id = str(member.id)
-        inventory = get_inventory(player_id) or {}
+        item = canonical_item(item)  # ✅ Stored names are canonical, whatever the admin typed
+        inventory = await STORE.run(get_inventory, player_id) or {}
 
         # ✅ Check if the player actually has enough of the item
         if item not in inventory or inventory[item] < quantity:
             await interaction.response.send_message(f"❌ {member.mention} does not have `{quantity}x {item}` to remove.", ephemeral=True)
             return
 
-        remove_item(player_id, item, quantity)
+        await STORE.run(remove_item, player_id, item, quantity)
         logger.info(f"Admin {interaction.user} removed {quantity}x {item} from {member}.")
         await interaction.response.send_message(f"✅ **Removed** `{quantity}x {item}` from {member.mention}'s inventory.", ephemeral=True)
 
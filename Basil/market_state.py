@@ -0,0 +1,55 @@
+import random
+import time
+from data_manager import load_json, save_json
+from bot_logging import logger
+from shared_inventories.render_cache import RenderCache
+
+MARKET_FILE = "market.json"
+INGREDIENTS_FILE = "ingredients.json"
+MARKET_WEEK_SECONDS = 7 * 24 * 60 * 60
+
+# ✅ Market pages are rebuilt only when the market's stock or prices change
+MARKET_PAGES = RenderCache()
+
+def ingredients():
+    """Ingredient data from the document cache (warmed at boot, re-read only after the file changes)."""
+    return load_json(INGREDIENTS_FILE, readonly=True) or {}
+
+def build_market():
+    """Builds a fresh market with randomized base prices that last for one week (not saved)."""
+    market = {}
+    for ingredient, data in ingredients().items():
+        rarity = data.get("rarity", "Common")
+        price_ranges = {"Common": (5, 15), "Uncommon": (15, 30), "Rare": (30, 50), "Very Rare": (50, 100)}
+        base_price = random.randint(*price_ranges.get(rarity, (5, 15)))  # ✅ Base price independent of player stats
+
+        market[ingredient] = {
+            "base_price": base_price,  # ✅ Fixed market price for the week
+            "stock": random.randint(1, 5)
+        }
+
+    market["last_update"] = time.time()  # ✅ Track last update
+    return market
+
+def generate_market():
+    """Generates and saves a fresh market."""
+    market = build_market()
+    save_market(market)
+    return market
+
+def load_market():
+    """Loads the market, regenerating it if a week has passed."""
+    market = load_json(MARKET_FILE) or {}
+
+    # ✅ Refresh if it's been more than 7 days
+    if time.time() - market.get("last_update", 0) > MARKET_WEEK_SECONDS:
+        logger.info("🔄 Market prices refreshed after one week!")
+        return generate_market()
+    
+    return market
+
+def save_market(market_data):
+    """Saves the current market state to file."""
+    save_json(MARKET_FILE, market_data)
+    MARKET_PAGES.invalidate("market")
+    logger.info("✅ Market state saved.")
@@ -2,7 +2,7 @@ import discord
 from discord import app_commands
 from discord.ext import commands
 import os
-from data_manager import load_json, save_json
+from data_manager import STORE, save_record
 from bot_logging import logger
 
 logger.info("✅ PlayerStats module initialized")
@@ -26,10 +26,9 @@ class PlayerStats(commands.Cog):
     ):
         """Players set their intelligence & wisdom modifiers, proficiency bonus, and tool proficiencies."""
         user_id = str(interaction.user.id)
-        stats = load_json("player_stats.json")
 
         # ✅ Update player's stats
-        stats[user_id] = {
+        stats = {
             "intelligence_mod": intelligence,
             "wisdom_mod": wisdom,
             "proficiency_bonus": proficiency,
@@ -38,8 +37,8 @@ class PlayerStats(commands.Cog):
             "alchemist_tools": alchemist_tools
         }
 
-        # ✅ Save to file
-        save_json("player_stats.json", stats)
+        # ✅ Save just this player's record, off the event loop
+        await STORE.run(save_record, "player_stats.json", user_id, stats)
 
         # ✅ Confirm update
         await interaction.response.send_message(
@@ -5,7 +5,7 @@ import os
 import random
 from data_manager import load_json, save_json
 
-RESPONSES = load_json("responses.json") or {}
+RESPONSES_FILE = "responses.json"
 
 logger.info("✅ Responses module initialized")
 
@@ -16,15 +16,16 @@ class Responses(commands.Cog):
     @staticmethod
     def get_response(category, **kwargs):
         """Fetches a random response from the specified category."""
-        if not RESPONSES:
+        responses = load_json(RESPONSES_FILE, readonly=True) or {}  # ✅ Document cache: warmed at boot
+        if not responses:
             logger.error("⚠️ responses.json failed to load or is empty!")
             return "Error: No response file found."
 
-        if category not in RESPONSES:
+        if category not in responses:
             logger.warning(f"⚠️ Response category `{category}` not found.")
             return "🤔 Stanley scratches his head. _'I wasn't prepared for that one!'_"
 
-        return random.choice(RESPONSES[category]).format(**kwargs)
+        return random.choice(responses[category]).format(**kwargs)
 
 async def setup(bot):
     cog = Responses(bot)
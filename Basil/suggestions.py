@@ -0,0 +1,39 @@
+import discord
+from discord import app_commands
+from data_manager import load_json, document_version, STORE
+from shared_inventories.autocomplete import AutocompleteService
+
+# ✅ One index per document, rebuilt only when that document changes on disk.
+# Checking its version (and any rebuild) reads storage, so it runs on the storage pool, never on the loop.
+SUGGESTIONS = AutocompleteService()
+
+SUGGESTIONS.register(
+    "recipes",
+    lambda: document_version("recipes.json"),
+    lambda: list(load_json("recipes.json", readonly=True).keys())
+)
+SUGGESTIONS.register(
+    "ingredients",
+    lambda: document_version("ingredients.json"),
+    lambda: list(load_json("ingredients.json", readonly=True).keys())
+)
+
+async def resolve_recipe(text):
+    """Maps any casing of a recipe name to its stored spelling (falls back to the old capitalize)."""
+    return await STORE.run(SUGGESTIONS.canonical, "recipes", text) or text.capitalize()
+
+async def resolve_ingredient(text):
+    """Maps any casing of an ingredient name to its stored spelling (falls back to the old capitalize)."""
+    return await STORE.run(SUGGESTIONS.canonical, "ingredients", text) or text.capitalize()
+
+async def _choices(source, current):
+    names = await STORE.run(SUGGESTIONS.complete, source, current)
+    return [app_commands.Choice(name=name, value=name) for name in names]
+
+async def recipe_autocomplete(interaction: discord.Interaction, current: str):
+    """Suggests recipe names."""
+    return await _choices("recipes", current)
+
+async def ingredient_autocomplete(interaction: discord.Interaction, current: str):
+    """Suggests ingredient names."""
+    return await _choices("ingredients", current)
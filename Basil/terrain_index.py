@@ -0,0 +1,45 @@
+import threading
+from data_manager import load_json, document_version
+
+TERRAIN_FILE = "terrain_tables.json"
+INGREDIENTS_FILE = "ingredients.json"
+
+class TerrainTable:
+    """One terrain's gather results as a dense array indexed by total roll.
+
+    Totals below the lowest threshold find nothing; totals above the highest one get
+    the top result. Each slot holds (ingredient, rarity) with the rarity already joined.
+    """
+    __slots__ = ("lowest", "results")
+
+    def __init__(self, thresholds, ingredients):
+        steps = sorted((int(roll), name) for roll, name in thresholds.items())
+        self.lowest = steps[0][0] if steps else 0
+        self.results = []
+        for index, (roll, name) in enumerate(steps):
+            next_roll = steps[index + 1][0] if index + 1 < len(steps) else roll + 1
+            entry = (name, ingredients.get(name, {}).get("rarity", "Unknown"))
+            self.results.extend([entry] * (next_roll - roll))
+
+    def lookup(self, total_roll):
+        """(ingredient, rarity) for `total_roll`, or None if it's below every threshold."""
+        offset = total_roll - self.lowest
+        if offset < 0 or not self.results:
+            return None
+        return self.results[min(offset, len(self.results) - 1)]
+
+_compiled = {"version": None, "tables": {}}
+_compile_lock = threading.Lock()
+
+def terrain_tables():
+    """Compiled tables by terrain name, recompiled only when either source file changes."""
+    version = (document_version(TERRAIN_FILE), document_version(INGREDIENTS_FILE))
+    with _compile_lock:
+        if _compiled["version"] != version:
+            ingredients = load_json(INGREDIENTS_FILE, readonly=True) or {}
+            _compiled["tables"] = {
+                terrain: TerrainTable(thresholds, ingredients)
+                for terrain, thresholds in (load_json(TERRAIN_FILE, readonly=True) or {}).items()
+            }
+            _compiled["version"] = version
+        return _compiled["tables"]
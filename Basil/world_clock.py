@@ -0,0 +1,77 @@
+from data_manager import load_json, lock_files, save_many
+from bot_logging import logger
+from market_state import MARKET_FILE, MARKET_PAGES, build_market
+from crafting_simulator import simulate_crafting, apply_crafting_outcome, combine_outcomes
+from cooldowns import COOLDOWNS
+
+TIME_FILE = "in_game_time.json"
+CRAFTED_ITEMS_FILE = "crafted_items.json"
+WORLD_FILES = (TIME_FILE, MARKET_FILE, CRAFTED_ITEMS_FILE)
+
+HOURS_PER_DAY = 24
+MARKET_WEEK_HOURS = 7 * HOURS_PER_DAY  # ✅ The market also turns over every in-game week
+
+def in_game_hour(clock):
+    """Hours since day 0 for an `in_game_time.json` document."""
+    return clock.get("days", 0) * HOURS_PER_DAY + clock.get("hours", 0)
+
+def _stock(market):
+    return {item: data["stock"] for item, data in market.items() if isinstance(data, dict) and "stock" in data}
+
+def advance(hours, market=None):
+    """Moves the in-game clock forward by `hours` in one step.
+
+    Basil's crafting (one attempt per hour) and every weekly market turnover in the span
+    are worked out in memory, then persisted in one commit.
+    `market` is a copy of the Economy cog's market (it isn't modified); it's loaded if omitted.
+
+    Returns a summary: {"start": (days, hours), "end": (days, hours), "days_passed",
+    "market_refreshes", "expired_cooldowns", "crafting", "market"} where "crafting" is a
+    crafting outcome and "market" the market as of the new time, for the cog to swap in.
+    """
+    with lock_files(*WORLD_FILES):
+        clock = load_json(TIME_FILE)
+        start_hour = in_game_hour(clock)
+        end_hour = start_hour + hours
+        clock["days"], clock["hours"] = divmod(end_hour, HOURS_PER_DAY)
+        documents = {TIME_FILE: clock}
+
+        # ✅ Gather attempts refill lazily from the day stamp on each record, nothing to reset here
+        days_passed = end_hour // HOURS_PER_DAY - start_hour // HOURS_PER_DAY
+
+        # ✅ Craft against the market that was open at the time: each week's, then the fresh one
+        market = market if market is not None else load_json(MARKET_FILE) or {}
+        market = {item: dict(data) if isinstance(data, dict) else data for item, data in market.items()}
+        crafted_items = load_json(CRAFTED_ITEMS_FILE)
+        recipes = load_json("recipes.json", readonly=True) or {}
+        enhanced_recipes = load_json("enhanced_recipes.json", readonly=True) or {}
+
+        outcomes, hour, market_refreshes = [], start_hour, 0
+        for turnover in range((start_hour // MARKET_WEEK_HOURS + 1) * MARKET_WEEK_HOURS, end_hour + 1, MARKET_WEEK_HOURS):
+            outcomes.append(simulate_crafting(turnover - hour, recipes, enhanced_recipes, _stock(market)))
+            apply_crafting_outcome(outcomes[-1], market, crafted_items)
+            market = build_market()
+            hour, market_refreshes = turnover, market_refreshes + 1
+        outcomes.append(simulate_crafting(end_hour - hour, recipes, enhanced_recipes, _stock(market)))
+        apply_crafting_outcome(outcomes[-1], market, crafted_items)
+
+        documents[MARKET_FILE] = market
+        documents[CRAFTED_ITEMS_FILE] = crafted_items
+        save_many(documents)
+    MARKET_PAGES.invalidate("market")
+    expired_cooldowns = COOLDOWNS.sweep(end_hour)  # ✅ Time only moves here, so this is where cooldowns lapse
+
+    crafting = combine_outcomes(*outcomes)
+    logger.info(
+        f"🕰️ Advanced {end_hour - start_hour} hours to day {clock['days']}, hour {clock['hours']}: "
+        f"{days_passed} days passed, {market_refreshes} market refreshes, {crafting['attempts']} crafting attempts."
+    )
+    return {
+        "start": divmod(start_hour, HOURS_PER_DAY),
+        "end": (clock["days"], clock["hours"]),
+        "days_passed": days_passed,
+        "market_refreshes": market_refreshes,
+        "expired_cooldowns": expired_cooldowns,
+        "crafting": crafting,
+        "market": market,
+    }
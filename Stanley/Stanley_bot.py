@@ -1,20 +1,31 @@
+import time
+BOOT_STARTED = time.perf_counter()  # ✅ Before the heavy imports, so the startup breakdown includes them
+
 import discord
 from discord.ext import commands
+import functools
 import logging
 import os
 import random
-import time
-from data_manager import load_json, save_json
+from dotenv import load_dotenv
+
+# Load environment variables (before data_manager, so STORAGE_BACKEND applies to its module-level loads)
+load_dotenv()
+
+from data_manager import load_json, save_json, STORE, WRITES, COMMAND_SYNC_FILE, REQUIRED_FILES as DOCUMENTS
+from shared_inventories.inventory_service import INVENTORY
+from shared_inventories.startup import StartupTimer, prewarm, sync_if_changed
+from shared_inventories.wallet import WALLETS
+from shop_catalog import SHOP_CATALOG
+from suggestions import SUGGESTIONS
 import shop_browse
 import shop_transactions
 import shop_requests
 import economy
-from dotenv import load_dotenv
 
-# Load environment variables
-load_dotenv()
 TOKEN = os.getenv("BOT_TOKEN")  # Ensure your token is stored in .env
 GUILD_ID = os.getenv("GUILD_ID")
+GUILD_ID = int(GUILD_ID) if GUILD_ID and GUILD_ID.isdigit() else None
 
 # ✅ Define Paths
 BASE_DIR = os.path.dirname(os.path.abspath(__file__))
@@ -58,9 +69,55 @@ CLEAR_COMMANDS_ON_START = False
 
 logger = logging.getLogger(__name__)
 
+STARTUP = StartupTimer(BOOT_STARTED)
+
+def prewarm_loads():
+    """What the first commands read: the OS file cache for every document, inventories, wallets and lookup indexes."""
+    loads = {name: functools.partial(load_json, name) for name in DOCUMENTS}  # ✅ Also creates any missing file up front
+    loads.update({
+        "inventories": INVENTORY.document.current,
+        "wallets": WALLETS.document.current,
+        "shop catalog": SHOP_CATALOG.ensure_loaded,
+        "shop suggestions": functools.partial(SUGGESTIONS.index, "shop_items"),
+    })
+    return loads
+
+class StanleyBot(commands.Bot):
+    async def setup_hook(self):
+        """Runs once, before connecting: `on_ready` fires again on every reconnect."""
+        STARTUP.mark("login")
+        await prewarm(prewarm_loads())  # ✅ Side by side on the storage pool
+        STARTUP.mark("prewarm")
+
+        guild = discord.Object(id=GUILD_ID) if GUILD_ID else None
+        if CLEAR_COMMANDS_ON_START:
+            logger.info("🚨 Clearing all slash commands before syncing...")
+            self.tree.clear_commands(guild=guild)
+
+        # Load cogs dynamically
+        for cog in COGS:
+            try:
+                await self.load_extension(cog)
+                logger.info(f"✅ Successfully loaded {cog}.py")
+            except Exception as e:
+                logger.error(f"❌ Failed to load {cog}.py: {e}")
+        STARTUP.mark("extensions")
+
+        try:
+            await sync_if_changed(self.tree, guild, COMMAND_SYNC_FILE, force=CLEAR_COMMANDS_ON_START)  # ✅ Only when the definitions changed
+        except Exception as e:
+            logger.error(f"❌ Error checking/syncing commands: {e}")
+        STARTUP.mark("command sync")
+
+    async def close(self):
+        """Writes any queued saves to disk before disconnecting."""
+        flushed = await STORE.run(WRITES.flush)
+        logger.info(f"💾 Flushed {flushed} queued file(s) on shutdown. Write-behind: {WRITES.metrics()}")
+        await super().close()
+
 # Define bot intents and setup
 intents = discord.Intents.all()
-bot = commands.Bot(command_prefix="/", intents=intents)
+bot = StanleyBot(command_prefix="/", intents=intents)
 
 def split_text(text, max_length=1024):
     """Splits a long text into chunks that fit Discord's limit."""
@@ -72,41 +129,9 @@ async def on_ready():
     logger.info(f"🎩 {bot.user.name} is online! Logged in as {bot.user}")
     await bot.change_presence(activity=discord.Game(name=random.choice(PRESENCE_MESSAGES)))
 
-    # Track setup timing
-    start_time = time.time()
-
-    logger.info("🔄 Running setup_hook()...")
-
-    if CLEAR_COMMANDS_ON_START:
-        logger.info("🚨 Clearing all slash commands before syncing...")
-        await bot.tree.clear_commands(guild=discord.Object(id=GUILD_ID))
-
-    # Load cogs dynamically
-    for cog in COGS:
-        try:
-            await bot.load_extension(cog)
-            logger.info(f"✅ Successfully loaded {cog}.py")
-        except Exception as e:
-            logger.error(f"❌ Failed to load {cog}.py: {e}")
-
-    # **Check if syncing is needed**
-    # try:        
-    #     logger.info("🔍 Fetching existing bot commands...")
-    #     existing_commands = await bot.tree.fetch_commands(guild=discord.Object(id=GUILD_ID))
-    #     logger.info(f"✅ Found {len(existing_commands)} existing commands.")
-        
-    #     if not existing_commands:
-    #         logger.info("🔄 No commands found! Syncing bot commands...")
-    #         synced = await bot.tree.sync(guild=discord.Object(id=GUILD_ID))
-    #         logger.info(f"✅ Synced {len(synced)} commands successfully!")
-    #     else:
-    #         logger.info(f"✅ {len(existing_commands)} commands already exist. Skipping unnecessary sync.")
-    # except Exception as e:
-        # logger.error(f"❌ Error checking/syncing commands: {e}")
-
-    # Calculate total startup time
-    elapsed_time = time.time() - start_time
-    logger.info(f"🚀 Stanley fully loaded in {elapsed_time:.2f} seconds!")
+    if "gateway" not in dict(STARTUP.phases):  # ✅ First connect only, not reconnects
+        STARTUP.mark("gateway")
+        logger.info(f"🚀 Stanley fully loaded: {STARTUP.summary()}")
     
 @bot.tree.command(name="ping", description="Test if the bot is working")
 async def slash_ping(interaction: discord.Interaction):
@@ -153,6 +178,7 @@ async def stanley_help(interaction: discord.Interaction):
 
 # Run the bot
 try:
+    STARTUP.mark("imports")
     bot.run(TOKEN)
 except discord.errors.LoginFailure:
     logger.error("❌ Error: Invalid bot token! Check your `.env` file.")
@@ -1,7 +1,11 @@
 import discord
 from discord.ext import commands
 from discord import app_commands
-from data_manager import load_json
+from datetime import datetime, timezone
+from data_manager import STORE, COMMAND_SYNC_FILE
+from shared_inventories.journal import JOURNAL
+from shared_inventories.startup import sync_if_changed
+from shared_inventories.wallet import Money
 
 class AdminCommands(commands.Cog):
     """Cog for syncing commands."""
@@ -21,10 +25,10 @@ class AdminCommands(commands.Cog):
         try:
             if guild_id:
                 guild = discord.Object(id=guild_id)
-                synced = await self.bot.tree.sync(guild=guild)
+                synced = await sync_if_changed(self.bot.tree, guild, COMMAND_SYNC_FILE, force=True)  # ✅ Records the hash too
                 await interaction.followup.send(f"✅ Synced {len(synced)} commands for guild `{guild_id}`!")
             else:
-                synced = await self.bot.tree.sync()
+                synced = await sync_if_changed(self.bot.tree, None, COMMAND_SYNC_FILE, force=True)
                 await interaction.followup.send(f"✅ Synced {len(synced)} global commands!")
 
         except Exception as e:
@@ -35,7 +39,7 @@ class AdminCommands(commands.Cog):
     async def force_sync(self, ctx):
         """Force sync slash commands manually while Stanley is running."""
         try:
-            synced = await self.bot.tree.sync()
+            synced = await sync_if_changed(self.bot.tree, None, COMMAND_SYNC_FILE, force=True)
             await ctx.send(f"✅ Forced sync completed! Synced {len(synced)} commands.")
             print(f"✅ Forced sync completed! Synced {len(synced)} commands.")
         except Exception as e:
@@ -47,34 +51,37 @@ class AdminCommands(commands.Cog):
         """Forcefully removes all slash commands from Discord."""
         try:
             self.bot.tree.clear_commands(guild=None)  # Wipe all global commands
-            await self.bot.tree.sync()  # Apply the changes
+            await sync_if_changed(self.bot.tree, None, COMMAND_SYNC_FILE, force=True)  # Apply the changes (and record the empty tree)
             await ctx.send("✅ All slash commands have been cleared!")
             print("✅ Cleared all slash commands.")
         except Exception as e:
             await ctx.send(f"❌ Failed to clear commands: {e}")
             print(f"❌ Failed to clear commands: {e}")
 
-    @app_commands.command(name="audit_log", description="(Admin) View recent shop transactions.")
+    @app_commands.command(name="audit_log", description="(Admin) View recent gold & item movements from both bots.")
     @commands.has_permissions(administrator=True)  # ✅ Admins only
     async def audit_log(self, interaction: discord.Interaction, limit: int = 10):
-        """Allows admins to view recent shop transactions."""
+        """Allows admins to view the most recent journal entries."""
         await interaction.response.defer(thinking=True)
 
-        # Load audit log
-        audit_data = load_json("inventory_logs.json")
+        # ✅ Reads the journal backwards: only the last `limit` entries are touched
+        entries = await STORE.run(JOURNAL.tail, max(1, min(limit, 100)))
 
-        if not audit_data:
-            await interaction.followup.send(get_response("audit_log_empty"))
+        if not entries:
+            await interaction.followup.send("📭 No transactions have been recorded yet.")
             return
 
-        # Limit number of transactions displayed
-        audit_data = audit_data[-limit:]
         log_lines = ["📜 **Recent Transactions:**"]
-        for entry in reversed(audit_data):  # Reverse so latest is at the top
-            log_lines.append(
-                f"• `{entry['timestamp'].split('T')[0]}` - **{entry['user']}** {entry['action']} `{entry['item']}` for `{entry['price_gp']} gp`"
-            )
-            
+        for entry in entries:  # Newest first
+            when = datetime.fromtimestamp(entry["ts"], tz=timezone.utc).strftime("%Y-%m-%d")
+            moved = []
+            if "item" in entry:
+                moved.append(f"`{entry['quantity']:+}x {entry['item']}`")
+            if "cp" in entry:
+                sign = "+" if entry["cp"] >= 0 else "-"
+                moved.append(f"`{sign}{Money(abs(entry['cp']))}`")
+            log_lines.append(f"• `{when}` - <@{entry['user']}> {entry['action']} {' '.join(moved)}")
+
         # Ensure message fits Discord limits
         message_chunks = [log_lines[i : i + 10] for i in range(0, len(log_lines), 10)]
         for chunk in message_chunks:
@@ -1,9 +1,10 @@
 import json
 import time
 import os
+import sys
 import logging
+from contextlib import contextmanager
 from logging import getLogger
-from datetime import datetime
 import random
 
 logger = getLogger(__name__)
@@ -14,6 +15,29 @@ INVENTORY_DIR = os.path.join(BASE_DIR, "inventory")  # General inventory
 SHARED_DIR = os.path.join(PARENT_DIR, "shared_inventories")  # ✅ Corrected path
 STANLEY_DATA_DIR = os.path.join(BASE_DIR, "stanley_data")  # Unique Stanley files
 DEFAULTS_DIR = os.path.join(BASE_DIR, "default_game_files")  # Backup files
+COMMAND_SYNC_FILE = os.path.join(STANLEY_DATA_DIR, "command_sync.json")  # ✅ Hash of the last synced command tree
+
+if PARENT_DIR not in sys.path:
+    sys.path.append(PARENT_DIR)  # ✅ Makes the `shared_inventories` helpers importable
+
+from shared_inventories.atomic_io import (
+    atomic_write_json, atomic_write_bytes, atomic_write_many,
+    recover_pending_commits, restore_latest_backup, quarantine_file
+    )
+from shared_inventories.async_store import AsyncStore
+from shared_inventories.changes import clone, fingerprint, update_document
+from shared_inventories.document_codec import encode, read_document
+from shared_inventories.file_lock import file_lock, file_locks
+from shared_inventories.journal import JOURNAL
+from shared_inventories.storage import get_record_store
+from shared_inventories.shared_document import version_token, write_record
+from shared_inventories.state_client import StateDaemonError, get_state_client
+from shared_inventories.write_behind import WriteBehind
+
+JOURNAL.source = "stanley"  # ✅ Journal entries written from this process say which bot made them
+
+# ✅ Rolling `.bakN` copies kept for shared files (the ones both bots write to)
+BACKUP_GENERATIONS = 2
 
 # ✅ Required Files & Default Data
 REQUIRED_FILES = {
@@ -21,13 +45,20 @@ REQUIRED_FILES = {
     "player_stats.json": (SHARED_DIR, {}),  
     "shop_requests.json": (SHARED_DIR, []),  
     "stanley_shop.json": (SHARED_DIR, {}),  
-    "inventory_logs.json": (SHARED_DIR, []),  
     "player_inventories.json": (SHARED_DIR, {}),
     "requestable_items.json": (STANLEY_DATA_DIR, {}),  
     "stanley_responses.json": (STANLEY_DATA_DIR, {}),  
     "requests.json": (STANLEY_DATA_DIR, {"mundane": {}, "magical": {}}),  
     "market.json": (DEFAULTS_DIR, {"last_update": 0}),  
 }
+
+# ✅ Stanley-only files saved over and over (requests, market): written behind.
+# Shared files stay write-through; with the state daemon running it batches those itself.
+WRITE_BEHIND_FILES = {"requests.json", "requestable_items.json", "market.json"}
+
+# ✅ Finish any multi-file commit a crash interrupted, before anything reads the files
+for folder in (SHARED_DIR, STANLEY_DATA_DIR):
+    recover_pending_commits(folder)
  
 def ensure_file_exists(filename):
     """Ensures required files exist, copying defaults or creating empty ones."""
@@ -43,13 +74,12 @@ def ensure_file_exists(filename):
         os.makedirs(folder, exist_ok=True)  # Ensure directory exists
 
         if os.path.exists(default_path):
-            with open(default_path, "r", encoding="utf-8") as src, open(file_path, "w", encoding="utf-8") as dst:
-                dst.write(src.read())  # Copy default file
+            with open(default_path, "rb") as src:
+                atomic_write_bytes(file_path, src.read())  # Copy default file
             logger.info(f"📄 Created `{filename}` from defaults in `{folder}`.")
         else:
             # Create empty file with default structure
-            with open(file_path, "w", encoding="utf-8") as dst:
-                json.dump(default_content, dst, indent=4)
+            atomic_write_json(file_path, default_content)
             logger.warning(f"⚠️ `{filename}` was missing! Created an empty one in `{folder}`.")
 
 def load_json(filename):
@@ -58,21 +88,43 @@ def load_json(filename):
         logger.error(f"⚠️ `{filename}` is not in REQUIRED_FILES! Check path definitions.")
         return None
 
+    client = get_state_client(filename)
+    if client:
+        return client.load(filename)[1]  # ✅ SHARED_STATE_SOCKET: only re-sent after a change
+
+    store = get_record_store(filename)
+    if store:
+        return store.load_document(filename)  # ✅ STORAGE_BACKEND=sqlite / sharded
+
+    pending = WRITES.get(filename)
+    if pending is not None:
+        return clone(pending)  # ✅ Saved but not flushed yet: newer than disk
+
     folder, default_data = REQUIRED_FILES[filename]  
     file_path = os.path.join(folder, filename)
     ensure_file_exists(filename)  # ✅ Ensure file exists before loading
 
     try:
-        with open(file_path, "r", encoding="utf-8") as file:
-            return json.load(file)
+        with file_lock(file_path, shared=True):
+            return read_document(file_path)  # ✅ Whichever codec wrote it
     except json.JSONDecodeError as e:
-        logger.error(f"❌ `{filename}` is corrupted! Resetting to default. Error: {e}")
-        os.remove(file_path)
+        logger.error(f"❌ `{filename}` is corrupted! Moved it to `{quarantine_file(file_path)}`. Error: {e}")
+        if restore_latest_backup(file_path, _backup_generations(filename)):
+            return read_document(file_path)  # ✅ Recovered from the latest backup
         ensure_file_exists(filename)  # Recreate if corrupted
         return default_data  # Return default structure
 
+def _file_path(filename):
+    folder, _ = REQUIRED_FILES[filename]
+    return os.path.join(folder, filename)
+
+def _backup_generations(filename):
+    """Number of rolling backups kept for a file (only shared files are backed up)."""
+    folder, _ = REQUIRED_FILES[filename]
+    return BACKUP_GENERATIONS if folder == SHARED_DIR else 0
+
 def save_json(filename, data):
-    """Saves data to a JSON file."""
+    """Saves data to a JSON file atomically (temp file + fsync + rename)."""
     if filename not in REQUIRED_FILES:
         logger.error(f"⚠️ `{filename}` is not in REQUIRED_FILES! Check path definitions.")
         return
@@ -80,14 +132,180 @@ def save_json(filename, data):
     folder, _ = REQUIRED_FILES[filename]  
     file_path = os.path.join(folder, filename)
 
+    client = get_state_client(filename)
+    if client:
+        try:
+            client.save({filename: data})
+            logger.info(f"✅ Saved `{filename}` to the state daemon.")
+        except Exception as e:
+            logger.error(f"❌ Failed to save `{filename}` to the state daemon. Error: {e}")
+        return
+
+    store = get_record_store(filename)
+    if store:
+        try:
+            changed = store.save_document(filename, data)  # ✅ Only changed rows are written
+            logger.info(f"✅ Saved `{filename}` to {store.label} ({changed} rows changed).")
+        except Exception as e:
+            logger.error(f"❌ Failed to save `{filename}` to {store.label}. Error: {e}")
+        return
+
+    if filename in WRITE_BEHIND_FILES and WRITES.enabled():
+        WRITES.save(filename, clone(data))  # ✅ Written once the window closes, with any later saves
+        return
+
     try:
-        os.makedirs(folder, exist_ok=True)  
-        with open(file_path, "w", encoding="utf-8") as file:
-            json.dump(data, file, indent=4)
+        with file_lock(file_path):
+            atomic_write_bytes(file_path, encode(filename, data), backups=_backup_generations(filename))
         logger.info(f"✅ Saved `{filename}` to `{folder}`.")
     except Exception as e:
         logger.error(f"❌ Failed to save `{filename}` to `{folder}`. Error: {e}")
 
+def _write_behind(filename, data):
+    """Writes a queued document; the caller holds its lock."""
+    atomic_write_bytes(_file_path(filename), encode(filename, data), backups=_backup_generations(filename))
+    logger.info(f"✅ Flushed `{filename}` to disk.")
+
+@contextmanager
+def lock_files(*filenames):
+    """Holds exclusive cross-process locks on several files for a read-modify-write.
+
+    Loads & saves inside the block re-use the held locks. Don't `await` inside it.
+    """
+    with file_locks([_file_path(name) for name in filenames]):
+        yield
+
+def update_json(filename):
+    """Read-modify-write one file under an exclusive lock, saving only if the data changed."""
+    return update_document(filename, lock_files, load_json, save_json)
+
+class Transaction:
+    """Unit of work: loads each document once, lets the caller mutate them, commits them together.
+
+    Every document accessed through `tx[...]` and changed is written on commit; call
+    `rollback()` when the attempt fails so nothing is written. Movements queued with
+    `record()` are journaled only once the commit has succeeded, and callbacks added
+    with `on_commit()` are called after that, once the files are unlocked.
+    """
+
+    def __init__(self, filenames):
+        self.filenames = filenames
+        self.documents = {}
+        self.originals = {}  # ✅ Fingerprints as loaded, to skip documents the work left unchanged
+        self.entries = []
+        self.callbacks = []
+        self.versions = {}  # ✅ Version token of each document the last commit wrote, taken under its locks
+
+    def __getitem__(self, filename):
+        if filename not in self.filenames:
+            raise KeyError(f"`{filename}` is not part of this transaction.")
+        if filename not in self.documents:
+            self.documents[filename] = load_json(filename)
+            self.originals[filename] = fingerprint(self.documents[filename])
+        return self.documents[filename]
+
+    def record(self, action, user, **movement):
+        """Queues a journal entry (see `Journal.record`) for when the commit succeeds."""
+        self.entries.append((action, user, movement))
+
+    def on_commit(self, callback):
+        """Calls `callback()` after a successful commit, once the files are unlocked (e.g. to update a cache)."""
+        self.callbacks.append(callback)
+
+    def run_callbacks(self):
+        callbacks, self.callbacks = self.callbacks, []
+        for callback in callbacks:
+            callback()
+
+    def rollback(self):
+        """Discards every change made so far; nothing will be written."""
+        self.documents.clear()
+        self.originals.clear()
+        self.entries.clear()
+        self.callbacks.clear()
+
+    def commit(self):
+        """Writes the changed documents as one durable commit. Returns the filenames written."""
+        store, store_documents, payloads, backups = None, {}, {}, {}
+        daemon_documents = {}
+        changed = {
+            filename: data for filename, data in self.documents.items() if fingerprint(data) != self.originals[filename]
+        }
+
+        for filename, data in changed.items():
+            if get_state_client(filename):
+                daemon_documents[filename] = data  # ✅ The whole transaction, applied together by the daemon
+            elif get_record_store(filename):
+                store = get_record_store(filename)
+                store_documents[filename] = data
+            else:
+                file_path = os.path.join(REQUIRED_FILES[filename][0], filename)
+                payloads[file_path] = encode(filename, data)
+                backups[file_path] = _backup_generations(filename)
+
+        self.versions = {}
+        if daemon_documents:
+            versions = get_state_client(next(iter(daemon_documents))).save(daemon_documents)
+            self.versions.update({filename: ("daemon", version) for filename, version in versions.items()})
+        if store_documents:
+            store.save_documents(store_documents)  # ✅ One SQLite transaction / shard commit
+        atomic_write_many(payloads, backups)  # ✅ One journaled commit across the JSON files (no journal for one file)
+        WRITES.discard(changed)  # ✅ Anything still queued for these files is older than this commit
+        for filename in changed:
+            if filename not in self.versions:
+                self.versions[filename] = document_version(filename)
+
+        written = list(changed)
+        if written:
+            logger.info(f"✅ Committed {', '.join(f'`{name}`' for name in written)} in one transaction.")
+        for action, user, movement in self.entries:
+            JOURNAL.record(action, user, **movement)
+        self.documents.clear()
+        self.originals.clear()
+        self.entries.clear()
+        return written
+
+@contextmanager
+def transaction(*filenames):
+    """Locks the given files, yields a `Transaction`, and commits it once when the block ends.
+
+        with transaction("gold_data.json", "player_inventories.json") as tx:
+            apply_changes(tx["gold_data.json"], {user_id: Money.of(gp=-5)})
+            INVENTORY.stage_deltas(tx, {user_id: {"rope": 1}})
+
+    If the block raises or calls `tx.rollback()`, nothing is written. Don't `await` inside it.
+    With the state daemon running, a transaction over documents it holds is one daemon
+    save; mixing those with file-backed documents raises `StateDaemonError` up front,
+    since the two couldn't be committed atomically.
+    """
+    held = [filename for filename in filenames if get_state_client(filename)]
+    if held and len(held) < len(filenames):
+        raise StateDaemonError(f"Can't commit {', '.join(held)} (state daemon) in one transaction with files.")
+    with lock_files(*filenames):
+        tx = Transaction(filenames)
+        yield tx
+        tx.commit()
+    tx.run_callbacks()  # ✅ Unlocked first: callbacks may take other locks
+
+def document_version(filename):
+    """A cheap token that changes whenever a document changes (for indexes built on top of it)."""
+    return version_token(filename, _file_path(filename))
+
+def save_record(filename, key, value):
+    """Writes one top-level entry (e.g. one player's balance) without rewriting the others.
+
+    Row-level on the SQLite & sharded backends; a locked read-modify-write of the file otherwise.
+    Passing `value=None` removes the entry.
+    """
+    write_record(filename, key, value, update_json)
+
+# ✅ Awaitable versions of the calls above for the cogs, run on the storage thread pool
+STORE = AsyncStore(load_json, save_json, update_json, transaction)
+
+# ✅ Queued saves of WRITE_BEHIND_FILES; flushed on `bot.close()`, SIGTERM and exit
+WRITES = WriteBehind(_file_path, _write_behind)
+WRITES.flush_at_exit()
+
 def get_response(category, **kwargs):
     """Fetches a random response from Stanley's response file, replacing placeholders."""
     responses = load_json("stanley_responses.json")
@@ -97,19 +315,6 @@ def get_response(category, **kwargs):
 
     return random.choice(responses.get(category, ["🤔 Stanley scratches his head. _\"I wasn't prepared for that one!\"_"])).format(**kwargs)
 
-def ensure_currency(user_id):
-    """Ensures a player has a valid currency balance. Initializes if missing."""
-    gold_data = load_json("gold_data.json")  # ✅ Load latest data
-
-    if user_id not in gold_data or not isinstance(gold_data[user_id], dict):
-        gold_data[user_id] = {"gp": 0, "sp": 0, "cp": 0}  # Default starting gold
-    else:
-        for key in ["gp", "sp", "cp"]:
-            gold_data[user_id].setdefault(key, 0)
-
-    save_json("gold_data.json", gold_data)  
-    return gold_data[user_id]  
-
 def generate_market():
     """Generates a fresh market with randomized base prices that last for one week."""
     market = {}    
@@ -140,22 +345,4 @@ def load_market():
 def save_market(market_data):
     """Saves the current market state to file."""
     save_json("market.json", market_data)
-    logger.info("✅ Market state saved.")
-
-def log_transaction(action, user, item, price_gp):
-    """Logs a transaction event and saves it to the audit log."""
-    timestamp = datetime.utcnow().isoformat()
-    audit_log = load_json("inventory_logs.json")
-
-    if not isinstance(audit_log, list):  
-        audit_log = [] 
-
-    audit_log.append({"timestamp": timestamp, "user": user, "action": action, "item": item, "price_gp": price_gp})
-    audit_log = audit_log[-50:]
-
-    save_json("inventory_logs.json", audit_log)
-
-# Load existing player data or create defaults
-gold_data = load_json("gold_data.json")
-SHOP_CATEGORIES = load_json("stanley_shop.json")
-PLAYER_INVENTORIES = load_json("player_inventories.json")
\ No newline at end of file
+    logger.info("✅ Market state saved.")
\ No newline at end of file
@@ -6,9 +6,10 @@ import time
 import logging
 from logging import getLogger
 from data_manager import (
-    load_json, save_json, ensure_currency, 
-    get_response, load_market, save_market
+    STORE, get_response, generate_market, load_market, save_market
     )
+from shared_inventories.inventory_service import INVENTORY
+from shared_inventories.wallet import WALLETS, Money
 
 # ✅ Configure logging
 logger = getLogger(__name__)
@@ -25,12 +26,7 @@ class Economy(commands.Cog):
         await interaction.response.defer(thinking=True)
 
         user_id = str(interaction.user.id)
-        ensure_currency(user_id)
-        gold_data = load_json("gold_data.json")
-
-        # Ensure user has a balance
-        gp, sp, cp = gold_data[user_id]["gp"], gold_data[user_id]["sp"], gold_data[user_id]["cp"]
-        await interaction.followup.send(f"💰 Your balance: `{gp} gp, {sp} sp, {cp} cp`.")
+        await interaction.followup.send(f"💰 Your balance: `{await STORE.run(WALLETS.balance, user_id)}`.")
 
     @app_commands.command(name="stanley_inventory", description="Check your inventory.")
     async def stanley_inventory(self, interaction: discord.Interaction):
@@ -38,15 +34,15 @@ class Economy(commands.Cog):
         await interaction.response.defer(thinking=True)
 
         user_id = str(interaction.user.id)
-        inventory_data = load_json("player_inventories.json")
+        inventory = await STORE.run(INVENTORY.get_inventory, user_id)
 
         # Check if player has any items
-        if user_id not in inventory_data or not inventory_data[user_id]:
+        if not inventory:
             await interaction.followup.send(f"🎒 {interaction.user.mention}, you own absolutely nothing. Not even a rusty dagger. How tragic.")
             return
 
         # Format inventory items
-        inventory_list = [f"🔹 **{item.capitalize()}** (x{qty})" for item, qty in inventory_data[user_id].items()]
+        inventory_list = [f"🔹 **{item}** (x{qty})" for item, qty in inventory.items()]
         
         # Pagination: Discord has a 2000-character message limit
         message_chunks = []
@@ -70,31 +66,16 @@ class Economy(commands.Cog):
 
         giver_id = str(interaction.user.id)
         receiver_id = str(member.id)
+        amount = Money.of(gp, sp, cp)
+        if amount.cp <= 0:
+            await interaction.followup.send("❌ Amount must be greater than **zero**.")
+            return
 
-        ensure_currency(giver_id)
-        ensure_currency(receiver_id)
-
-        gold_data = load_json("gold_data.json")
-
-        # Convert to total copper
-        total_cp = (gp * 100) + (sp * 10) + cp
-        giver_cp = sum(gold_data[giver_id][k] * v for k, v in {"gp": 100, "sp": 10, "cp": 1}.items())
-
-        if giver_cp < total_cp:
+        if not await STORE.run(WALLETS.transfer, giver_id, receiver_id, amount, action="givegold"):  # ✅ Both balances move in one write
             await interaction.followup.send("❌ You don't have enough gold!")
             return
 
-        # Deduct from giver
-        giver_cp -= total_cp
-        gold_data[giver_id] = {"gp": giver_cp // 100, "sp": (giver_cp % 100) // 10, "cp": giver_cp % 10}
-
-        # Add to receiver
-        receiver_cp = sum(gold_data[receiver_id][k] * v for k, v in {"gp": 100, "sp": 10, "cp": 1}.items())
-        receiver_cp += total_cp
-        gold_data[receiver_id] = {"gp": receiver_cp // 100, "sp": (receiver_cp % 100) // 10, "cp": receiver_cp % 10}
-
-        save_json("gold_data.json", gold_data)
-        await interaction.followup.send(get_response("givegold_success", user=interaction.user.name, receiver=member.display_name, amount=total_cp // 100))
+        await interaction.followup.send(await STORE.run(get_response, "givegold_success", user=interaction.user.name, receiver=member.display_name, amount=amount.gp))
 
     @app_commands.command(name="takegold", description="Remove gold from a player.")
     @commands.has_permissions(administrator=True)
@@ -102,24 +83,16 @@ class Economy(commands.Cog):
         """Removes gold from a player."""
         await interaction.response.defer(thinking=True)
 
-        user_id = str(member.id)
-        ensure_currency(user_id)
-        gold_data = load_json("gold_data.json")
-
-        # Convert to total copper
-        total_cp = (gp * 100) + (sp * 10) + cp
-        player_cp = sum(gold_data[user_id][k] * v for k, v in {"gp": 100, "sp": 10, "cp": 1}.items())
+        amount = Money.of(gp, sp, cp)
+        if amount.cp <= 0:
+            await interaction.followup.send("❌ Amount must be greater than **zero**.")
+            return
 
-        if player_cp < total_cp:
+        if not await STORE.run(WALLETS.debit, str(member.id), amount, action="takegold"):
             await interaction.followup.send("❌ Player does not have enough gold!")
             return
 
-        # Deduct gold
-        player_cp -= total_cp
-        gold_data[user_id] = {"gp": player_cp // 100, "sp": (player_cp % 100) // 10, "cp": player_cp % 10}
-
-        save_json("gold_data.json", gold_data)
-        await interaction.followup.send(get_response("takegold_success", user=interaction.user.name, target=member.display_name, amount=total_cp // 100))
+        await interaction.followup.send(await STORE.run(get_response, "takegold_success", user=interaction.user.name, target=member.display_name, amount=amount.gp))
 
     @app_commands.command(name="admin_givegold", description="Admin-only: Give gold to a player without deducting it.")
     @commands.has_permissions(administrator=True)
@@ -127,27 +100,20 @@ class Economy(commands.Cog):
         """Admins can reward gold to players (for quests, events, etc.) without taking it from themselves."""
         await interaction.response.defer(thinking=True)
 
-        receiver_id = str(member.id)
-        ensure_currency(receiver_id)
-        gold_data = load_json("gold_data.json")
-
-        # Convert to total copper and add to the receiver
-        total_cp = (gp * 100) + (sp * 10) + cp
-        receiver_cp = sum(gold_data[receiver_id][k] * v for k, v in {"gp": 100, "sp": 10, "cp": 1}.items())
-        receiver_cp += total_cp
+        amount = Money.of(gp, sp, cp)
+        if amount.cp <= 0:
+            await interaction.followup.send("❌ Amount must be greater than **zero**.")
+            return
 
-        # Convert back to gp/sp/cp format
-        gold_data[receiver_id] = {"gp": receiver_cp // 100, "sp": (receiver_cp % 100) // 10, "cp": receiver_cp % 10}
-        save_json("gold_data.json", gold_data)
-        
-        await interaction.followup.send(f"✨ {interaction.user.mention} **rewarded** {member.mention} `{gp} gp, {sp} sp, {cp} cp`!")
+        await STORE.run(WALLETS.credit, str(member.id), amount, action="admin_givegold")
+        await interaction.followup.send(f"✨ {interaction.user.mention} **rewarded** {member.mention} `{amount}`!")
     
     @app_commands.command(name="load_market", description="(Admin) Force-refresh the market.")
     @commands.has_permissions(administrator=True)
     async def load_market(self, interaction: discord.Interaction):
         """Forces a market refresh."""
         await interaction.response.defer(thinking=True)
-        market = load_market()
+        market = await STORE.run(load_market)
         await interaction.followup.send("✅ **Market successfully loaded!**")
 
     @app_commands.command(name="refresh_market", description="(Admin) Manually regenerate the market.")
@@ -155,8 +121,8 @@ class Economy(commands.Cog):
     async def refresh_market(self, interaction: discord.Interaction):
         """Regenerates the market, replacing old stock."""
         await interaction.response.defer(thinking=True)
-        new_market = generate_market()
-        save_market(new_market)
+        new_market = await STORE.run(generate_market)
+        await STORE.run(save_market, new_market)
         await interaction.followup.send("🔄 **Market refreshed!** New items available.")
 
 async def setup(bot):
@@ -1,8 +1,45 @@
-import os
 import discord
 from discord.ext import commands
 from discord import app_commands
-from data_manager import load_json
+from data_manager import STORE, load_json, document_version
+from shop_catalog import SHOP_CATALOG
+from suggestions import category_autocomplete
+from shared_inventories.render_cache import RenderCache, paginate_lines
+from shared_inventories.pagination import send_pages
+
+# ✅ Shop pages are rebuilt only when stanley_shop.json changes (stock or prices)
+SHOP_PAGES = RenderCache()
+
+def render_shop():
+    """Builds the overview embed and every category's page embeds in one pass."""
+    shop_data = load_json("stanley_shop.json")
+    SHOP_CATALOG.sync(shop_data)  # ✅ Keep the shared index in step with what's shown
+
+    overview = discord.Embed(
+        title="🛒 Welcome to Stanley's Shop!",
+        description="\n".join(
+            f"🔹 **{c.replace('_', ' ').title()}** → `/shop {c}`" for c in shop_data.keys()
+        ) + "\n\n💡 *Try selecting a category from the autocomplete list!*",
+        color=discord.Color.gold()
+    )
+
+    categories = {}
+    for category, items in shop_data.items():
+        lines = [
+            f"• **{item.capitalize()}** - {data['price_cp'] // 100} gp (Stock: {data['stock']})"
+            for item, data in items.items()
+        ]
+        pages = paginate_lines(lines)
+        categories[category] = [
+            discord.Embed(
+                title=f"🛒 {category.replace('_', ' ').title()} Available Items",
+                description=page,
+                color=discord.Color.gold()
+            ).set_footer(text=f"Page {number}/{len(pages)} • \"See something you like? Just /buy item_name and it's yours... for a price.\"")
+            for number, page in enumerate(pages, start=1)
+        ]
+
+    return {"empty": not shop_data, "overview": overview, "categories": categories}
 
 class ShopBrowse(commands.Cog):
     """Cog for browsing Stanley's shop system."""
@@ -10,57 +47,31 @@ class ShopBrowse(commands.Cog):
     def __init__(self, bot):
         self.bot = bot
 
-    async def shop_autocomplete(interaction: discord.Interaction, command: discord.app_commands.Command, current: str):
-        """Provides autocomplete suggestions for shop categories."""
-        SHOP_CATEGORIES = load_json("stanley_shop.json")
-        
-        return [
-            discord.app_commands.Choice(name=c.replace("_", " ").title(), value=c)
-            for c in SHOP_CATEGORIES.keys() if current.lower() in c.lower()
-        ]
-
     @app_commands.command(name="shop", description="Browse Stanley's legendary wares.")
-    @app_commands.autocomplete(category=shop_autocomplete)
+    @app_commands.autocomplete(category=category_autocomplete)
     async def shop(self, interaction: discord.Interaction, category: str = None):
         """Lists available shop items by category."""
         await interaction.response.defer(thinking=True)
 
-        shared_dir = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "shared_inventories")
-        SHOP_CATEGORIES = load_json("stanley_shop.json")
-        
-        if not SHOP_CATEGORIES:
+        rendered = await STORE.run(SHOP_PAGES.get, "shop", lambda: document_version("stanley_shop.json"), render_shop)
+
+        if rendered["empty"]:
             await interaction.followup.send("⚠️ No shop items available!")
             return
 
         # If no category is specified, list available categories
         if not category:
-            greeting = "🛒 **Welcome to Stanley's Shop!**"
-            category_list = "\n".join(
-                [f"🔹 **{c.replace('_', ' ').title()}** → `/shop {c}`" for c in SHOP_CATEGORIES.keys()]
-            )
-            await interaction.followup.send(
-                f"{greeting}\n\n"
-                f"**🛍️ Available Categories:**\n{category_list}\n\n"
-                f"💡 *Try selecting a category from the autocomplete list!*"
-            )
+            await interaction.followup.send(embed=rendered["overview"])
             return
 
         # Validate category
-        if category not in SHOP_CATEGORIES:
+        if category not in rendered["categories"]:
             await interaction.followup.send(f"❌ **Error:** `{category}` is not a valid category.")
             return
 
         # Display items in the selected category with stock
-        item_list = [
-            f"• **{item.capitalize()}** - {data['price_cp'] // 100} gp (Stock: {data['stock']})"
-            for item, data in SHOP_CATEGORIES[category].items()
-        ]
-        shop_message = "\n".join(item_list)
+        await send_pages(interaction.followup.send, rendered["categories"][category], interaction.user)
 
-        await interaction.followup.send(
-            f"🛒 **{category.replace('_', ' ').title()} Available Items:**\n{shop_message}\n\n"
-            f"_\"See something you like? Just `/buy item_name` and it's yours... for a price.\"_"
-        )
 async def setup(bot):
     """Loads the ShopBrowse cog into the bot."""
     cog = ShopBrowse(bot)
@@ -0,0 +1,82 @@
+import logging
+from data_manager import load_json
+
+logger = logging.getLogger(__name__)
+
+class ShopCatalog:
+    """Case-insensitive index over `stanley_shop.json`: item name → (category, stored name).
+
+    The index is built once and kept in step by `add` (request approvals); lookups are
+    O(1) instead of scanning every category. Records are always read from the
+    `shop_data` the caller passes in, so stock and prices are never stale. If another
+    process adds or removes items, the changed category sizes trigger a rebuild.
+    """
+
+    def __init__(self):
+        self._index = {}
+        self._shape = None
+
+    @staticmethod
+    def _shape_of(shop_data):
+        return tuple((category, len(items)) for category, items in shop_data.items())
+
+    def rebuild(self, shop_data):
+        """Re-indexes every item in the shop."""
+        self._index = {
+            name.lower(): (category, name)
+            for category, items in shop_data.items()
+            for name in items
+        }
+        self._shape = self._shape_of(shop_data)
+        logger.info(f"📇 Indexed {len(self._index)} shop items.")
+
+    def sync(self, shop_data):
+        """Re-indexes only if items were added or removed since the last build."""
+        if self._shape_of(shop_data) != self._shape:
+            self.rebuild(shop_data)
+
+    def ensure_loaded(self):
+        """Builds the index from disk the first time it's needed."""
+        if self._shape is None:
+            self.rebuild(load_json("stanley_shop.json") or {})
+
+    def categories(self):
+        """Shop categories, in file order."""
+        self.ensure_loaded()
+        return [category for category, _ in self._shape]
+
+    def lookup(self, shop_data, item):
+        """Finds an item by name (any case). Returns (category, name, record) or None."""
+        if self._shape is None:
+            self.rebuild(shop_data)
+
+        key = item.lower().strip()
+        hit = self._index.get(key)
+        record = shop_data.get(hit[0], {}).get(hit[1]) if hit else None
+
+        if record is None and self._shape_of(shop_data) != self._shape:
+            self.rebuild(shop_data)  # ✅ The shop changed under us, re-index once
+            hit = self._index.get(key)
+            record = shop_data.get(hit[0], {}).get(hit[1]) if hit else None
+
+        return (hit[0], hit[1], record) if record is not None else None
+
+    def add(self, shop_data, category, name, record):
+        """Adds (or replaces) an item in `shop_data` and the index."""
+        shop_data.setdefault(category, {})[name] = record
+        previous = self._index.get(name.lower())
+        if previous and previous != (category, name):
+            shop_data.get(previous[0], {}).pop(previous[1], None)  # ✅ One entry per name
+        self._index[name.lower()] = (category, name)
+        self._shape = self._shape_of(shop_data)
+
+    def restock(self, shop_data, item, quantity=1):
+        """Returns stock to the shop. Returns False if the item isn't sold here."""
+        found = self.lookup(shop_data, item)
+        if not found:
+            return False
+        found[2]["stock"] += quantity
+        return True
+
+# ✅ One catalogue shared by browsing, transactions and requests
+SHOP_CATALOG = ShopCatalog()
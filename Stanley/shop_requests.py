@@ -2,7 +2,9 @@ import discord
 from discord import app_commands
 from discord.ext import commands
 import logging
-from data_manager import load_json, save_json, get_response
+from data_manager import STORE, load_json, save_json, lock_files, transaction, get_response
+from shop_catalog import SHOP_CATALOG
+from suggestions import requestable_autocomplete, pending_request_autocomplete
 
 logger = logging.getLogger(__name__)
 
@@ -13,6 +15,7 @@ class ShopRequests(commands.Cog):
         self.bot = bot
 
     @discord.app_commands.command(name="request", description="Request an approved item from Stanley's catalog.")
+    @app_commands.autocomplete(item=requestable_autocomplete)
     async def request_item(self, interaction: discord.Interaction, item: str):
         """Allows players to request an item, but only from pre-approved requestable items."""
         await interaction.response.defer(thinking=True)
@@ -21,7 +24,7 @@ class ShopRequests(commands.Cog):
         user_id = str(interaction.user.id)
 
         # Load requestable items
-        requestable_items = load_json("requestable_items.json")
+        requestable_items = await STORE.get("requestable_items.json")
         valid_items = {name.lower(): category for category, items in requestable_items.items() for name in items.keys()}
 
         if item not in valid_items:
@@ -32,17 +35,18 @@ class ShopRequests(commands.Cog):
             )
             return
 
-        # Load existing requests
-        requests_data = load_json("requests.json")
-        requests_data.setdefault(item, [])
+        def add_request(requests_data):
+            requesters = requests_data.setdefault(item, [])
+            if user_id in requesters:
+                return False
+            requesters.append(user_id)
+            return True
 
-        if user_id in requests_data[item]:
+        # ✅ Locked read-modify-write, so two requests at once can't overwrite each other
+        if not await STORE.update("requests.json", add_request):
             await interaction.followup.send(f"📜 **Stanley sighs.**\n_\"You've already requested `{item}`. Patience, adventurer!\"_")
             return
 
-        requests_data[item].append(user_id)
-        save_json("requests.json", requests_data)
-
         await interaction.followup.send(f"📜 **Stanley records your request.**\n_\"Give me some time, and I’ll see what I can do.\"_\nYour request for `{item}` has been added.")
 
     @discord.app_commands.command(name="requests_available", description="Lists all requestable items.")
@@ -50,7 +54,7 @@ class ShopRequests(commands.Cog):
         """Lists all items that can be requested from Stanley."""
         await interaction.response.defer(thinking=True)
 
-        requestable_items = load_json("requestable_items.json")
+        requestable_items = await STORE.get("requestable_items.json")
 
         if not requestable_items:
             await interaction.followup.send("📜 **Stanley shrugs.**\n_\"Nothing is requestable at the moment!\"_")
@@ -82,10 +86,10 @@ class ShopRequests(commands.Cog):
         """Shows all pending item requests."""
         await interaction.response.defer(thinking=True)
 
-        requests_data = load_json("requests.json")
+        requests_data = await STORE.get("requests.json")
 
         if not any(requests_data.values()):
-            await interaction.followup.send(get_response("requests_none"))
+            await interaction.followup.send(await STORE.run(get_response, "requests_none"))
             return
 
         request_lines = ["📜 **Pending Requests:**"]
@@ -104,53 +108,63 @@ class ShopRequests(commands.Cog):
         item = item.lower().strip()
         category = category.lower().strip()
 
-        requestable_items = load_json("requestable_items.json")
-        requestable_items.setdefault(category, {})
+        def add_requestable(requestable_items):
+            items = requestable_items.setdefault(category, {})
+            if item in items:
+                return False
+            items[item] = {"price_gp": price_gp, "rarity": rarity}
+            return True
 
-        if item in requestable_items[category]:
+        if not await STORE.update("requestable_items.json", add_requestable):
             await interaction.followup.send(f"⚠️ `{item}` is already in the requestable items list.")
             return
 
-        requestable_items[category][item] = {"price_gp": price_gp, "rarity": rarity}
-        save_json("requestable_items.json", requestable_items)
-
         await interaction.followup.send(f"✅ **{item.capitalize()}** has been added to the **requestable items list** under `{category}`!")
 
     @discord.app_commands.command(name="request_approve", description="(Admin) Approve a requested item and add it to the shop.")
     @commands.has_permissions(administrator=True)  # ✅ Admins only
+    @app_commands.autocomplete(item=pending_request_autocomplete)
     async def request_approve(self, interaction: discord.Interaction, item: str, stock: int = 1):
         """Allows an admin to approve a request and move it into the shop."""
         await interaction.response.defer(thinking=True)
 
         item = item.lower().strip()
 
-        requests_data = load_json("requests.json")
-        shop_data = load_json("stanley_shop.json")
-        requestable_items = load_json("requestable_items.json")
-
-        if item not in requests_data or not requests_data[item]:
-            await interaction.followup.send(f"❌ `{item}` is not in the request list!")
-            return
-        if stock <= 0:
-            await interaction.followup.send(f"❌ Cannot approve `{item}` with zero stock!")
-            return
-
-        found_category = next((cat for cat, items in requestable_items.items() if item in items), None)
-        if not found_category:
-            await interaction.followup.send(f"❌ `{item}` is not a valid requestable item.")
-            return
-
-        shop_data.setdefault(found_category, {})[item] = {
-            "price_cp": requestable_items[found_category][item]["price_gp"] * 100,
-            "stock": stock,
-            "rarity": requestable_items[found_category][item]["rarity"]
-        }
-
-        del requests_data[item]  # ✅ Remove the request
-        save_json("stanley_shop.json", shop_data)
-        save_json("requests.json", requests_data)
-
-        await interaction.followup.send(f"✅ **{item.capitalize()}** has been approved and added to Stanley's shop with `{stock}` in stock!")
+        # ✅ Off the event loop; the request stays locked until it's in the shop
+        response = await STORE.run(self.process_approval, item, stock)
+        await interaction.followup.send(response)
+
+    def process_approval(self, item, stock):
+        """Moves an approved request into the shop. Returns the reply.
+
+        `stanley_shop.json` may be held by the state daemon while `requests.json` never is,
+        so these are two commits: the stock is added, then the request is removed, both
+        under the lock on `requests.json` so the same request can't be approved twice.
+        """
+        with lock_files("requests.json"):
+            requests_data = load_json("requests.json")
+            requestable_items = load_json("requestable_items.json")
+
+            if item not in requests_data or not requests_data[item]:
+                return f"❌ `{item}` is not in the request list!"
+            if stock <= 0:
+                return f"❌ Cannot approve `{item}` with zero stock!"
+
+            found_category = next((cat for cat, items in requestable_items.items() if item in items), None)
+            if not found_category:
+                return f"❌ `{item}` is not a valid requestable item."
+
+            with transaction("stanley_shop.json") as tx:
+                SHOP_CATALOG.add(tx["stanley_shop.json"], found_category, item, {
+                    "price_cp": requestable_items[found_category][item]["price_gp"] * 100,
+                    "stock": stock,
+                    "rarity": requestable_items[found_category][item]["rarity"]
+                })
+
+            del requests_data[item]  # ✅ Remove the request
+            save_json("requests.json", requests_data)
+
+        return f"✅ **{item.capitalize()}** has been approved and added to Stanley's shop with `{stock}` in stock!"
 
 async def setup(bot):
     """Loads the ShopRequests cog into the bot."""
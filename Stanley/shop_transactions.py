@@ -2,10 +2,16 @@ import discord
 from discord import app_commands
 from discord.ext import commands
 import logging
-from data_manager import load_json, save_json, get_response
+from data_manager import STORE, get_response
+from shop_catalog import SHOP_CATALOG
+from shared_inventories.inventory_service import INVENTORY, canonical_item, normalise_inventory
+from shared_inventories.wallet import Money, apply_changes
+from suggestions import shop_item_autocomplete
 
 logger = logging.getLogger(__name__)
 
+SHOP_FILES = ("stanley_shop.json", "gold_data.json", "player_inventories.json")
+
 class ShopTransactions(commands.Cog):
     """Cog for handling purchases in Stanley's shop."""
 
@@ -13,121 +19,114 @@ class ShopTransactions(commands.Cog):
         self.bot = bot
 
     @app_commands.command(name="buy", description="Purchase an item from Stanley's shop.")
+    @app_commands.autocomplete(item=shop_item_autocomplete)
     async def buy(self, interaction: discord.Interaction, item: str):
         """Allows players to buy an item if they have enough money and if it's in stock."""
         await interaction.response.defer(thinking=True)
 
         user_id = str(interaction.user.id)
-
-        shop_data = load_json("stanley_shop.json")
-        gold_data = load_json("gold_data.json")
-        inventory_data = load_json("player_inventories.json")
-
         item = item.lower().strip()
         logger.info(f"🔍 {interaction.user.name} is attempting to buy `{item}`.")
 
-        # Search for item in all categories
-        found_item = next(
-            (data for category in shop_data.values() for name, data in category.items() if name.lower() == item),
-            None
-        )
+        def purchase(tx):
+            success, response = self.process_purchase(tx, interaction.user, user_id, item)
+            if not success:
+                tx.rollback()
+            return response
 
-        if not found_item:
-            await interaction.followup.send(get_response("buy_not_available", item=item))
-            return
+        # ✅ Gold, stock & inventory change together in one locked commit, off the event loop
+        response = await STORE.transaction(SHOP_FILES, purchase)
+        await interaction.followup.send(response)
 
-        if found_item["stock"] <= 0:
-            await interaction.followup.send(get_response("buy_no_stock", item=item))
-            return
+    def process_purchase(self, tx, user, user_id, item):
+        """Moves gold, stock and inventory for a purchase inside `tx`. Returns (success, reply)."""
+        shop_data = tx["stanley_shop.json"]
+        gold_data = tx["gold_data.json"]
 
-        player_cp = sum(
-            gold_data.get(user_id, {}).get(k, 0) * v
-            for k, v in {"gp": 100, "sp": 10, "cp": 1}.items()
-        )
+        # Indexed lookup across all categories
+        found = SHOP_CATALOG.lookup(shop_data, item)
 
-        if player_cp < found_item["price_cp"]:
-            await interaction.followup.send(f"❌ You don't have enough gold to buy `{item}`.")
-            return
+        if not found:
+            return False, get_response("buy_not_available", item=item)
+
+        _, _, found_item = found
+
+        if found_item["stock"] <= 0:
+            return False, get_response("buy_no_stock", item=item)
 
         # Deduct price from player's gold
-        player_cp -= found_item["price_cp"]
-        gold_data[user_id] = {"gp": player_cp // 100, "sp": (player_cp % 100) // 10, "cp": player_cp % 10}
-        save_json("gold_data.json", gold_data)
+        if not apply_changes(gold_data, {user_id: Money(-found_item["price_cp"])}):
+            return False, f"❌ You don't have enough gold to buy `{item}`."
 
         # Deduct stock
         found_item["stock"] -= 1
-        save_json("stanley_shop.json", shop_data)
 
-        # Add item to player's inventory
-        inventory_data.setdefault(user_id, {})
-        inventory_data[user_id][item] = inventory_data[user_id].get(item, 0) + 1
-        save_json("player_inventories.json", inventory_data)
+        # Add item to player's inventory (stored under the name Basil uses too)
+        INVENTORY.stage_deltas(tx, {user_id: {item: 1}})  # ✅ Committed with the gold & stock, then cached
+        tx.record("buy", user_id, item=canonical_item(item), quantity=1, cp=-found_item["price_cp"])
 
-        logger.info(f"✅ {interaction.user.name} successfully bought `{item}`.")
-        await interaction.followup.send(get_response("buy_success", user=interaction.user.name, item=item))
+        logger.info(f"✅ {user.name} successfully bought `{item}`.")
+        return True, get_response("buy_success", user=user.name, item=item)
 
     @app_commands.command(name="sell", description="Sell an item back to Stanley for half its value.")
+    @app_commands.autocomplete(item=shop_item_autocomplete)
     async def sell(self, interaction: discord.Interaction, item: str):
         """Allows a player to sell an item for half its value."""
         await interaction.response.defer(thinking=True)
 
         user_id = str(interaction.user.id)
-        shop_data = load_json("stanley_shop.json")
-        gold_data = load_json("gold_data.json")
-        inventory_data = load_json("player_inventories.json")
-
         logger.info(f"🔍 {interaction.user.name} is attempting to sell `{item}`.")
 
+        def sale(tx):
+            success, response = self.process_sale(tx, interaction.user, user_id, item)
+            if not success:
+                tx.rollback()
+            return response
+
+        # ✅ Gold, stock & inventory change together in one locked commit, off the event loop
+        response = await STORE.transaction(SHOP_FILES, sale)
+        await interaction.followup.send(response)
+
+    def process_sale(self, tx, user, user_id, item):
+        """Moves gold, stock and inventory for a sale inside `tx`. Returns (success, reply)."""
+        shop_data = tx["stanley_shop.json"]
+        gold_data = tx["gold_data.json"]
+        inventory_data = tx["player_inventories.json"]
+
         # Ensure inventory exists
-        if user_id not in inventory_data or not inventory_data[user_id]:
-            await interaction.followup.send(f"❌ {interaction.user.mention}, you don't have anything to sell!")
-            return
+        owned = normalise_inventory(inventory_data.get(user_id, {}))
+        if not owned:
+            return False, f"❌ {user.mention}, you don't have anything to sell!"
 
         item = item.lower().strip()
 
         # Check if the player owns the item
-        matched_item = next((name for name in inventory_data[user_id] if name.lower() == item), None)
-        if not matched_item:
-            await interaction.followup.send(get_response("sell_no_item", user=interaction.user.name, item=item))
-            return
+        matched_item = canonical_item(item)
+        if matched_item not in owned:
+            return False, get_response("sell_no_item", user=user.name, item=item)
 
         # Find the item's price
-        found_item = next(
-            (data for category in shop_data.values() for name, data in category.items() if name.lower() == item),
-            None
-        )
+        found = SHOP_CATALOG.lookup(shop_data, item)
+
+        if not found:
+            return False, get_response("sell_not_shop_item", user=user.name, item=item)
 
-        if not found_item:
-            await interaction.followup.send(get_response("sell_not_shop_item", user=interaction.user.name, item=item))
-            return
+        _, _, found_item = found
 
-        sell_price_cp = found_item["price_cp"] // 2  # Selling is half price
+        sell_price = Money(found_item["price_cp"] // 2)  # Selling is half price
 
         # Remove item from inventory
-        inventory_data[user_id][item] -= 1
-        if inventory_data[user_id][item] <= 0:
-            del inventory_data[user_id][item]  # Remove if count reaches 0
-        save_json("player_inventories.json", inventory_data)
+        INVENTORY.stage_deltas(tx, {user_id: {matched_item: -1}})
 
         # Add stock back to the shop
-        for category in shop_data.values():
-            if matched_item in category:
-                category[matched_item]["stock"] += 1
-                save_json("stanley_shop.json", shop_data)
-                break
+        found_item["stock"] += 1
 
         # Add gold to player
-        player_cp = sum(
-            gold_data.get(user_id, {}).get(k, 0) * v
-            for k, v in {"gp": 100, "sp": 10, "cp": 1}.items()
-        )
-
-        player_cp += sell_price_cp
-        gold_data[user_id] = {"gp": player_cp // 100, "sp": (player_cp % 100) // 10, "cp": player_cp % 10}
-        save_json("gold_data.json", gold_data)
+        apply_changes(gold_data, {user_id: sell_price})
+        tx.record("sell", user_id, item=matched_item, quantity=-1, cp=sell_price.cp)
 
-        logger.info(f"✅ {interaction.user.name} sold `{matched_item}` for `{sell_price_cp // 100} gp`.")
-        await interaction.followup.send(get_response("sell_success", user=interaction.user.name, item=matched_item, price_gp=sell_price_cp // 100))
+        logger.info(f"✅ {user.name} sold `{matched_item}` for `{sell_price}`.")
+        return True, get_response("sell_success", user=user.name, item=matched_item, price_gp=sell_price.gp)
 
 async def setup(bot):
     """Loads the ShopTransactions cog into the bot."""
@@ -0,0 +1,49 @@
+import discord
+from discord import app_commands
+from data_manager import load_json, document_version, STORE
+from shared_inventories.autocomplete import AutocompleteService
+
+# ✅ One index per document, rebuilt only when that document changes on disk.
+# Checking its version (and any rebuild) reads storage, so it runs on the storage pool, never on the loop.
+SUGGESTIONS = AutocompleteService()
+
+SUGGESTIONS.register(
+    "shop_categories",
+    lambda: document_version("stanley_shop.json"),
+    lambda: list(load_json("stanley_shop.json").keys())
+)
+SUGGESTIONS.register(
+    "shop_items",
+    lambda: document_version("stanley_shop.json"),
+    lambda: [name for items in load_json("stanley_shop.json").values() for name in items]
+)
+SUGGESTIONS.register(
+    "requestable_items",
+    lambda: document_version("requestable_items.json"),
+    lambda: [name for items in load_json("requestable_items.json").values() for name in items]
+)
+SUGGESTIONS.register(
+    "pending_requests",
+    lambda: document_version("requests.json"),
+    lambda: list(load_json("requests.json").keys())
+)
+
+async def _choices(source, current, label=str):
+    names = await STORE.run(SUGGESTIONS.complete, source, current)
+    return [app_commands.Choice(name=label(name), value=name) for name in names]
+
+async def category_autocomplete(interaction: discord.Interaction, current: str):
+    """Suggests shop categories."""
+    return await _choices("shop_categories", current, lambda c: c.replace("_", " ").title())
+
+async def shop_item_autocomplete(interaction: discord.Interaction, current: str):
+    """Suggests items currently listed in Stanley's shop."""
+    return await _choices("shop_items", current, str.capitalize)
+
+async def requestable_autocomplete(interaction: discord.Interaction, current: str):
+    """Suggests items that can be requested."""
+    return await _choices("requestable_items", current, str.capitalize)
+
+async def pending_request_autocomplete(interaction: discord.Interaction, current: str):
+    """Suggests items with open requests."""
+    return await _choices("pending_requests", current, str.capitalize)
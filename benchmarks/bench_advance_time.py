@@ -0,0 +1,73 @@
+"""Cost of `/advance_time`: one world-clock tick vs the old hour-by-hour crafting loop.
+
+The old command re-ran Basil's crafting once per hour, each run reloading and rewriting
+market.json and crafted_items.json. Both paths run against copies of Basil's data with
+a synthetic cooldown file.
+
+Usage: python benchmarks/bench_advance_time.py [players]
+"""
+import importlib
+import json
+import logging
+import os
+import shutil
+import sys
+import tempfile
+import time
+
+ROOT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+BASIL_DIR = os.path.join(ROOT_DIR, "Basil")
+HOURS = [1, 24, 168, 8760]
+WORLD_FILES = ["in_game_time.json", "player_cooldowns.json", "market.json", "crafted_items.json", "recipes.json", "enhanced_recipes.json"]
+
+def load_basil(folder):
+    sys.path.insert(0, BASIL_DIR)
+    data_manager = importlib.import_module("data_manager")
+    for filename in WORLD_FILES:
+        data_manager.REQUIRED_FILES[filename] = (folder, {})
+    return data_manager, importlib.import_module("world_clock"), importlib.import_module("crafting_simulator")
+
+def write_fixtures(folder, players):
+    for filename in ("market.json", "recipes.json", "enhanced_recipes.json"):
+        shutil.copy(os.path.join(BASIL_DIR, "basil_data", filename), folder)
+    documents = {
+        "in_game_time.json": {"days": 0, "hours": 0},
+        "player_cooldowns.json": {str(10**17 + n): {"gather_attempts": 1, "last_gather_day": 0} for n in range(players)},
+        "crafted_items.json": {},
+    }
+    for filename, data in documents.items():
+        with open(os.path.join(folder, filename), "w", encoding="utf-8") as file:
+            json.dump(data, file, indent=4)
+
+def hour_by_hour(dm, simulator, hours):
+    """The old loop: every hour reloads the crafting inputs, crafts once and saves both files."""
+    for _ in range(hours):
+        market, crafted_items = dm.load_json("market.json"), dm.load_json("crafted_items.json")
+        recipes, enhanced_recipes = dm.load_json("recipes.json"), dm.load_json("enhanced_recipes.json")
+        stock = {item: data["stock"] for item, data in market.items() if isinstance(data, dict)}
+        simulator.apply_crafting_outcome(simulator.simulate_crafting(1, recipes, enhanced_recipes, stock), market, crafted_items)
+        dm.save_json("market.json", market)
+        dm.save_json("crafted_items.json", crafted_items)
+
+def timed(function, *args):
+    start = time.perf_counter()
+    function(*args)
+    return (time.perf_counter() - start) * 1000
+
+def main():
+    players = int(sys.argv[1]) if len(sys.argv) > 1 else 1_000
+    logging.disable(logging.CRITICAL)
+
+    with tempfile.TemporaryDirectory() as folder:
+        write_fixtures(folder, players)
+        dm, world_clock, simulator = load_basil(folder)
+
+        print(f"Milliseconds to advance the clock ({players:,} players in player_cooldowns.json)")
+        for hours in HOURS:
+            tick = timed(world_clock.advance, hours)
+            loop = timed(hour_by_hour, dm, simulator, hours) if hours <= 168 else float("nan")
+            print(f"  {hours:>5} hours  advance() {tick:9.2f}   hour-by-hour {loop:10.2f}")
+        print("  (hour-by-hour is skipped for 8760 hours: ~17.5k full-file saves)")
+
+if __name__ == "__main__":
+    main()
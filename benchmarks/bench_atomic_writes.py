@@ -0,0 +1,67 @@
+"""Write latency of the shared files at 10k players: plain vs atomic vs atomic + backups.
+
+Usage: python benchmarks/bench_atomic_writes.py [players] [rounds]
+"""
+import json
+import os
+import random
+import statistics
+import sys
+import tempfile
+import time
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from shared_inventories.atomic_io import atomic_write_json
+
+ITEMS = ["healing potion", "rope", "torch", "Wild Sageroot", "Bloodgrass", "Mandrake Root", "Fennel Silk", "Voidroot"]
+
+def synthetic_documents(players):
+    """Builds gold, inventory and stats documents shaped like the real shared files."""
+    ids = [str(10**17 + n) for n in range(players)]
+    return {
+        "gold_data.json": {pid: {"gp": random.randint(0, 500), "sp": random.randint(0, 9), "cp": random.randint(0, 9)} for pid in ids},
+        "player_inventories.json": {pid: {item: random.randint(1, 20) for item in random.sample(ITEMS, 4)} for pid in ids},
+        "player_stats.json": {
+            pid: {"wisdom": 2, "intelligence": 3, "charisma": 1, "proficiency": 2,
+                  "proficient": True, "herbalism_kit": True, "alchemist_tools": False}
+            for pid in ids
+        },
+    }
+
+def plain_write(path, data):
+    """The old `save_json` path: truncate in place and stream the dump."""
+    with open(path, "w", encoding="utf-8") as file:
+        json.dump(data, file, indent=4)
+
+def measure(write, path, data, rounds):
+    timings = []
+    for _ in range(rounds):
+        start = time.perf_counter()
+        write(path, data)
+        timings.append((time.perf_counter() - start) * 1000)
+    timings.sort()
+    return statistics.mean(timings), timings[len(timings) // 2], timings[min(len(timings) - 1, int(len(timings) * 0.99))]
+
+def main():
+    players = int(sys.argv[1]) if len(sys.argv) > 1 else 10_000
+    rounds = int(sys.argv[2]) if len(sys.argv) > 2 else 20
+    strategies = {
+        "plain (w + json.dump)": plain_write,
+        "atomic (tmp + fsync + rename)": lambda path, data: atomic_write_json(path, data),
+        "atomic + 2 backups": lambda path, data: atomic_write_json(path, data, backups=2),
+        "atomic, no fsync": lambda path, data: atomic_write_json(path, data, fsync=False),
+    }
+
+    print(f"Write latency at {players:,} players, {rounds} rounds (ms: mean / p50 / p99)")
+    with tempfile.TemporaryDirectory() as folder:
+        for filename, data in synthetic_documents(players).items():
+            path = os.path.join(folder, filename)
+            plain_write(path, data)
+            print(f"\n{filename} ({os.path.getsize(path) / 1_000_000:.1f} MB)")
+            for label, write in strategies.items():
+                mean, p50, p99 = measure(write, path, data, rounds)
+                print(f"  {label:<32} {mean:8.2f} {p50:8.2f} {p99:8.2f}")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,78 @@
+"""Document codecs: encode / decode time and size on synthetic 10k-player data.
+
+Builds the hot documents a busy server would have — inventories, gold, cooldowns
+(per-player and timed) and Stanley's shop — and round-trips each through every
+codec `document_codec` has available (orjson and msgpack only when installed),
+decoding through the same sniffing `decode()` the data managers use.
+
+Usage: python benchmarks/bench_codecs.py [players] [repeats]
+"""
+import json
+import os
+import random
+import sys
+import time
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from shared_inventories.document_codec import CODECS, decode
+
+ITEMS = ["Rope", "Torch", "Healing Potion", "Wild Sageroot", "Bloodgrass", "Mandrake Root", "Fennel Silk", "Voidroot",
+         "Potion of Climbing", "Oil of Slipperiness", "Antitoxin", "Bedroll", "Caltrops", "Chalk", "Crowbar"]
+
+def synthetic_documents(players):
+    player_ids = [str(10**17 + n) for n in range(players)]
+    return {
+        "player_inventories.json": {
+            player: {item: random.randint(1, 20) for item in random.sample(ITEMS, random.randint(2, 10))} for player in player_ids
+        },
+        "gold_data.json": {player: random.randint(0, 10**7) for player in player_ids},
+        "player_cooldowns.json": {
+            player: {f"identify_{item}": random.randint(0, 400) for item in random.sample(ITEMS, 3)} for player in player_ids
+        },
+        "cooldowns.json": {"entries": [[random.choice(player_ids), "gather", random.choice(ITEMS), time.time()] for _ in range(players)]},
+        "stanley_shop.json": {
+            category: {f"{category} item {n}": {"price_cp": random.randint(1, 10**5), "stock": random.randint(0, 9), "rarity": "Common"}
+                       for n in range(300)}
+            for category in ("mundane", "magical", "potions")
+        },
+    }
+
+def best_ms(function, repeats):
+    best = float("inf")
+    for _ in range(repeats):
+        start = time.perf_counter()
+        result = function()
+        best = min(best, time.perf_counter() - start)
+    return result, best * 1000
+
+def main():
+    players = int(sys.argv[1]) if len(sys.argv) > 1 else 10_000
+    repeats = int(sys.argv[2]) if len(sys.argv) > 2 else 5
+    random.seed(1)
+    documents = synthetic_documents(players)
+    missing = [name for name in ("orjson", "msgpack") if name not in CODECS]
+
+    print(f"{players:,} players, best of {repeats}" + (f" ({', '.join(missing)} not installed)" if missing else ""))
+    print(f"{'document':<24} {'codec':<13} {'size':>10} {'vs json':>8} {'encode':>10} {'decode':>10}")
+    totals = {name: [0, 0.0, 0.0] for name in CODECS}
+    for filename, data in documents.items():
+        baseline = None
+        for name, codec in CODECS.items():
+            payload, encode_ms = best_ms(lambda: codec.encode(data), repeats)
+            decoded, decode_ms = best_ms(lambda: decode(payload), repeats)
+            assert json.dumps(decoded, sort_keys=True) == json.dumps(data, sort_keys=True), (filename, name)
+            baseline = baseline or len(payload)
+            totals[name][0] += len(payload)
+            totals[name][1] += encode_ms
+            totals[name][2] += decode_ms
+            print(f"{filename:<24} {name:<13} {len(payload) / 1024:7.0f} KiB {len(payload) / baseline:7.0%} "
+                  f"{encode_ms:7.1f} ms {decode_ms:7.1f} ms")
+        print()
+
+    baseline = totals["json"][0]
+    for name, (size, encode_ms, decode_ms) in totals.items():
+        print(f"{'all hot documents':<24} {name:<13} {size / 1024:7.0f} KiB {size / baseline:7.0%} {encode_ms:7.1f} ms {decode_ms:7.1f} ms")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,53 @@
+"""Basil's crafting simulation: the attempt-by-attempt engine vs the NumPy engine.
+
+Runs both engines against the real recipes with the current market stock and with
+effectively unlimited stock, for a day up to ten years of hourly attempts.
+
+Usage: python benchmarks/bench_crafting_simulation.py [repeats]
+"""
+import json
+import os
+import sys
+import time
+
+ROOT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, os.path.join(ROOT_DIR, "Basil"))
+
+import crafting_simulator  # noqa: E402
+
+DATA_DIR = os.path.join(ROOT_DIR, "Basil", "basil_data")
+ATTEMPTS = [24, 720, 8_760, 87_600]  # a day, a month, a year, ten years (one attempt per hour)
+
+def load(filename):
+    with open(os.path.join(DATA_DIR, filename), encoding="utf-8") as file:
+        return json.load(file)
+
+def best_of(repeats, engine, *args):
+    best = float("inf")
+    for seed in range(repeats):
+        start = time.perf_counter()
+        engine(*args, seed)
+        best = min(best, time.perf_counter() - start)
+    return best * 1000
+
+def main():
+    repeats = int(sys.argv[1]) if len(sys.argv) > 1 else 5
+    recipes, enhanced_recipes = load("recipes.json"), load("enhanced_recipes.json")
+    market_stock = {item: data["stock"] for item, data in load("market.json").items() if isinstance(data, dict)}
+    stocks = {"market stock": market_stock, "unlimited stock": {item: 10**9 for item in market_stock}}
+
+    engines = [("sequential", crafting_simulator._simulate_sequential)]
+    if crafting_simulator.np is not None:
+        engines.append(("numpy", crafting_simulator._simulate_vectorised))
+    else:
+        print("numpy is not installed; only the sequential engine is timed")
+
+    print(f"Best of {repeats}, milliseconds")
+    for label, stock in stocks.items():
+        print(f"  {label}")
+        for attempts in ATTEMPTS:
+            timings = "  ".join(f"{name} {best_of(repeats, engine, attempts, recipes, enhanced_recipes, stock):9.2f}" for name, engine in engines)
+            print(f"    {attempts:>7,} attempts  {timings}")
+
+if __name__ == "__main__":
+    main()
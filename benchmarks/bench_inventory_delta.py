@@ -0,0 +1,73 @@
+"""Per-item vs bulk inventory updates through the shared inventory service.
+
+Applies the same change — a handful of items for each of several players — one
+item at a time, then as a single `apply_deltas` call, against an inventory file
+holding 1k and 100k item entries.
+
+Usage: python benchmarks/bench_inventory_delta.py [items per change] [players per change]
+"""
+import importlib
+import json
+import logging
+import os
+import random
+import sys
+import tempfile
+import time
+
+ROOT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+SIZES = [1_000, 100_000]  # item entries in player_inventories.json
+ITEMS_PER_PLAYER = 20
+
+def load_inventory_service(folder):
+    sys.path.insert(0, ROOT_DIR)
+    inventory_service = importlib.import_module("shared_inventories.inventory_service")
+    inventory_service.JOURNAL.folder = os.path.join(folder, "journal")  # ✅ Keep the real journal clean
+    return inventory_service.InventoryService(os.path.join(folder, "player_inventories.json"))
+
+def write_inventory(folder, entries):
+    players = max(1, entries // ITEMS_PER_PLAYER)
+    inventories = {
+        str(10**17 + n): {f"Item {i}": random.randint(5, 20) for i in range(ITEMS_PER_PLAYER)}
+        for n in range(players)
+    }
+    with open(os.path.join(folder, "player_inventories.json"), "w", encoding="utf-8") as file:
+        json.dump(inventories, file, indent=4)
+    return list(inventories)
+
+def random_change(player_ids, items, players):
+    return {
+        player_id: {f"Item {i}": random.choice([-1, 1, 2]) for i in random.sample(range(ITEMS_PER_PLAYER), items)}
+        for player_id in random.sample(player_ids, players)
+    }
+
+def per_item(inventory, change):
+    for player_id, delta in change.items():
+        for item, quantity in delta.items():
+            inventory.apply_delta(player_id, {item: quantity}, clamp=True)
+
+def bulk(inventory, change):
+    inventory.apply_deltas(change, clamp=True)
+
+def timed(function, *args):
+    start = time.perf_counter()
+    function(*args)
+    return (time.perf_counter() - start) * 1000
+
+def main():
+    items = int(sys.argv[1]) if len(sys.argv) > 1 else 5
+    players = int(sys.argv[2]) if len(sys.argv) > 2 else 4
+    logging.disable(logging.CRITICAL)
+
+    with tempfile.TemporaryDirectory() as folder:
+        inventory = load_inventory_service(folder)
+        print(f"Milliseconds to apply {items} item changes for each of {players} players")
+        for entries in SIZES:
+            player_ids = write_inventory(folder, entries)
+            change = random_change(player_ids, items, players)
+            slow = timed(per_item, inventory, change)
+            fast = timed(bulk, inventory, change)
+            print(f"  {entries:>7,} items on file  per-item {slow:10.1f}   bulk {fast:8.1f}   ({slow / fast:.0f}x)")
+
+if __name__ == "__main__":
+    main()
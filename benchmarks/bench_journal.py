@@ -0,0 +1,106 @@
+"""Transaction journal: append cost, `/audit_log` tail latency and offline queries over a big journal.
+
+Appends N synthetic gold & item movements (spread over a year) through `Journal.append`,
+next to the old audit log (load the JSON list, append, keep the last 50, save it back).
+Then times `tail`, and `query` by date range / user / item against a plain scan that
+decodes every line.
+
+Usage: python benchmarks/bench_journal.py [entries] [segment MiB]
+"""
+import json
+import os
+import random
+import sys
+import tempfile
+import threading
+import time
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from shared_inventories.atomic_io import atomic_write_json
+from shared_inventories.journal import Journal
+
+YEAR = 365 * 24 * 3600
+START = 1_700_000_000
+USERS = [str(10**17 + n) for n in range(500)]
+ITEMS = ["Rope", "Torch", "Healing Potion", "Wild Sageroot", "Bloodgrass", "Mandrake Root", "Fennel Silk", "Voidroot"]
+ACTIONS = ["buy", "sell", "gather", "craft", "givegold"]
+
+def synthetic_entry(n, entries):
+    entry = {"ts": START + n * YEAR / entries, "action": random.choice(ACTIONS), "user": random.choice(USERS)}
+    if random.random() < 0.7:
+        entry["item"], entry["quantity"] = random.choice(ITEMS), random.choice([-1, 1, 2])
+    if random.random() < 0.5:
+        entry["cp"] = random.randint(-5000, 5000)
+    return entry
+
+def old_audit_log(path, entry):
+    """The old `log_transaction`: read the whole list, append, truncate to 50, write it back."""
+    with open(path, "r", encoding="utf-8") as file:
+        audit_log = json.load(file)
+    audit_log.append(entry)
+    atomic_write_json(path, audit_log[-50:])
+
+def scan(journal, match):
+    """Every entry, decoded, then filtered: what a query costs without prefilters or the index."""
+    found = 0
+    for number in journal.segments():
+        with journal._open_segment(number) as file:
+            found += sum(1 for line in file if match(json.loads(line)))
+    return found
+
+def timed(function):
+    start = time.perf_counter()
+    result = function()
+    return result, (time.perf_counter() - start) * 1000
+
+def main():
+    entries = int(sys.argv[1]) if len(sys.argv) > 1 else 1_000_000
+    segment_mib = int(sys.argv[2]) if len(sys.argv) > 2 else 8
+
+    with tempfile.TemporaryDirectory() as folder:
+        journal = Journal(os.path.join(folder, "journal"), max_segment_bytes=segment_mib * 1024 * 1024)
+        old_path = os.path.join(folder, "inventory_logs.json")
+        atomic_write_json(old_path, [])
+
+        samples = [synthetic_entry(n, 2_000) for n in range(2_000)]
+        _, old_ms = timed(lambda: [old_audit_log(old_path, entry) for entry in samples])
+        print(f"Old audit log (keeps 50):   {old_ms * 1000 / len(samples):8.1f} µs/append")
+
+        start = time.perf_counter()
+        for n in range(entries):
+            journal.append(synthetic_entry(n, entries))
+        elapsed = time.perf_counter() - start
+        print(f"Journal append:             {elapsed * 1e6 / entries:8.1f} µs/append ({entries / elapsed:,.0f}/s, keeps all {entries:,})")
+
+        for thread in threading.enumerate():
+            if thread is not threading.current_thread() and thread.daemon:
+                thread.join()  # ✅ Let the background gzips finish before reading
+        files = os.listdir(journal.folder)
+        size = sum(os.path.getsize(os.path.join(journal.folder, name)) for name in files)
+        print(f"On disk: {len(journal.segments())} segments, {size / 1_000_000:.1f} MB with gzip\n")
+
+        for limit in (10, 100):
+            _, ms = timed(lambda: journal.tail(limit))
+            print(f"{f'tail({limit}):':<27} {ms:9.2f} ms")
+
+        day_since = START + YEAR * 0.6
+        day_until = day_since + 24 * 3600
+        user, item = USERS[7], "Voidroot"
+        cases = [
+            ("one day", {"since": day_since, "until": day_until},
+             lambda entry: day_since <= entry["ts"] <= day_until),
+            ("one user", {"user": user}, lambda entry: entry["user"] == user),
+            ("one user, one week", {"user": user, "since": day_since, "until": day_since + 7 * 24 * 3600},
+             lambda entry: entry["user"] == user and day_since <= entry["ts"] <= day_since + 7 * 24 * 3600),
+            ("one item", {"item": item}, lambda entry: entry.get("item") == item),
+        ]
+        print(f"\n{'query':<22} {'matches':>8} {'journal.query':>14} {'full scan':>11}")
+        for label, filters, match in cases:
+            found, query_ms = timed(lambda: sum(1 for _ in journal.query(**filters)))
+            scanned, scan_ms = timed(lambda: scan(journal, match))
+            assert found == scanned, (label, found, scanned)
+            print(f"{label:<22} {found:>8,} {query_ms:>11.1f} ms {scan_ms:>8.1f} ms")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,115 @@
+"""Purchases per second through Stanley's data layer: three separate saves vs one transaction.
+
+Mirrors the gold / stock / inventory updates `/buy` makes, against a copy of the real
+shop and synthetic gold & inventory files. Runs on the JSON backend and on SQLite.
+"1 of 3 changed" is a transaction that loads all three documents but only moves gold
+(unchanged documents are skipped, and a single file needs no commit journal).
+
+Usage: python benchmarks/bench_purchases.py [players] [purchases]
+"""
+import importlib
+import json
+import logging
+import os
+import random
+import shutil
+import sys
+import tempfile
+import time
+
+ROOT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+SHARED_FILES = ["gold_data.json", "player_inventories.json", "stanley_shop.json"]
+
+def load_stanley_data_manager(folder):
+    sys.path.insert(0, os.path.join(ROOT_DIR, "Stanley"))
+    data_manager = importlib.import_module("data_manager")
+    for filename in SHARED_FILES:
+        data_manager.REQUIRED_FILES[filename] = (folder, {})
+    return data_manager
+
+def load_sqlite_store():
+    from shared_inventories.storage import get_record_store  # ✅ Importable once the data manager set up sys.path
+    return get_record_store("gold_data.json")
+
+def write_fixtures(folder, players):
+    shutil.copy(os.path.join(ROOT_DIR, "shared_inventories", "stanley_shop.json"), folder)
+    with open(os.path.join(folder, "stanley_shop.json"), encoding="utf-8") as file:
+        shop = json.load(file)
+    for category in shop.values():
+        for data in category.values():
+            data["stock"] = 1_000_000  # Never run out mid-benchmark
+    documents = {
+        "stanley_shop.json": shop,
+        "gold_data.json": {str(n): {"gp": 1_000_000, "sp": 0, "cp": 0} for n in range(players)},
+        "player_inventories.json": {str(n): {"torch": 1} for n in range(players)},
+    }
+    for filename, data in documents.items():
+        with open(os.path.join(folder, filename), "w", encoding="utf-8") as file:
+            json.dump(data, file, indent=4)
+    return documents
+
+def find_item(shop_data, item):
+    return next((data for category in shop_data.values() for name, data in category.items() if name.lower() == item), None)
+
+def buy_with_three_saves(dm, user_id, item):
+    """The pre-transaction `/buy`: load three files, save each one separately."""
+    shop_data, gold_data, inventory_data = dm.load_json("stanley_shop.json"), dm.load_json("gold_data.json"), dm.load_json("player_inventories.json")
+    found_item = find_item(shop_data, item)
+    player_cp = sum(gold_data[user_id][k] * v for k, v in {"gp": 100, "sp": 10, "cp": 1}.items()) - found_item["price_cp"]
+    gold_data[user_id] = {"gp": player_cp // 100, "sp": (player_cp % 100) // 10, "cp": player_cp % 10}
+    dm.save_json("gold_data.json", gold_data)
+    found_item["stock"] -= 1
+    dm.save_json("stanley_shop.json", shop_data)
+    inventory_data[user_id][item] = inventory_data[user_id].get(item, 0) + 1
+    dm.save_json("player_inventories.json", inventory_data)
+
+def buy_in_transaction(dm, user_id, item):
+    """The `/buy` path: one locked unit of work, one commit."""
+    with dm.transaction("stanley_shop.json", "gold_data.json", "player_inventories.json") as tx:
+        found_item = find_item(tx["stanley_shop.json"], item)
+        gold_data = tx["gold_data.json"]
+        player_cp = sum(gold_data[user_id][k] * v for k, v in {"gp": 100, "sp": 10, "cp": 1}.items()) - found_item["price_cp"]
+        gold_data[user_id] = {"gp": player_cp // 100, "sp": (player_cp % 100) // 10, "cp": player_cp % 10}
+        found_item["stock"] -= 1
+        inventory = tx["player_inventories.json"][user_id]
+        inventory[item] = inventory.get(item, 0) + 1
+
+def charge_in_transaction(dm, user_id, item):
+    """A transaction over the `/buy` documents where only the gold changes."""
+    with dm.transaction("stanley_shop.json", "gold_data.json", "player_inventories.json") as tx:
+        found_item = find_item(tx["stanley_shop.json"], item)
+        gold_data = tx["gold_data.json"]
+        player_cp = sum(gold_data[user_id][k] * v for k, v in {"gp": 100, "sp": 10, "cp": 1}.items()) - found_item["price_cp"]
+        gold_data[user_id] = {"gp": player_cp // 100, "sp": (player_cp % 100) // 10, "cp": player_cp % 10}
+        tx["player_inventories.json"][user_id].get(item, 0)
+
+def run(dm, purchase, players, purchases, items):
+    start = time.perf_counter()
+    for _ in range(purchases):
+        purchase(dm, str(random.randrange(players)), random.choice(items))
+    return purchases / (time.perf_counter() - start)
+
+def main():
+    players = int(sys.argv[1]) if len(sys.argv) > 1 else 1_000
+    purchases = int(sys.argv[2]) if len(sys.argv) > 2 else 200
+    logging.disable(logging.CRITICAL)
+
+    with tempfile.TemporaryDirectory() as folder:
+        documents = write_fixtures(folder, players)
+        dm = load_stanley_data_manager(folder)
+        items = [name.lower() for category in documents["stanley_shop.json"].values() for name in category]
+
+        print(f"Purchases/sec with {players:,} players, {purchases} purchases each")
+        for backend in ("json", "sqlite"):
+            os.environ["STORAGE_BACKEND"] = backend
+            os.environ["SQLITE_PATH"] = os.path.join(folder, "bench.sqlite3")
+            if backend == "sqlite":
+                store = load_sqlite_store()
+                for filename in SHARED_FILES:
+                    store.replace_document(filename, documents[filename])
+            for label, purchase in (("three saves", buy_with_three_saves), ("one transaction", buy_in_transaction),
+                                    ("1 of 3 changed", charge_in_transaction)):
+                print(f"  {backend:<7} {label:<16} {run(dm, purchase, players, purchases, items):10.1f} /s")
+
+if __name__ == "__main__":
+    main()
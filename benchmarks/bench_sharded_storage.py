@@ -0,0 +1,94 @@
+"""Sharded vs single-file storage: one player's change, listing players and a full load.
+
+Builds `player_inventories.json` and `gold_data.json` for N players, migrates them
+into a shard folder with the migration tool, then drives the shared services
+(`InventoryService`, `WalletStore`) against each backend: single-player inventory
+changes and gold transfers, `players()` (what `get_all_players()` calls), and a
+cold read of the whole document (what the other bot does after a change).
+
+Reported per operation: time, and bytes written per change.
+
+Usage: python benchmarks/bench_sharded_storage.py [players] [changes]
+"""
+import importlib
+import json
+import logging
+import os
+import random
+import sys
+import tempfile
+import time
+
+ROOT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+ITEMS = [f"Item {n}" for n in range(20)]
+
+def write_fixtures(folder, players):
+    player_ids = [str(10**17 + n) for n in range(players)]
+    documents = {
+        "player_inventories.json": {player: {item: random.randint(1, 9) for item in random.sample(ITEMS, 8)} for player in player_ids},
+        "gold_data.json": {player: random.randint(0, 10**6) for player in player_ids},
+        "player_stats.json": {player: {"charisma": 1} for player in player_ids},
+    }
+    for filename, data in documents.items():
+        with open(os.path.join(folder, filename), "w", encoding="utf-8") as file:
+            json.dump(data, file, indent=4)
+    return player_ids
+
+def folder_bytes(folder):
+    return sum(os.path.getsize(os.path.join(root, name)) for root, _, names in os.walk(folder) for name in names)
+
+def disk_writes(function):
+    """Runs `function` and returns (ms, bytes written by this process)."""
+    def written():
+        try:
+            with open(f"/proc/{os.getpid()}/io", encoding="utf-8") as io:
+                return next(int(line.split()[1]) for line in io if line.startswith("wchar"))
+        except OSError:
+            return 0
+    before, start = written(), time.perf_counter()
+    function()
+    return (time.perf_counter() - start) * 1000, written() - before
+
+def main():
+    players = int(sys.argv[1]) if len(sys.argv) > 1 else 20_000
+    changes = int(sys.argv[2]) if len(sys.argv) > 2 else 200
+    logging.disable(logging.CRITICAL)
+    sys.path.insert(0, ROOT_DIR)
+
+    with tempfile.TemporaryDirectory() as folder:
+        random.seed(1)
+        player_ids = write_fixtures(folder, players)
+        journal = importlib.import_module("shared_inventories.journal")
+        journal.JOURNAL.folder = os.path.join(folder, "journal")
+        shards = os.path.join(folder, "shards")
+        os.environ["SHARD_PATH"] = shards
+        from shared_inventories.migrate_storage import main as migrate
+        from shared_inventories.inventory_service import InventoryService
+        from shared_inventories.wallet import Money, WalletStore
+        migrate(["to-shards", "--folder", folder, "--shards", shards])
+
+        print(f"\n{players:,} players, {changes} changes "
+              f"(JSON files {sum(os.path.getsize(os.path.join(folder, name)) for name in os.listdir(folder) if name.endswith('.json')) / 1e6:.1f} MB, "
+              f"shards {folder_bytes(shards) / 1e6:.1f} MB)")
+        print(f"{'':<12} {'inventory change':>22} {'gold transfer':>22} {'players()':>11} {'cold load':>11}")
+        for backend in ("json", "sharded"):
+            os.environ["STORAGE_BACKEND"] = backend
+            inventory = InventoryService(os.path.join(folder, "player_inventories.json"))
+            wallets = WalletStore(os.path.join(folder, "gold_data.json"))
+            inventory.players(), wallets.balance(player_ids[0])  # ✅ Warm the caches, as a running bot would
+
+            random.seed(2)
+            ms, written = disk_writes(lambda: [inventory.apply_delta(random.choice(player_ids), {random.choice(ITEMS): 1}) for _ in range(changes)])
+            inventory_cell = f"{ms / changes:7.2f} ms {written / changes / 1024:7.1f} KiB"
+            ms, written = disk_writes(lambda: [wallets.transfer(*random.sample(player_ids, 2), Money(1)) for _ in range(changes)])
+            gold_cell = f"{ms / changes:7.2f} ms {written / changes / 1024:7.1f} KiB"
+
+            path = os.path.join(folder, "player_inventories.json")
+            players_ms, _ = disk_writes(InventoryService(path).players)
+            cold = InventoryService(path)
+            load_ms, _ = disk_writes(cold.document.current)
+            print(f"{backend:<12} {inventory_cell:>22} {gold_cell:>22} {players_ms:8.1f} ms {load_ms:8.1f} ms")
+            assert sorted(cold.players()) == sorted(player_ids)
+
+if __name__ == "__main__":
+    main()
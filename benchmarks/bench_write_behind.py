@@ -0,0 +1,90 @@
+"""Write-behind: disk writes and caller latency for a busy session of Basil's per-command saves.
+
+Replays bursts like `/gather` and `/advance_time` (each saving `in_game_time.json`,
+`player_cooldowns.json` and `cooldowns.json` through `update_json`) against a
+temporary copy of Basil's data folder, first write-through (`WRITE_BEHIND_MS=0`),
+then with the write-behind window. Interactions arrive `gap` ms apart.
+
+Reported: saves vs disk writes (the coalescing ratio), save latency as seen by the
+command, and the flush timings from `WRITES.metrics()`.
+
+Usage: python benchmarks/bench_write_behind.py [interactions] [gap ms] [window ms]
+"""
+import importlib
+import json
+import logging
+import os
+import random
+import sys
+import tempfile
+import time
+
+ROOT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+FILES = ["in_game_time.json", "player_cooldowns.json", "cooldowns.json"]
+PLAYERS = [str(10**17 + n) for n in range(200)]
+
+def load_basil(folder):
+    """Basil's data layer with its own files redirected to `folder`."""
+    sys.path.insert(0, os.path.join(ROOT_DIR, "Basil"))
+    data_manager = importlib.import_module("data_manager")
+    for filename in FILES:
+        data_manager.REQUIRED_FILES[filename] = (folder, data_manager.REQUIRED_FILES[filename][1])
+    return data_manager
+
+def write_fixtures(folder):
+    cooldowns = {player: {f"gather_{n}": n for n in range(20)} for player in PLAYERS}
+    entries = [[player, "identify", f"herb {n}", n] for player in PLAYERS for n in range(10)]
+    for filename, data in (("in_game_time.json", {"days": 0, "hours": 0}),
+                           ("player_cooldowns.json", cooldowns),
+                           ("cooldowns.json", {"entries": entries})):
+        with open(os.path.join(folder, filename), "w", encoding="utf-8") as file:
+            json.dump(data, file, indent=4)
+
+def interaction(dm, player):
+    """What one busy command does: tick the clock and touch two cooldown files."""
+    with dm.update_json("in_game_time.json") as clock:
+        clock["hours"] += 1
+    with dm.update_json("player_cooldowns.json") as cooldowns:
+        cooldowns.setdefault(player, {})["gather"] = time.time()
+    with dm.update_json("cooldowns.json") as timed:
+        timed["entries"].append([player, "gather", "Wild Sageroot", time.time()])
+        del timed["entries"][: max(0, len(timed["entries"]) - 2_000)]
+
+def run(dm, interactions, gap):
+    latencies = []
+    for _ in range(interactions):
+        start = time.perf_counter()
+        interaction(dm, random.choice(PLAYERS))
+        latencies.append((time.perf_counter() - start) * 1000)
+        time.sleep(max(0.0, gap - (time.perf_counter() - start)))
+    dm.WRITES.flush()  # ✅ What `bot.close()` does
+    return sorted(latencies)
+
+def main():
+    interactions = int(sys.argv[1]) if len(sys.argv) > 1 else 400
+    gap = (float(sys.argv[2]) if len(sys.argv) > 2 else 10) / 1000
+    window_ms = int(sys.argv[3]) if len(sys.argv) > 3 else 250
+    logging.disable(logging.CRITICAL)
+
+    with tempfile.TemporaryDirectory() as folder:
+        write_fixtures(folder)
+        dm = load_basil(folder)
+        print(f"{interactions} interactions, {gap * 1000:.0f} ms apart, {len(FILES)} saves each")
+        print(f"{'':<22} {'saves':>6} {'writes':>7} {'ratio':>6} {'save p50':>9} {'save p99':>9}   flush p50 / p99, dirty p99 (ms)")
+        for label, window in (("write-through", 0), (f"write-behind {window_ms} ms", window_ms)):
+            random.seed(1)
+            os.environ["WRITE_BEHIND_MS"] = str(window)
+            dm.WRITES = dm.WriteBehind(dm._file_path, dm._write_behind)
+            dm.invalidate_cache()
+            latencies = run(dm, interactions, gap)
+            saves = interactions * len(FILES)
+            metrics = dm.WRITES.metrics()
+            writes = metrics["writes"] if window else saves
+            p50, p99 = latencies[len(latencies) // 2], latencies[int(len(latencies) * 0.99)]
+            print(f"{label:<22} {saves:>6} {writes:>7} {saves / writes:>6.1f} {p50:>7.2f}ms {p99:>7.2f}ms   "
+                  f"{metrics['flush_ms_p50']} / {metrics['flush_ms_p99']}, {metrics['dirty_ms_p99']}")
+            with open(os.path.join(folder, "in_game_time.json"), encoding="utf-8") as file:
+                assert json.load(file)["hours"] % interactions == 0, "a save never reached disk"
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,185 @@
+"""Load test: hundreds of concurrent fake interactions, with blocking vs awaited storage calls.
+
+Each fake interaction runs what Stanley's handlers do against a temporary copy of
+the shared files: `/buy` (a three-file transaction), `/balance` and `/stanley_inventory`.
+The "blocking" run calls the data layer straight from the coroutine, as the cogs used
+to; the "async" run awaits the same calls through `STORE` (the storage thread pool).
+Interactions arrive spread over a window while a heartbeat task ticks every
+50 ms, standing in for the gateway heartbeat and everyone else's interactions.
+
+Every fsync is made to take at least `fsync ms` (default 2, a typical SSD; 0 keeps
+the real cost). On tmpfs or a laptop SSD an fsync is nearly free, so the blocking
+run would barely stall the loop and look no worse than the awaited one.
+
+Reported: interaction latency (arrival → reply) p50 / p99, how late the heartbeat
+ran (p99 / max), and how long storage calls held the event loop in total.
+
+Usage: python benchmarks/load_async_store.py [interactions] [players] [arrival window s] [fsync ms]
+"""
+import asyncio
+import importlib
+import json
+import logging
+import os
+import random
+import shutil
+import sys
+import tempfile
+import time
+
+ROOT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+SHARED_FILES = ["gold_data.json", "player_inventories.json", "stanley_shop.json", "player_stats.json"]
+HEARTBEAT_SECONDS = 0.05
+SHOP_FILES = ("stanley_shop.json", "gold_data.json", "player_inventories.json")
+
+def slow_fsync(delay):
+    """Makes every `os.fsync` take at least `delay` seconds, like a real disk."""
+    real_fsync = os.fsync
+    def fsync(fd):
+        time.sleep(delay)
+        real_fsync(fd)
+    os.fsync = fsync
+
+def load_stanley(folder):
+    """Stanley's data layer with the shared files (and the journal) redirected to `folder`."""
+    sys.path.insert(0, os.path.join(ROOT_DIR, "Stanley"))
+    data_manager = importlib.import_module("data_manager")
+    for filename in SHARED_FILES:
+        data_manager.REQUIRED_FILES[filename] = (folder, {})
+    from shared_inventories.inventory_service import InventoryService
+    from shared_inventories.journal import JOURNAL
+    from shared_inventories.wallet import WalletStore
+    JOURNAL.folder = os.path.join(folder, "journal")
+    inventory = InventoryService(os.path.join(folder, "player_inventories.json"))
+    wallets = WalletStore(os.path.join(folder, "gold_data.json"))
+    return data_manager, inventory, wallets
+
+def write_fixtures(folder, players):
+    shutil.copy(os.path.join(ROOT_DIR, "shared_inventories", "stanley_shop.json"), folder)
+    with open(os.path.join(folder, "stanley_shop.json"), encoding="utf-8") as file:
+        shop = json.load(file)
+    for category in shop.values():
+        for data in category.values():
+            data["stock"] = 1_000_000  # Never run out mid-test
+    documents = {
+        "stanley_shop.json": shop,
+        "gold_data.json": {str(n): 10_000_000 for n in range(players)},
+        "player_inventories.json": {str(n): {"Torch": 1, "Rope": 2, "Healing Potion": 1} for n in range(players)},
+        "player_stats.json": {str(n): {"charisma": 1} for n in range(players)},
+    }
+    for filename, data in documents.items():
+        with open(os.path.join(folder, filename), "w", encoding="utf-8") as file:
+            json.dump(data, file, indent=4)
+    return [(category, item) for category, items in shop.items() for item in items]
+
+def purchase(tx, inventory, user_id, category, item):
+    """The body of Stanley's `process_purchase`."""
+    from shared_inventories.wallet import Money, apply_changes
+    found = tx["stanley_shop.json"][category][item]
+    if not apply_changes(tx["gold_data.json"], {user_id: Money(-found["price_cp"])}):
+        tx.rollback()
+        return False
+    found["stock"] -= 1
+    inventory.stage_deltas(tx, {user_id: {item: 1}})
+    tx.record("buy", user_id, item=item, quantity=1, cp=-found["price_cp"])
+    return True
+
+def blocking_handlers(dm, inventory, wallets, on_loop):
+    """The old cogs: storage calls made straight from the coroutine, on the loop's thread."""
+    def blocking(function, *args):
+        start = time.perf_counter()
+        try:
+            return function(*args)
+        finally:
+            on_loop.append(time.perf_counter() - start)
+
+    def buy_now(user_id, category, item):
+        with dm.transaction(*SHOP_FILES) as tx:
+            return purchase(tx, inventory, user_id, category, item)
+
+    async def buy(user_id, category, item):
+        return blocking(buy_now, user_id, category, item)
+
+    async def balance(user_id):
+        return str(blocking(wallets.balance, user_id))
+
+    async def show_inventory(user_id):
+        return blocking(inventory.get_inventory, user_id)
+
+    return buy, balance, show_inventory
+
+def async_handlers(dm, inventory, wallets, on_loop):
+    """The cogs now: the same calls awaited through `STORE`; nothing runs on the loop's thread."""
+    async def buy(user_id, category, item):
+        return await dm.STORE.transaction(SHOP_FILES, lambda tx: purchase(tx, inventory, user_id, category, item))
+
+    async def balance(user_id):
+        return str(await dm.STORE.run(wallets.balance, user_id))
+
+    async def show_inventory(user_id):
+        return await dm.STORE.run(inventory.get_inventory, user_id)
+
+    return buy, balance, show_inventory
+
+def percentile(values, fraction):
+    values = sorted(values)
+    return values[min(len(values) - 1, int(len(values) * fraction))]
+
+async def run_load(handlers, players, shop_items, interactions, window):
+    buy, balance, show_inventory = handlers
+    loop = asyncio.get_running_loop()
+    latencies, heartbeat_lag = [], []
+    done = asyncio.Event()
+
+    async def heartbeat():
+        expected = loop.time() + HEARTBEAT_SECONDS
+        while not done.is_set():
+            await asyncio.sleep(max(0, expected - loop.time()))
+            heartbeat_lag.append(max(0.0, loop.time() - expected) * 1000)
+            expected += HEARTBEAT_SECONDS
+
+    async def interaction(delay):
+        arrived = start + delay  # ✅ When it came in, even if the loop was too busy to notice
+        await asyncio.sleep(delay)
+        user_id = str(random.randrange(players))
+        kind = random.random()
+        if kind < 0.6:
+            await buy(user_id, *random.choice(shop_items))
+        elif kind < 0.8:
+            await balance(user_id)
+        else:
+            await show_inventory(user_id)
+        latencies.append((loop.time() - arrived) * 1000)
+
+    start = loop.time()
+    ticker = asyncio.create_task(heartbeat())
+    await asyncio.gather(*(interaction(random.uniform(0, window)) for _ in range(interactions)))
+    elapsed = loop.time() - start
+    done.set()
+    await ticker
+    return latencies, heartbeat_lag, elapsed
+
+def main():
+    interactions = int(sys.argv[1]) if len(sys.argv) > 1 else 500
+    players = int(sys.argv[2]) if len(sys.argv) > 2 else 2_000
+    window = float(sys.argv[3]) if len(sys.argv) > 3 else 20.0
+    fsync_ms = float(sys.argv[4]) if len(sys.argv) > 4 else 2.0
+    logging.disable(logging.CRITICAL)
+    if fsync_ms:
+        slow_fsync(fsync_ms / 1000)
+
+    print(f"{interactions} fake interactions over {window:.1f}s, {players:,} players, fsync >= {fsync_ms:g} ms")
+    print(f"  {'':<15} {'latency p50':>11} {'p99':>8}   {'heartbeat lag p99':>17} {'max':>8}   {'storage on loop':>15}")
+    with tempfile.TemporaryDirectory() as folder:
+        shop_items = write_fixtures(folder, players)
+        dm, inventory, wallets = load_stanley(folder)
+        for label, make_handlers in (("blocking calls", blocking_handlers), ("await STORE", async_handlers)):
+            random.seed(1)
+            on_loop = []
+            handlers = make_handlers(dm, inventory, wallets, on_loop)
+            latencies, lag, elapsed = asyncio.run(run_load(handlers, players, shop_items, interactions, window))
+            print(f"  {label:<15} {percentile(latencies, 0.5):9.1f}ms {percentile(latencies, 0.99):6.1f}ms   "
+                  f"{percentile(lag, 0.99):15.1f}ms {max(lag):6.1f}ms   {sum(on_loop):14.2f}s   ({elapsed:.2f}s)")
+
+if __name__ == "__main__":
+    main()
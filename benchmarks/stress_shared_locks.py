@@ -0,0 +1,116 @@
+"""Multi-process stress test: Basil, Stanley and the inventory service hammer the same shared files.
+
+Every worker increments a gold counter and an inventory counter N times. With the
+file locks the final totals must equal workers × N; `--no-lock` shows the lost
+updates the old load/modify/save pattern produced. `--sharded` runs it against the
+per-player shard folders (STORAGE_BACKEND=sharded) instead of the JSON files.
+
+Usage: python benchmarks/stress_shared_locks.py [workers] [iterations] [--no-lock] [--sharded]
+"""
+import importlib
+import json
+import logging
+import multiprocessing
+import os
+import sys
+import tempfile
+import time
+
+ROOT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+SHARED_FILES = ["gold_data.json", "player_inventories.json"]
+WORKER_KINDS = ["Basil", "Stanley", "inventory_service"]
+
+def load_data_manager(bot, folder):
+    """Imports one bot's data_manager with the shared files redirected to `folder`."""
+    sys.path.insert(0, os.path.join(ROOT_DIR, bot))
+    data_manager = importlib.import_module("data_manager")
+    for filename in SHARED_FILES:
+        data_manager.REQUIRED_FILES[filename] = (folder, {})
+    return data_manager
+
+def worker(kind, folder, iterations, use_locks):
+    logging.disable(logging.CRITICAL)
+
+    if kind == "inventory_service":
+        sys.path.insert(0, ROOT_DIR)
+        from shared_inventories.inventory_service import JOURNAL, InventoryService
+        JOURNAL.folder = os.path.join(folder, "journal")  # ✅ Keep the real journal clean
+        inventory = InventoryService(os.path.join(folder, "player_inventories.json"))
+        data_manager = load_data_manager("Basil", folder)  # gold still goes through a data manager
+    else:
+        inventory = None
+        data_manager = load_data_manager(kind, folder)
+
+    for _ in range(iterations):
+        if use_locks:
+            with data_manager.update_json("gold_data.json") as gold_data:
+                gold_data["counter"]["gp"] += 1
+        else:
+            gold_data = data_manager.load_json("gold_data.json")
+            gold_data["counter"]["gp"] += 1
+            data_manager.save_json("gold_data.json", gold_data)
+
+        if inventory and use_locks:
+            inventory.apply_delta("counter", {"torch": 1})
+        elif use_locks:
+            with data_manager.update_json("player_inventories.json") as inventory_data:
+                inventory_data["counter"]["Torch"] += 1
+        else:
+            inventory_data = data_manager.load_json("player_inventories.json")
+            inventory_data["counter"]["Torch"] += 1
+            data_manager.save_json("player_inventories.json", inventory_data)
+
+def main():
+    args = [arg for arg in sys.argv[1:] if not arg.startswith("--")]
+    workers = int(args[0]) if args else 6
+    iterations = int(args[1]) if len(args) > 1 else 100
+    use_locks = "--no-lock" not in sys.argv
+    sharded = "--sharded" in sys.argv
+
+    with tempfile.TemporaryDirectory() as folder:
+        for filename, data in {"gold_data.json": {"counter": {"gp": 0, "sp": 0, "cp": 0}},
+                               "player_inventories.json": {"counter": {"Torch": 0}}}.items():
+            with open(os.path.join(folder, filename), "w", encoding="utf-8") as file:
+                json.dump(data, file)
+        if sharded:
+            sys.path.insert(0, ROOT_DIR)
+            from shared_inventories.sharded_store import open_sharded_store
+            from shared_inventories.migrate_storage import migrate_to_store, SHARDED_DOCUMENTS
+            os.environ["STORAGE_BACKEND"], os.environ["SHARD_PATH"] = "sharded", os.path.join(folder, "shards")
+            store = open_sharded_store()
+            migrate_to_store(store, folder, SHARDED_DOCUMENTS)  # ✅ Spawned workers inherit the environment
+
+        context = multiprocessing.get_context("spawn")  # ✅ Fresh interpreters, like two real bots
+        processes = [
+            context.Process(target=worker, args=(WORKER_KINDS[n % len(WORKER_KINDS)], folder, iterations, use_locks))
+            for n in range(workers)
+        ]
+        start = time.perf_counter()
+        for process in processes:
+            process.start()
+        for process in processes:
+            process.join()
+        elapsed = time.perf_counter() - start
+
+        if sharded:
+            gold = store.load_record("gold_data.json", "counter")["gp"]
+            torches = store.load_record("player_inventories.json", "counter")["Torch"]
+        else:
+            with open(os.path.join(folder, "gold_data.json"), encoding="utf-8") as file:
+                gold = json.load(file)["counter"]["gp"]
+            with open(os.path.join(folder, "player_inventories.json"), encoding="utf-8") as file:
+                torches = json.load(file)["counter"]["Torch"]
+
+    expected = workers * iterations
+    print(f"{'locked' if use_locks else 'UNLOCKED'}{' (sharded)' if sharded else ''}: {workers} workers × {iterations} updates in {elapsed:.2f}s")
+    print(f"  gold counter: {gold}/{expected} (lost {expected - gold})")
+    print(f"  torch counter: {torches}/{expected} (lost {expected - torches})")
+    failed = any(process.exitcode for process in processes)
+    if use_locks and (gold != expected or torches != expected or failed):
+        print("❌ Lost updates detected!")
+        sys.exit(1)
+    if use_locks:
+        print("✅ No lost updates.")
+
+if __name__ == "__main__":
+    main()
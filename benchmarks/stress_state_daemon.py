@@ -0,0 +1,110 @@
+"""Test harness for the state daemon: fake Basil & Stanley clients share one in-memory state.
+
+Starts `shared_inventories.state_daemon` on a temporary socket and folder, then runs
+worker processes that each, N times, add 1 gp through their bot's data_manager
+(`update_json`, as the cogs do) and add a torch through the inventory service. A
+watcher counts the change notifications it's pushed. Afterwards the daemon is stopped
+and the files it flushed must hold workers × N of both.
+
+Usage: python benchmarks/stress_state_daemon.py [workers] [iterations]
+"""
+import importlib
+import json
+import logging
+import multiprocessing
+import os
+import signal
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+
+ROOT_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+SHARED_FILES = ["gold_data.json", "player_inventories.json", "player_stats.json"]
+WORKER_KINDS = ["Basil", "Stanley"]
+
+def load_data_manager(bot, folder):
+    """Imports one bot's data_manager with the shared files redirected to `folder`."""
+    sys.path.insert(0, os.path.join(ROOT_DIR, bot))
+    data_manager = importlib.import_module("data_manager")
+    for filename in SHARED_FILES:
+        data_manager.REQUIRED_FILES[filename] = (folder, {})
+    return data_manager
+
+def worker(kind, folder, socket_path, iterations):
+    logging.disable(logging.CRITICAL)
+    os.environ["SHARED_STATE_SOCKET"] = socket_path
+    data_manager = load_data_manager(kind, folder)
+    from shared_inventories.inventory_service import JOURNAL, InventoryService
+    JOURNAL.folder = os.path.join(folder, "journal")  # ✅ Keep the real journal clean
+    inventory = InventoryService(os.path.join(folder, "player_inventories.json"))
+
+    for _ in range(iterations):
+        with data_manager.update_json("gold_data.json") as gold_data:
+            gold_data["counter"]["gp"] += 1
+        inventory.apply_delta("counter", {"torch": 1})
+
+def wait_for_socket(socket_path, daemon, timeout=10):
+    deadline = time.monotonic() + timeout
+    while not os.path.exists(socket_path):
+        if daemon.poll() is not None or time.monotonic() > deadline:
+            sys.exit("❌ The state daemon didn't start.")
+        time.sleep(0.05)
+
+def main():
+    workers = int(sys.argv[1]) if len(sys.argv) > 1 else 4
+    iterations = int(sys.argv[2]) if len(sys.argv) > 2 else 200
+    sys.path.insert(0, ROOT_DIR)
+    from shared_inventories.state_client import StateClient
+
+    with tempfile.TemporaryDirectory() as folder:
+        for filename, data in {"gold_data.json": {"counter": {"gp": 0, "sp": 0, "cp": 0}},
+                               "player_inventories.json": {}, "player_stats.json": {}}.items():
+            with open(os.path.join(folder, filename), "w", encoding="utf-8") as file:
+                json.dump(data, file)
+
+        socket_path = os.path.join(folder, "state.sock")
+        daemon = subprocess.Popen(
+            [sys.executable, "-m", "shared_inventories.state_daemon", "--socket", socket_path, "--folder", folder],
+            cwd=ROOT_DIR, stderr=subprocess.DEVNULL,
+        )
+        wait_for_socket(socket_path, daemon)
+
+        notifications = []
+        StateClient(socket_path).watch(lambda document, version: notifications.append(document))
+
+        context = multiprocessing.get_context("spawn")  # ✅ Fresh interpreters, like two real bots
+        processes = [
+            context.Process(target=worker, args=(WORKER_KINDS[n % len(WORKER_KINDS)], folder, socket_path, iterations))
+            for n in range(workers)
+        ]
+        start = time.perf_counter()
+        for process in processes:
+            process.start()
+        for process in processes:
+            process.join()
+        elapsed = time.perf_counter() - start
+
+        daemon.send_signal(signal.SIGTERM)  # ✅ Shutdown flushes whatever is still pending
+        daemon.wait(timeout=10)
+
+        with open(os.path.join(folder, "gold_data.json"), encoding="utf-8") as file:
+            gold = json.load(file)["counter"]["gp"]
+        with open(os.path.join(folder, "player_inventories.json"), encoding="utf-8") as file:
+            torches = json.load(file).get("counter", {}).get("Torch", 0)
+
+    expected = workers * iterations
+    print(f"{workers} clients × {iterations} updates through the daemon in {elapsed:.2f}s "
+          f"({2 * expected / elapsed:,.0f} mutations/s)")
+    print(f"  gold counter on disk: {gold}/{expected}")
+    print(f"  torch counter on disk: {torches}/{expected}")
+    print(f"  change notifications pushed: {len(notifications)}")
+    failed = any(process.exitcode for process in processes) or daemon.returncode
+    if gold != expected or torches != expected or failed:
+        print("❌ Lost updates or a crashed process!")
+        sys.exit(1)
+    print("✅ Every update reached disk.")
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1 @@
+"""Shared data and helpers used by both Basil and Stanley."""
@@ -0,0 +1,71 @@
+"""Awaitable access to the data layer, for the cogs.
+
+Every cog handler runs on Discord's event loop, so a blocking read or `json.dump`
+there stalls the gateway heartbeat and every other user's interaction. These helpers
+run the same synchronous calls on a small, bounded thread pool instead:
+
+    stats = await store.get("player_stats.json", readonly=True)
+    await store.update("requests.json", lambda requests: requests.setdefault(item, []).append(user_id))
+    inventory = await store.run(INVENTORY.get_inventory, user_id)
+
+Each call finishes on one worker thread, so the file locks it takes are never held
+across an `await`. Keep the callbacks short and synchronous: they run off the loop.
+"""
+import asyncio
+import functools
+import os
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+IO_THREADS = int(os.getenv("STORAGE_IO_THREADS", "4"))  # ✅ Disk & daemon calls in flight at once, per bot
+
+_executor = None
+_executor_lock = threading.Lock()
+
+def io_executor():
+    """The shared storage thread pool, started on first use."""
+    global _executor
+    with _executor_lock:
+        if _executor is None:
+            _executor = ThreadPoolExecutor(max_workers=IO_THREADS, thread_name_prefix="storage-io")
+        return _executor
+
+async def run_blocking(function, *args, **kwargs):
+    """Runs `function(*args, **kwargs)` on the storage pool and waits for it without blocking the loop."""
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(io_executor(), functools.partial(function, *args, **kwargs))
+
+class AsyncStore:
+    """Awaitable front for one bot's data_manager (its `load_json`, `save_json`, `update_json`, ...)."""
+
+    def __init__(self, load, save, update, transaction=None):
+        self._load = load
+        self._save = save
+        self._update = update
+        self._transaction = transaction
+
+    async def get(self, filename, **options):
+        """`load_json(filename, **options)` off the loop."""
+        return await run_blocking(self._load, filename, **options)
+
+    async def save(self, filename, data):
+        """`save_json(filename, data)` off the loop."""
+        return await run_blocking(self._save, filename, data)
+
+    async def update(self, filename, change):
+        """Locked read-modify-write: calls `change(data)` inside `update_json` and returns what it returns."""
+        def work():
+            with self._update(filename) as data:
+                return change(data)
+        return await run_blocking(work)
+
+    async def transaction(self, filenames, work):
+        """Calls `work(tx)` inside `transaction(*filenames)` and returns what it returns."""
+        def run():
+            with self._transaction(*filenames) as tx:
+                return work(tx)
+        return await run_blocking(run)
+
+    async def run(self, function, *args, **kwargs):
+        """Any other blocking call (the inventory service, wallets, ...) off the loop."""
+        return await run_blocking(function, *args, **kwargs)
@@ -0,0 +1,181 @@
+import json
+import os
+import shutil
+import tempfile
+import uuid
+from logging import getLogger
+from .document_codec import read_document
+
+logger = getLogger(__name__)
+
+def _backup_path(file_path, generation):
+    """Returns the path of a rolling backup (`file.json.bak1` is the newest)."""
+    return f"{file_path}.bak{generation}"
+
+def _fsync_directory(folder):
+    """Flushes a directory entry so a rename survives a crash (no-op where unsupported)."""
+    try:
+        dir_fd = os.open(folder, os.O_RDONLY)
+    except OSError:
+        return
+    try:
+        os.fsync(dir_fd)
+    except OSError:
+        pass
+    finally:
+        os.close(dir_fd)
+
+def rotate_backups(file_path, generations):
+    """Shifts `.bak1` → `.bak2` → ... and snapshots the current file as `.bak1`."""
+    if generations <= 0 or not os.path.exists(file_path):
+        return
+
+    for generation in range(generations, 1, -1):
+        older = _backup_path(file_path, generation - 1)
+        if os.path.exists(older):
+            os.replace(older, _backup_path(file_path, generation))
+
+    newest = _backup_path(file_path, 1)
+    try:
+        os.link(file_path, newest)  # ✅ Hard link: instant, and the old inode survives the rename
+    except OSError:
+        shutil.copy2(file_path, newest)  # Filesystems without hard links
+
+def _write_temp(folder, file_path, payload, fsync):
+    """Writes a payload to a fsync'd temp file next to its target and returns the temp path."""
+    os.makedirs(folder, exist_ok=True)
+    fd, temp_path = tempfile.mkstemp(dir=folder, prefix=f".{os.path.basename(file_path)}.", suffix=".tmp")
+    try:
+        with os.fdopen(fd, "wb") as temp_file:
+            temp_file.write(payload)
+            temp_file.flush()
+            if fsync:
+                os.fsync(temp_file.fileno())
+    except BaseException:
+        os.remove(temp_path)
+        raise
+    return temp_path
+
+def atomic_write_bytes(file_path, payload, backups=0, fsync=True):
+    """Writes bytes to `file_path` so readers only ever see the old or the new file.
+
+    The payload goes to a temp file in the same directory, is fsync'd, and is then
+    renamed over the target. With `backups > 0` the previous version is kept as a
+    rolling `.bakN` generation.
+    """
+    folder = os.path.dirname(os.path.abspath(file_path))
+    temp_path = _write_temp(folder, file_path, payload, fsync)
+    try:
+        rotate_backups(file_path, backups)
+        os.replace(temp_path, file_path)  # ✅ Atomic on POSIX & Windows
+    except BaseException:
+        if os.path.exists(temp_path):
+            os.remove(temp_path)
+        raise
+
+    if fsync:
+        _fsync_directory(folder)
+
+def atomic_write_many(payloads, backups=None, fsync=True):
+    """Writes several files as one commit: after a crash either all of them or none change.
+
+    Every payload is staged in a temp file first. A journal listing the pending renames
+    is then written atomically; once it exists the commit is decided, and
+    `recover_pending_commits` rolls it forward if the process dies mid-way.
+    `payloads` maps file path → bytes; `backups` maps file path → generations to keep.
+    """
+    if not payloads:
+        return
+
+    backups = backups or {}
+    if len(payloads) == 1:  # ✅ A single rename is already atomic, no journal needed
+        (file_path, payload), = payloads.items()
+        atomic_write_bytes(file_path, payload, backups=backups.get(file_path, 0), fsync=fsync)
+        return
+
+    staged = []
+    try:
+        for file_path, payload in payloads.items():
+            folder = os.path.dirname(os.path.abspath(file_path))
+            staged.append((_write_temp(folder, file_path, payload, fsync), os.path.abspath(file_path)))
+    except BaseException:
+        for temp_path, _ in staged:
+            os.remove(temp_path)
+        raise
+
+    journal_folder = os.path.dirname(staged[0][1])
+    journal_path = os.path.join(journal_folder, f".commit.{uuid.uuid4().hex}.journal")
+    journal = {"pid": os.getpid(), "renames": staged}
+    atomic_write_bytes(journal_path, json.dumps(journal).encode("utf-8"), fsync=fsync)  # ✅ Commit point
+
+    for temp_path, file_path in staged:
+        rotate_backups(file_path, backups.get(file_path, 0))
+        os.replace(temp_path, file_path)
+    if fsync:
+        for folder in {os.path.dirname(file_path) for _, file_path in staged}:
+            _fsync_directory(folder)
+    os.remove(journal_path)
+
+def _pid_alive(pid):
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except (PermissionError, OSError):
+        return True
+    return True
+
+def recover_pending_commits(folder):
+    """Finishes multi-file commits left behind by a crashed process. Returns how many were replayed."""
+    if not os.path.isdir(folder):
+        return 0
+
+    replayed = 0
+    for name in os.listdir(folder):
+        if not (name.startswith(".commit.") and name.endswith(".journal")):
+            continue
+        journal_path = os.path.join(folder, name)
+        try:
+            with open(journal_path, "r", encoding="utf-8") as file:
+                journal = json.load(file)
+        except (OSError, json.JSONDecodeError):
+            continue
+        if journal.get("pid") != os.getpid() and _pid_alive(journal.get("pid", 0)):
+            continue  # Still being applied by a live process
+
+        for temp_path, file_path in journal["renames"]:
+            if os.path.exists(temp_path):
+                os.replace(temp_path, file_path)
+        os.remove(journal_path)
+        replayed += 1
+        logger.warning(f"♻️ Replayed an interrupted commit from `{journal_path}`.")
+    return replayed
+
+def atomic_write_json(file_path, data, backups=0, fsync=True, indent=4):
+    """Serializes `data` first, then writes it atomically (a failed dump never touches the file)."""
+    payload = json.dumps(data, indent=indent).encode("utf-8")
+    atomic_write_bytes(file_path, payload, backups=backups, fsync=fsync)
+
+def restore_latest_backup(file_path, generations):
+    """Restores the newest readable backup over `file_path`. Returns True on success."""
+    for generation in range(1, generations + 1):
+        backup = _backup_path(file_path, generation)
+        if not os.path.exists(backup):
+            continue
+        try:
+            read_document(backup)  # ✅ Only restore backups that actually parse (whatever codec wrote them)
+        except (OSError, json.JSONDecodeError):
+            logger.warning(f"⚠️ Backup `{backup}` is unreadable, trying an older one.")
+            continue
+
+        with open(backup, "rb") as file:
+            atomic_write_bytes(file_path, file.read())
+        logger.warning(f"♻️ Restored `{file_path}` from `{backup}`.")
+        return True
+    return False
+
+def quarantine_file(file_path):
+    """Moves a corrupted file aside (instead of deleting it) and returns its new path."""
+    corrupt_path = f"{file_path}.corrupt"
+    os.replace(file_path, corrupt_path)
+    return corrupt_path
@@ -0,0 +1,126 @@
+import bisect
+import threading
+
+MAX_CHOICES = 25  # ✅ Discord rejects more than 25 autocomplete choices
+MAX_MEMO = 2048
+
+def edit_distance(a, b, limit):
+    """Levenshtein distance between `a` and `b`, or `limit + 1` once it's clearly larger."""
+    if abs(len(a) - len(b)) > limit:
+        return limit + 1
+
+    previous = list(range(len(b) + 1))
+    for i, char_a in enumerate(a, start=1):
+        current = [i]
+        for j, char_b in enumerate(b, start=1):
+            current.append(min(
+                previous[j] + 1,  # deletion
+                current[j - 1] + 1,  # insertion
+                previous[j - 1] + (char_a != char_b),  # substitution
+            ))
+        if min(current) > limit:
+            return limit + 1  # ✅ Every path is already too far
+        previous = current
+    return previous[-1]
+
+class AutocompleteIndex:
+    """Sorted-array index over a list of names.
+
+    Matches are ranked prefix first, then substring, then fuzzy (typos) by edit
+    distance among names sharing the first letter. Results are memoised per query
+    until the index is rebuilt.
+    """
+
+    def __init__(self, names):
+        self._entries = sorted({(name.lower(), name) for name in names})
+        self._keys = [key for key, _ in self._entries]
+        self._canonical = {key: name for key, name in self._entries}
+        self._by_initial = {}  # ✅ Fuzzy matching assumes the first letter is right
+        for key, name in self._entries:
+            self._by_initial.setdefault(key[:1], []).append((key, name))
+        self._memo = {}
+
+    def __len__(self):
+        return len(self._entries)
+
+    def canonical(self, text):
+        """The stored spelling of `text` (case-insensitive exact match), or None."""
+        return self._canonical.get(text.lower().strip())
+
+    def complete(self, query, limit=MAX_CHOICES):
+        query = query.lower().strip()
+        memo_key = (query, limit)
+        if memo_key in self._memo:
+            return self._memo[memo_key]
+
+        if not query:
+            results = [name for _, name in self._entries[:limit]]
+        else:
+            results = self._prefix_matches(query, limit)
+            if len(results) < limit:
+                seen = set(results)
+                results += [name for key, name in self._entries if query in key and name not in seen][:limit - len(results)]
+            if len(results) < limit:
+                results += self._fuzzy_matches(query, limit - len(results), set(results))
+
+        if len(self._memo) >= MAX_MEMO:
+            self._memo.clear()
+        self._memo[memo_key] = results
+        return results
+
+    def _prefix_matches(self, query, limit):
+        start = bisect.bisect_left(self._keys, query)
+        end = bisect.bisect_left(self._keys, query + "￿", lo=start)  # ✅ Just past the last key with this prefix
+        return [name for _, name in self._entries[start:min(end, start + limit)]]
+
+    def _fuzzy_matches(self, query, limit, exclude):
+        max_distance = max(1, len(query) // 3)
+        query_chars = set(query)
+        distances = {}  # ✅ Many names share a prefix; score each distinct string once
+        scored = []
+        for key, name in self._by_initial.get(query[:1], []):
+            if name in exclude:
+                continue
+            # Compare against the start of the name too, so partial typing still matches
+            head = key[:len(query)]
+            if len(query_chars - set(head)) > max_distance:
+                continue  # ✅ Too many missing letters to be within reach
+            for candidate in (head, key):
+                if candidate not in distances:
+                    distances[candidate] = edit_distance(query, candidate, max_distance)
+            distance = min(distances[head], distances[key])
+            if distance <= max_distance:
+                scored.append((distance, key, name))
+        return [name for _, _, name in sorted(scored)[:limit]]
+
+class AutocompleteService:
+    """Named autocomplete indexes, each rebuilt only when its source document changes."""
+
+    def __init__(self):
+        self._sources = {}
+        self._indexes = {}
+        self._lock = threading.Lock()
+
+    def register(self, source, version, names):
+        """`version()` returns a token that changes with the document; `names()` lists its entries."""
+        self._sources[source] = (version, names)
+        self._indexes.pop(source, None)
+
+    def index(self, source):
+        version, names = self._sources[source]
+        token = version()
+        with self._lock:
+            cached = self._indexes.get(source)
+            if cached and cached[0] == token:
+                return cached[1]
+
+        index = AutocompleteIndex(names())
+        with self._lock:
+            self._indexes[source] = (token, index)
+        return index
+
+    def complete(self, source, query, limit=MAX_CHOICES):
+        return self.index(source).complete(query, limit)
+
+    def canonical(self, source, text):
+        return self.index(source).canonical(text)
@@ -0,0 +1,42 @@
+"""Change detection for read-modify-writes, shared by both bots' data managers.
+
+    with update_document("player_stats.json", lock_files, load_json, save_json) as stats:
+        stats[user_id]["level"] += 1     # saved once the block ends, only if something changed
+
+Each bot's `update_json` and Stanley's `Transaction` compare `fingerprint`s taken
+before and after the work, so every path agrees on what counts as a change. Files
+are compared by `file_signature`, and cached documents are handed out as `clone`s.
+"""
+import os
+import pickle
+from contextlib import contextmanager
+
+def clone(data):
+    """Copies JSON data (dicts, lists & scalars) much faster than `copy.deepcopy`."""
+    if isinstance(data, dict):
+        return {key: clone(value) for key, value in data.items()}
+    if isinstance(data, list):
+        return [clone(value) for value in data]
+    return data
+
+def file_signature(path):
+    """(inode, mtime, size) of a file, or None if it doesn't exist: changes with every atomic save."""
+    try:
+        stat = os.stat(path)
+    except FileNotFoundError:
+        return None
+    return (stat.st_ino, stat.st_mtime_ns, stat.st_size)
+
+def fingerprint(data):
+    """Bytes that stay the same while a document is unchanged (far cheaper than a deep copy)."""
+    return pickle.dumps(data, pickle.HIGHEST_PROTOCOL)
+
+@contextmanager
+def update_document(filename, lock_files, load_json, save_json):
+    """Read-modify-write one document under the bot's exclusive lock, saving only if the data changed."""
+    with lock_files(filename):
+        data = load_json(filename)
+        before = fingerprint(data)
+        yield data
+        if fingerprint(data) != before:
+            save_json(filename, data)
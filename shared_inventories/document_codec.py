@@ -0,0 +1,149 @@
+"""How documents are encoded on disk.
+
+    python -m shared_inventories.document_codec --pretty-export [--folder DIR ...] [--out DIR]
+
+Hot documents (inventories, gold, cooldowns, the shop) are written with the codec
+named by STORAGE_CODEC; everything else stays indented JSON for hand editing:
+
+    json          indented JSON (the default, what the bots always wrote)
+    json-compact  JSON without indentation or spaces
+    orjson        compact JSON through `orjson` (optional, much faster)
+    msgpack       binary MessagePack through `msgpack` (optional, smallest)
+
+Reads never need to know which codec wrote a file: JSON and MessagePack are told
+apart by their first byte, so switching STORAGE_CODEC needs no migration, and a GM
+can always drop an edited JSON file back in place. `--pretty-export` writes every
+document under the given folders as indented JSON (into `--out`, default `pretty_export/`).
+"""
+import argparse
+import json
+import os
+from logging import getLogger
+
+try:
+    import orjson  # Optional: faster JSON
+except ImportError:
+    orjson = None
+
+try:
+    import msgpack  # Optional: binary MessagePack
+except ImportError:
+    msgpack = None
+
+logger = getLogger(__name__)
+
+SHARED_DIR = os.path.dirname(os.path.abspath(__file__))
+ROOT_DIR = os.path.dirname(SHARED_DIR)
+
+# ✅ Big or busy documents worth a faster, smaller codec; by filename (shards use their document's)
+HOT_DOCUMENTS = {
+    "player_inventories.json", "gold_data.json", "player_cooldowns.json", "cooldowns.json", "stanley_shop.json",
+}
+
+class Codec:
+    def __init__(self, name, encode, decode):
+        self.name = name
+        self.encode = encode  # ✅ data -> bytes
+        self.decode = decode  # ✅ bytes -> data
+
+def _load_json(payload):
+    return orjson.loads(payload) if orjson else json.loads(payload)
+
+CODECS = {
+    "json": Codec("json", lambda data: json.dumps(data, indent=4).encode("utf-8"), _load_json),
+    "json-compact": Codec(
+        "json-compact", lambda data: json.dumps(data, separators=(",", ":"), ensure_ascii=False).encode("utf-8"), _load_json
+        ),
+}
+if orjson:
+    CODECS["orjson"] = Codec("orjson", orjson.dumps, orjson.loads)
+if msgpack:
+    CODECS["msgpack"] = Codec(
+        "msgpack",
+        lambda data: msgpack.packb(data, use_bin_type=True),
+        lambda payload: msgpack.unpackb(payload, raw=False, strict_map_key=False),
+        )
+
+PRETTY = CODECS["json"]
+_warned = set()
+
+def configured_codec():
+    """The codec named by STORAGE_CODEC (read on use, so a late `.env` load still applies)."""
+    name = os.getenv("STORAGE_CODEC", "json").strip().lower()
+    if name in CODECS:
+        return CODECS[name]
+    if name not in _warned:
+        _warned.add(name)
+        logger.warning(f"⚠️ STORAGE_CODEC `{name}` isn't available (is it installed?). Writing compact JSON instead.")
+    return CODECS["json-compact"]
+
+def codec_for(filename):
+    """The codec new saves of `filename` use."""
+    return configured_codec() if os.path.basename(filename) in HOT_DOCUMENTS else PRETTY
+
+def encode(filename, data):
+    return codec_for(filename).encode(data)
+
+def decode(payload):
+    """Decodes a document written by any codec. Raises `json.JSONDecodeError` when it can't."""
+    text = payload.lstrip()
+    if not text or text[:1] in b"{[\"-0123456789tfn":
+        try:
+            return _load_json(payload)
+        except ValueError as e:
+            raise json.JSONDecodeError(str(e), payload.decode("utf-8", "replace"), 0) from e
+    if msgpack is None:
+        raise json.JSONDecodeError("Looks like MessagePack, but `msgpack` isn't installed", "", 0)
+    try:
+        return CODECS["msgpack"].decode(payload)
+    except Exception as e:
+        raise json.JSONDecodeError(f"Invalid MessagePack: {e}", "", 0) from e
+
+def read_document(path):
+    """Reads and decodes one document file."""
+    with open(path, "rb") as file:
+        return decode(file.read())
+
+# ✅ Pretty export for GMs
+
+EXPORT_FOLDERS = [
+    SHARED_DIR,
+    os.path.join(ROOT_DIR, "Basil", "basil_data"),
+    os.path.join(ROOT_DIR, "Stanley", "stanley_data"),
+]
+SKIP_FOLDERS = {"journal", "pretty_export", "__pycache__"}
+
+def pretty_export(folders, out):
+    """Writes every `.json` document under `folders` to `out` as indented JSON. Returns how many."""
+    exported = 0
+    for folder in folders:
+        for root, subfolders, names in os.walk(folder):
+            subfolders[:] = [name for name in subfolders if name not in SKIP_FOLDERS]
+            for name in sorted(names):
+                if not name.endswith(".json") or name.startswith("."):
+                    continue
+                path = os.path.join(root, name)
+                try:
+                    data = read_document(path)
+                except (OSError, json.JSONDecodeError) as e:
+                    print(f"⚠️ Skipped `{path}`: {e}")
+                    continue
+                target = os.path.join(out, os.path.basename(folder), os.path.relpath(path, folder))
+                os.makedirs(os.path.dirname(target), exist_ok=True)
+                with open(target, "wb") as file:
+                    file.write(PRETTY.encode(data))
+                exported += 1
+    return exported
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Export the bots' documents as human-editable JSON.")
+    parser.add_argument("--pretty-export", action="store_true", required=True, help="Write indented JSON copies")
+    parser.add_argument("--folder", action="append", help="Folder to export (repeatable; default: shared & both bots' data)")
+    parser.add_argument("--out", default=os.path.join(ROOT_DIR, "pretty_export"), help="Where the copies go")
+    args = parser.parse_args(argv)
+
+    exported = pretty_export(args.folder or EXPORT_FOLDERS, args.out)
+    print(f"✅ Exported {exported} documents to `{args.out}`. Copy an edited file back over the original to apply it.")
+
+if __name__ == "__main__":
+    main()
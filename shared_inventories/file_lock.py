@@ -0,0 +1,82 @@
+import os
+import threading
+from contextlib import contextmanager, ExitStack
+from logging import getLogger
+
+try:
+    import fcntl  # POSIX only
+except ImportError:
+    fcntl = None
+
+logger = getLogger(__name__)
+
+# ✅ Locks this thread already holds: lock path -> [shared?, depth, fd]
+_held = threading.local()
+
+# Fallback for platforms without fcntl: one re-entrant lock per path (in-process only)
+_fallback_locks = {}
+_fallback_guard = threading.Lock()
+
+def _lock_path(path):
+    """Lock on a sidecar file, since atomic saves replace the data file's inode."""
+    return f"{os.path.abspath(path)}.lock"
+
+def _held_locks():
+    if not hasattr(_held, "locks"):
+        _held.locks = {}
+    return _held.locks
+
+@contextmanager
+def file_lock(path, shared=False):
+    """Advisory cross-process lock for a data file.
+
+    `shared=True` allows concurrent readers; the default is an exclusive lock for
+    read-modify-write. Re-entrant within a thread (an exclusive holder may take
+    nested shared or exclusive locks). Never `await` while holding one: coroutines
+    on the event loop share a thread and would slip through the re-entrancy check.
+    """
+    lock_path = _lock_path(path)
+    held = _held_locks()
+
+    if lock_path in held:
+        entry = held[lock_path]
+        if entry[0] and not shared:
+            raise RuntimeError(f"Cannot upgrade a shared lock on `{path}` to exclusive.")
+        entry[1] += 1
+        try:
+            yield
+        finally:
+            entry[1] -= 1
+        return
+
+    if fcntl is None:
+        with _fallback_guard:
+            fallback = _fallback_locks.setdefault(lock_path, threading.RLock())
+        with fallback:
+            held[lock_path] = [shared, 1, None]
+            try:
+                yield
+            finally:
+                del held[lock_path]
+        return
+
+    os.makedirs(os.path.dirname(lock_path), exist_ok=True)
+    fd = os.open(lock_path, os.O_RDWR | os.O_CREAT, 0o644)
+    try:
+        fcntl.flock(fd, fcntl.LOCK_SH if shared else fcntl.LOCK_EX)
+        held[lock_path] = [shared, 1, fd]
+        try:
+            yield
+        finally:
+            del held[lock_path]
+            fcntl.flock(fd, fcntl.LOCK_UN)
+    finally:
+        os.close(fd)
+
+@contextmanager
+def file_locks(paths, shared=False):
+    """Locks several data files at once, always in sorted order so two processes can't deadlock."""
+    with ExitStack() as stack:
+        for path in sorted({os.path.abspath(p) for p in paths}):
+            stack.enter_context(file_lock(path, shared=shared))
+        yield
@@ -0,0 +1,215 @@
+from functools import lru_cache
+from logging import getLogger
+from .journal import JOURNAL
+from .shared_document import SharedDocument
+
+logger = getLogger(__name__)
+
+INVENTORY_FILE = "player_inventories.json"
+
+# ✅ Left lower-case inside a name ("Potion of Healing"), unless they open it
+MINOR_WORDS = {"a", "an", "and", "at", "by", "for", "from", "in", "of", "on", "or", "the", "to", "with"}
+
+@lru_cache(maxsize=8192)
+def canonical_item(name):
+    """The one spelling an item is stored under, whichever bot or player typed it.
+
+    Stanley's shop names are lower-case and Basil's are Title Case, so "rope", "Rope"
+    and " ROPE " all become "Rope". Words that already carry capitals ("(Poison)",
+    "McGuffin") are kept as written, so Basil's names come through unchanged.
+    """
+    words = str(name).split()
+    canonical = []
+    for position, word in enumerate(words):
+        if word.isupper() and len(word) > 1:
+            word = word.lower()  # ✅ SHOUTING is treated as no capitals at all
+        if word != word.lower():
+            canonical.append(word)
+        elif position and word in MINOR_WORDS:
+            canonical.append(word)
+        else:
+            canonical.append(word[:1].upper() + word[1:])
+    return " ".join(canonical)
+
+def normalise_inventory(inventory):
+    """Merges entries that only differ in spelling and drops empty ones."""
+    merged = {}
+    for item, quantity in inventory.items():
+        if isinstance(quantity, int) and quantity > 0:
+            item = canonical_item(item)
+            merged[item] = merged.get(item, 0) + quantity
+    return merged
+
+def apply_deltas(document, deltas, clamp=False):
+    """Applies `{player_id: {item: +/-quantity}}` to a loaded `player_inventories.json` in place.
+
+    Every removal is checked before anything changes: if any player is short of
+    anything, `document` is left untouched and None is returned. With `clamp=True`
+    removals are cut down to what the player has instead. Returns the new quantities
+    of every touched item, `{player_id: {item: quantity}}`.
+
+    This is the one place inventories are changed. Bots go through the service:
+    `INVENTORY.apply_deltas`, or `INVENTORY.stage_deltas` inside a multi-document transaction.
+    """
+    changes = {}
+    for player_id, delta in deltas.items():
+        merged = {}
+        for item, quantity in delta.items():
+            item = canonical_item(item)
+            merged[item] = merged.get(item, 0) + quantity
+        changes[str(player_id)] = {item: quantity for item, quantity in merged.items() if quantity}
+
+    for player_id, delta in changes.items():
+        inventory = normalise_inventory(document.get(player_id, {}))
+        short = [item for item, quantity in delta.items() if quantity < 0 and inventory.get(item, 0) < -quantity]
+        if short and not clamp:
+            logger.warning(f"⚠️ {player_id} lacks {', '.join(short)}. Inventories left unchanged.")
+            return None
+        for item in short:
+            logger.warning(f"⚠️ {player_id} tried to remove {-delta[item]}x {item}, but only has {inventory.get(item, 0)}. Removing only available amount.")
+            delta[item] = -inventory.get(item, 0)
+
+    quantities = {}
+    for player_id, delta in changes.items():  # ✅ One pass over every player
+        inventory = normalise_inventory(document.get(player_id, {}))
+        for item, quantity in delta.items():
+            inventory[item] = inventory.get(item, 0) + quantity
+            if inventory[item] <= 0:
+                del inventory[item]
+        document[player_id] = inventory
+        quantities[player_id] = {item: inventory.get(item, 0) for item in delta}
+    return quantities
+
+def movements(before, quantities):
+    """What each touched item actually moved by: its new quantity minus what `before` held."""
+    return {
+        player_id: {item: quantity - normalise_inventory(before.get(player_id, {})).get(item, 0) for item, quantity in items.items()}
+        for player_id, items in quantities.items()
+    }
+
+def journal_movements(action, moved):
+    for player_id, items in moved.items():
+        for item, quantity in items.items():
+            if quantity:
+                JOURNAL.record(action, player_id, item=item, quantity=quantity)
+
+class InventoryService:
+    """Player inventories shared by Basil and Stanley, with one cache and one write path.
+
+    The document is held by a `SharedDocument`, normalised to canonical item names, so
+    writes made by the other bot are picked up on the next call. Writes lock the file
+    across both bots, apply every change in one pass and persist once.
+
+    Listeners added with `add_listener` are called as `listener(quantities,
+    version_before, version_after)` after each write made through the service.
+
+    When the state daemon is running (SHARED_STATE_SOCKET), it holds the document and
+    applies the deltas itself; the service then just mirrors its changes.
+
+    Every item that moves is recorded in the shared journal under the caller's `action`.
+    """
+
+    def __init__(self, path=None):
+        self.document = SharedDocument(INVENTORY_FILE, path, normalise_inventory)
+        self._listeners = []
+
+    def version(self):
+        """A cheap token that changes whenever the inventories change."""
+        return self.document.version()
+
+    def add_listener(self, listener):
+        self._listeners.append(listener)
+
+    def players(self):
+        """IDs of every player with an inventory."""
+        return self.document.keys()
+
+    def get_inventory(self, player_id):
+        """A copy of one player's inventory ({} if they have none)."""
+        return dict(self.document.current().get(str(player_id), {}))
+
+    def quantity(self, player_id, item):
+        return self.document.current().get(str(player_id), {}).get(canonical_item(item), 0)
+
+    def apply_deltas(self, deltas, clamp=False, action="inventory"):
+        """Validates and applies `{player_id: {item: +/-quantity}}` in one locked write (see `apply_deltas`).
+
+        Returns the new quantities of every touched item, or None if nothing was written.
+        """
+        if self.document.client():
+            return self._apply_in_daemon(deltas, clamp, action)
+
+        with self.document.lock():  # ✅ Exclusive across both bots for the read-modify-write
+            version_before = self.version()
+            current = self.document.current()
+            updated = {str(player_id): dict(current.get(str(player_id), {})) for player_id in deltas}
+            quantities = apply_deltas(updated, deltas, clamp=clamp)
+            if quantities is None:
+                return None
+            if all(updated[player_id] == current.get(player_id) for player_id in updated):
+                return quantities  # ✅ Nothing actually changed, nothing to write
+
+            moved = movements(current, quantities)  # ✅ Before saving: the cached records are updated in place
+            self.document.save_records(updated)
+            version_after = self.version()
+            for listener in self._listeners:
+                listener(quantities, version_before, version_after)
+        journal_movements(action, moved)
+        logger.info(f"Applied inventory changes: {deltas}")
+        return quantities
+
+    def stage_deltas(self, tx, deltas, clamp=False):
+        """Applies deltas to the inventories loaded in `tx`, a transaction that locks `INVENTORY_FILE`.
+
+        Nothing is written here: the transaction commits them with its other documents and
+        journals them with its own `record()`. Once it has committed, the cached records
+        are updated and listeners told, as after `apply_deltas`. Returns the new
+        quantities, or None if a removal couldn't be covered (the inventories are untouched).
+        """
+        version_before = self.document.version(fresh=True)  # ✅ Held still by the transaction's lock
+        quantities = apply_deltas(tx[INVENTORY_FILE], deltas, clamp=clamp)
+        if quantities is None:
+            return None
+
+        def committed():
+            version_after = tx.versions.get(INVENTORY_FILE, version_before)
+            self.document.mirror(version_before, version_after, lambda data: apply_deltas(data, deltas, clamp=clamp))
+            for listener in self._listeners:
+                listener(quantities, version_before, version_after)
+
+        tx.on_commit(committed)
+        return quantities
+
+    def _apply_in_daemon(self, deltas, clamp, action):
+        with self.document.lock():  # ✅ Also excludes transactions that stage inventory changes
+            quantities, moved, version_before, version_after = self.document.client().apply_inventory_deltas(deltas, clamp)
+        if quantities is None:
+            return None
+        journal_movements(action, moved)
+        version_before, version_after = ("daemon", version_before), ("daemon", version_after)
+        self.document.mirror(version_before, version_after, lambda data: apply_deltas(data, deltas, clamp=clamp))
+        for listener in self._listeners:
+            listener(quantities, version_before, version_after)
+        logger.info(f"Applied inventory changes: {deltas}")
+        return quantities
+
+    def apply_delta(self, player_id, delta, clamp=False, action="inventory"):
+        """Applies `{item: +/-quantity}` to one player (see `apply_deltas`)."""
+        quantities = self.apply_deltas({player_id: delta}, clamp=clamp, action=action)
+        return None if quantities is None else quantities.get(str(player_id), {})
+
+    def ensure_player(self, player_id):
+        """Creates an empty inventory for a player on their first visit."""
+        player_id = str(player_id)
+        if player_id in self.document.current():
+            return
+        with self.document.lock():
+            if player_id not in self.document.current():
+                self.document.save_records({player_id: {}})
+
+    def clear(self, player_id, action="clear"):
+        """Empties one player's inventory."""
+        inventory = self.get_inventory(player_id)
+        self.apply_delta(player_id, {item: -quantity for item, quantity in inventory.items()}, clamp=True, action=action)
+
+INVENTORY = InventoryService()
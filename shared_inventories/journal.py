@@ -0,0 +1,256 @@
+"""Append-only journal of every gold and item movement, from both bots.
+
+    python -m shared_inventories.journal tail [-n 20] [--folder DIR]
+    python -m shared_inventories.journal query [--user ID] [--item NAME] [--action NAME]
+                                               [--since DATE] [--until DATE] [--limit N] [--folder DIR]
+
+Entries are JSON lines appended to numbered segments (`transactions.000001.jsonl`, ...).
+When the active segment passes `max_segment_bytes` it's sealed and, optionally,
+gzipped in the background. Each segment has a sparse `.idx` of `[timestamp, offset]`
+pairs (one per `INDEX_STRIDE` bytes, plus its first and last entry), so queries skip
+whole segments outside their date range and seek straight to the right place inside
+uncompressed ones.
+"""
+import argparse
+import bisect
+import gzip
+import json
+import os
+import re
+import shutil
+import threading
+import time
+from datetime import datetime, timezone
+from logging import getLogger
+from .file_lock import file_lock
+
+logger = getLogger(__name__)
+
+SHARED_DIR = os.path.dirname(os.path.abspath(__file__))
+JOURNAL_DIR = os.path.join(SHARED_DIR, "journal")
+MAX_SEGMENT_BYTES = 16 * 1024 * 1024
+INDEX_STRIDE = 64 * 1024  # ✅ One index entry per 64 KiB of journal
+TAIL_BLOCK = 64 * 1024
+
+class Journal:
+    """Writer and readers for one journal folder; safe to share between threads and both bots."""
+
+    def __init__(self, folder=JOURNAL_DIR, name="transactions", max_segment_bytes=MAX_SEGMENT_BYTES, compress=True):
+        self.folder = folder
+        self.name = name
+        self.max_segment_bytes = max_segment_bytes
+        self.compress = compress
+        self.source = None  # ✅ Set by each bot ("basil" / "stanley") so entries say who wrote them
+        self._active = None
+        self._pattern = re.compile(rf"^{re.escape(name)}\.(\d{{6}})\.jsonl(\.gz)?$")
+
+    def _segment_path(self, number, gz=False):
+        return os.path.join(self.folder, f"{self.name}.{number:06d}.jsonl{'.gz' if gz else ''}")
+
+    def _index_path(self, number):
+        return os.path.join(self.folder, f"{self.name}.{number:06d}.idx")
+
+    def segments(self):
+        """Existing segment numbers, oldest first."""
+        if not os.path.isdir(self.folder):
+            return []
+        numbers = {int(match.group(1)) for match in map(self._pattern.match, os.listdir(self.folder)) if match}
+        return sorted(numbers)
+
+    def _open_segment(self, number):
+        """Reads a segment whether or not it has been gzipped yet."""
+        path = self._segment_path(number)
+        if os.path.exists(path):
+            return open(path, "rb")
+        return gzip.open(self._segment_path(number, gz=True), "rb")
+
+    # ✅ Writing
+
+    def append(self, entry):
+        """Appends one entry (a dict); a "ts" is added if missing. O(1): no existing entry is read."""
+        if self.source and "bot" not in entry:
+            entry = {**entry, "bot": self.source}
+
+        os.makedirs(self.folder, exist_ok=True)
+        with file_lock(os.path.join(self.folder, self.name)):  # ✅ Both bots append to the same segment
+            entry = {"ts": round(time.time(), 3), **entry}  # ✅ Stamped under the lock, so timestamps only grow
+            line = (json.dumps(entry, separators=(",", ":"), ensure_ascii=False) + "\n").encode("utf-8")
+            number = self._current_segment()
+            fd = os.open(self._segment_path(number), os.O_WRONLY | os.O_APPEND | os.O_CREAT, 0o644)
+            try:
+                offset = os.fstat(fd).st_size
+                os.write(fd, line)
+            finally:
+                os.close(fd)
+
+            if offset == 0 or offset // INDEX_STRIDE != (offset + len(line)) // INDEX_STRIDE:
+                self._add_index(number, entry["ts"], offset)
+            if offset + len(line) >= self.max_segment_bytes:
+                self._seal(number, entry["ts"], offset + len(line))
+
+    def record(self, action, user, item=None, quantity=None, cp=None, **details):
+        """Journals one movement: `quantity` of `item` and/or `cp` copper for `user` (negative = out)."""
+        entry = {"action": action, "user": str(user)}
+        if item is not None:
+            entry["item"], entry["quantity"] = item, quantity
+        if cp is not None:
+            entry["cp"] = cp
+        entry.update(details)
+        try:
+            self.append(entry)
+        except OSError as e:
+            logger.error(f"❌ Failed to journal {entry}. Error: {e}")  # ✅ Never fail the movement itself
+
+    def _current_segment(self):
+        """The active segment's number; another process may have rotated since we last looked."""
+        if self._active is None:
+            self._active = (self.segments() or [1])[-1]
+        while os.path.exists(self._segment_path(self._active + 1)) or os.path.exists(self._segment_path(self._active + 1, gz=True)):
+            self._active += 1
+        return self._active
+
+    def _add_index(self, number, ts, offset):
+        with open(self._index_path(number), "a", encoding="utf-8") as file:
+            file.write(json.dumps([ts, offset]) + "\n")
+
+    def _seal(self, number, last_ts, size):
+        """Closes a full segment: records where it ends, starts the next one and gzips it in the background."""
+        self._add_index(number, last_ts, size)
+        open(self._segment_path(number + 1), "ab").close()
+        self._active = number + 1
+        if self.compress:
+            threading.Thread(target=self._gzip_segment, args=(number,), daemon=True).start()
+
+    def _gzip_segment(self, number):
+        source, target = self._segment_path(number), self._segment_path(number, gz=True)
+        temp = f"{target}.tmp"
+        try:
+            with open(source, "rb") as raw, gzip.open(temp, "wb") as packed:
+                shutil.copyfileobj(raw, packed)
+            os.replace(temp, target)
+            os.remove(source)  # ✅ Readers that already opened it keep their handle
+        except OSError as e:
+            logger.error(f"❌ Failed to compress `{source}`. Error: {e}")
+
+    # ✅ Reading
+
+    def _index(self, number):
+        try:
+            with open(self._index_path(number), "r", encoding="utf-8") as file:
+                return [tuple(json.loads(line)) for line in file if line.strip()]
+        except FileNotFoundError:
+            return []
+
+    def tail(self, limit=10):
+        """The newest `limit` entries, newest first. Reads backwards, so cost grows with `limit`, not the journal."""
+        entries = []
+        for number in reversed(self.segments()):
+            if os.path.exists(self._segment_path(number)):
+                lines = self._tail_lines(self._segment_path(number), limit - len(entries))
+            else:
+                with self._open_segment(number) as file:
+                    lines = file.read().splitlines()[-(limit - len(entries)):]  # ✅ Sealed segments are bounded in size
+            entries.extend(json.loads(line) for line in reversed(lines) if line.strip())
+            if len(entries) >= limit:
+                break
+        return entries[:limit]
+
+    @staticmethod
+    def _tail_lines(path, count):
+        with open(path, "rb") as file:
+            position = file.seek(0, os.SEEK_END)
+            data = b""
+            while position > 0 and data.count(b"\n") <= count:
+                step = min(TAIL_BLOCK, position)
+                position -= step
+                file.seek(position)
+                data = file.read(step) + data
+        lines = data.splitlines()
+        if position > 0:
+            lines = lines[1:]  # ✅ The first line may be cut off
+        return lines[-count:] if count > 0 else []
+
+    def query(self, user=None, item=None, action=None, since=None, until=None):
+        """Yields matching entries, oldest first. `since` / `until` are epoch seconds."""
+        needles = []  # ✅ Cheap byte checks before paying for json.loads
+        if user is not None:
+            needles.append(f'"user":"{user}"'.encode("utf-8"))
+        if action is not None:
+            needles.append(f'"action":"{action}"'.encode("utf-8"))
+        item_needle = json.dumps(item.lower(), ensure_ascii=False).encode("utf-8") if item is not None else None
+
+        for number in self.segments():
+            index = self._index(number)
+            if index:
+                sealed = os.path.exists(self._segment_path(number + 1)) or os.path.exists(self._segment_path(number + 1, gz=True))
+                if until is not None and index[0][0] > until:
+                    break
+                if sealed and since is not None and index[-1][0] < since:
+                    continue
+
+            start = 0
+            if since is not None and index and os.path.exists(self._segment_path(number)):
+                position = bisect.bisect_right([ts for ts, _ in index], since) - 1
+                start = index[position][1] if position >= 0 else 0
+
+            with self._open_segment(number) as file:
+                file.seek(start)
+                for line in file:
+                    if any(needle not in line for needle in needles):
+                        continue
+                    if item_needle is not None and item_needle not in line.lower():
+                        continue
+                    entry = json.loads(line)
+                    if since is not None and entry["ts"] < since:
+                        continue
+                    if until is not None and entry["ts"] > until:
+                        return
+                    if item is not None and str(entry.get("item", "")).lower() != item.lower():
+                        continue
+                    yield entry
+
+JOURNAL = Journal()
+
+def format_entry(entry):
+    """One human-readable line for an entry."""
+    when = datetime.fromtimestamp(entry["ts"], tz=timezone.utc).strftime("%Y-%m-%d %H:%M:%S")
+    parts = [when, entry.get("bot", "?"), entry["action"], entry["user"]]
+    if "item" in entry:
+        parts.append(f"{entry['quantity']:+}x {entry['item']}")
+    if "cp" in entry:
+        parts.append(f"{entry['cp']:+} cp")
+    return "  ".join(str(part) for part in parts)
+
+def _timestamp(text):
+    moment = datetime.fromisoformat(text)
+    if moment.tzinfo is None:
+        moment = moment.replace(tzinfo=timezone.utc)
+    return moment.timestamp()
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Read the shared transaction journal.")
+    parser.add_argument("--folder", default=JOURNAL_DIR, help="Journal folder")
+    commands = parser.add_subparsers(dest="command", required=True)
+    tail = commands.add_parser("tail", help="Newest entries first")
+    tail.add_argument("-n", type=int, default=20)
+    query = commands.add_parser("query", help="Filter entries, oldest first")
+    query.add_argument("--user")
+    query.add_argument("--item")
+    query.add_argument("--action")
+    query.add_argument("--since", type=_timestamp, help="ISO date/time (UTC unless given)")
+    query.add_argument("--until", type=_timestamp, help="ISO date/time (UTC unless given)")
+    query.add_argument("--limit", type=int)
+    args = parser.parse_args(argv)
+
+    journal = Journal(args.folder)
+    if args.command == "tail":
+        entries = journal.tail(args.n)
+    else:
+        entries = journal.query(args.user, args.item, args.action, args.since, args.until)
+    for count, entry in enumerate(entries, 1):
+        print(format_entry(entry))
+        if args.command == "query" and args.limit and count >= args.limit:
+            break
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,56 @@
+"""One-shot migration between the shared JSON files and the SQLite or sharded backend.
+
+    python -m shared_inventories.migrate_storage to-sqlite      [--db PATH] [--folder DIR]
+    python -m shared_inventories.migrate_storage to-json        [--db PATH] [--folder DIR]
+    python -m shared_inventories.migrate_storage to-shards      [--shards DIR] [--folder DIR]
+    python -m shared_inventories.migrate_storage shards-to-json [--shards DIR] [--folder DIR]
+
+`to-sqlite` loads every shared JSON file into its table (replacing what's there);
+`to-json` exports the tables back to pretty-printed JSON, e.g. for backups or to
+switch STORAGE_BACKEND back to `json`. `to-shards` / `shards-to-json` do the same
+for the per-player shard folders (STORAGE_BACKEND=sharded).
+"""
+import argparse
+import os
+
+from .atomic_io import atomic_write_json
+from .document_codec import read_document
+from .sharded_store import SHARDED_DOCUMENTS, open_sharded_store
+from .storage import SHARED_DIR, SQLITE_DOCUMENTS, open_sqlite_store
+
+def migrate_to_store(store, folder, documents=SQLITE_DOCUMENTS):
+    for filename in documents:
+        file_path = os.path.join(folder, filename)
+        if not os.path.exists(file_path):
+            print(f"⏭️ `{filename}` not found, skipping.")
+            continue
+        data = read_document(file_path)  # ✅ Whichever codec wrote it
+        store.replace_document(filename, data)
+        print(f"✅ Imported {len(data)} rows from `{filename}`.")
+
+def export_to_json(store, folder, documents=SQLITE_DOCUMENTS):
+    for filename in documents:
+        data = store.load_document(filename)
+        atomic_write_json(os.path.join(folder, filename), data)
+        print(f"✅ Exported {len(data)} rows to `{os.path.join(folder, filename)}`.")
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Move shared data between JSON files and SQLite or shards.")
+    parser.add_argument("direction", choices=["to-sqlite", "to-json", "to-shards", "shards-to-json"])
+    parser.add_argument("--db", help="SQLite database path (default: SQLITE_PATH or shared_inventories/shared_data.sqlite3)")
+    parser.add_argument("--shards", help="Shard folder (default: SHARD_PATH or shared_inventories/shards)")
+    parser.add_argument("--folder", default=SHARED_DIR, help="Folder holding the JSON files")
+    args = parser.parse_args(argv)
+
+    if args.direction in ("to-shards", "shards-to-json"):
+        store, documents = open_sharded_store(args.shards), SHARDED_DOCUMENTS
+    else:
+        store, documents = open_sqlite_store(args.db), SQLITE_DOCUMENTS
+    if args.direction in ("to-sqlite", "to-shards"):
+        migrate_to_store(store, args.folder, documents)
+    else:
+        os.makedirs(args.folder, exist_ok=True)
+        export_to_json(store, args.folder, documents)
+
+if __name__ == "__main__":
+    main()
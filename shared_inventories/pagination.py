@@ -0,0 +1,38 @@
+import discord
+
+class PageView(discord.ui.View):
+    """Previous/next buttons over a list of pre-rendered embeds."""
+
+    def __init__(self, pages, owner, timeout=180):
+        super().__init__(timeout=timeout)
+        self.pages = pages
+        self.owner = owner
+        self.index = 0
+        self._sync_buttons()
+
+    def _sync_buttons(self):
+        self.previous_page.disabled = self.index == 0
+        self.next_page.disabled = self.index >= len(self.pages) - 1
+
+    async def _show(self, interaction: discord.Interaction, index):
+        self.index = max(0, min(index, len(self.pages) - 1))
+        self._sync_buttons()
+        await interaction.response.edit_message(embed=self.pages[self.index], view=self)
+
+    async def interaction_check(self, interaction: discord.Interaction) -> bool:
+        return interaction.user == self.owner
+
+    @discord.ui.button(label="◀ Prev", style=discord.ButtonStyle.secondary)
+    async def previous_page(self, interaction: discord.Interaction, button: discord.ui.Button):
+        await self._show(interaction, self.index - 1)
+
+    @discord.ui.button(label="Next ▶", style=discord.ButtonStyle.secondary)
+    async def next_page(self, interaction: discord.Interaction, button: discord.ui.Button):
+        await self._show(interaction, self.index + 1)
+
+async def send_pages(send, pages, owner):
+    """Sends the first page via `send` (e.g. `interaction.followup.send`), with buttons if there are more."""
+    if len(pages) == 1:
+        await send(embed=pages[0])
+    else:
+        await send(embed=pages[0], view=PageView(pages, owner))
@@ -0,0 +1,51 @@
+import threading
+
+EMBED_DESCRIPTION_LIMIT = 4096  # ✅ Discord rejects longer embed descriptions
+ITEMS_PER_PAGE = 15
+
+def paginate_lines(lines, per_page=ITEMS_PER_PAGE, max_chars=EMBED_DESCRIPTION_LIMIT):
+    """Splits `lines` into pages of at most `per_page` lines and `max_chars` characters."""
+    pages, current, size = [], [], 0
+    for line in lines:
+        line = line[:max_chars]
+        added = len(line) + (1 if current else 0)  # ✅ Count the joining newline
+        if current and (len(current) >= per_page or size + added > max_chars):
+            pages.append(current)
+            current, size = [], 0
+            added = len(line)
+        current.append(line)
+        size += added
+    if current or not pages:
+        pages.append(current)
+    return ["\n".join(page) for page in pages]
+
+class RenderCache:
+    """Pre-rendered output per key, kept until the source's version token changes.
+
+    `get(key, version, render)` calls `version()` (expected to be cheap, e.g. a stat)
+    and only calls `render()` when the token differs from the one it was built for.
+    """
+
+    def __init__(self):
+        self._entries = {}
+        self._lock = threading.Lock()
+
+    def get(self, key, version, render):
+        token = version()
+        with self._lock:
+            cached = self._entries.get(key)
+            if cached and cached[0] == token:
+                return cached[1]
+
+        rendered = render()
+        with self._lock:
+            self._entries[key] = (token, rendered)
+        return rendered
+
+    def invalidate(self, key=None):
+        """Drops one key, or everything when `key` is None."""
+        with self._lock:
+            if key is None:
+                self._entries.clear()
+            else:
+                self._entries.pop(key, None)
@@ -0,0 +1,207 @@
+"""Per-player documents split into hash-bucketed shard files.
+
+    shards/
+        VERSION                      # rewritten by every commit (the version token)
+        player_inventories/
+            index.json               # {"buckets": 64, "keys": [every player ID]}
+            00.json ... 63.json      # {player_id: record} for the IDs hashed there
+
+A player's records always live in bucket `crc32(player_id) % buckets`, so changing
+one player rewrites one small file (plus the index when a player is added or
+removed) instead of everyone's data. A commit across several buckets or documents
+goes through `atomic_write_many`, and readers take a shared lock, so nobody sees
+half of one. Buckets are cached by file signature: after another bot's commit only
+the buckets it touched are read again.
+"""
+import os
+import threading
+import uuid
+import zlib
+from logging import getLogger
+from .atomic_io import atomic_write_many, recover_pending_commits
+from .changes import clone, file_signature
+from .document_codec import encode, read_document
+from .file_lock import file_lock
+
+logger = getLogger(__name__)
+
+SHARED_DIR = os.path.dirname(os.path.abspath(__file__))
+DEFAULT_SHARD_DIR = os.path.join(SHARED_DIR, "shards")
+SHARD_BUCKETS = 64
+
+# ✅ Shared documents keyed by player ID that get sharded (one folder each)
+SHARDED_DOCUMENTS = {
+    "gold_data.json": "gold_data",
+    "player_inventories.json": "player_inventories",
+    "player_stats.json": "player_stats",
+}
+_DOCUMENT_OF_FOLDER = {folder: filename for filename, folder in SHARDED_DOCUMENTS.items()}
+
+def bucket_of(key, buckets):
+    """The bucket a player ID lives in (stable across processes, unlike `hash()`)."""
+    return zlib.crc32(str(key).encode("utf-8")) % buckets
+
+class ShardedStore:
+    """Same interface as `SQLiteStore`, with a folder of shard files per document."""
+
+    kind = "sharded"
+    label = "shards"
+
+    def __init__(self, folder, buckets=SHARD_BUCKETS):
+        self.folder = folder
+        self.buckets = buckets  # ✅ For new documents; existing ones keep the count in their index
+        self._lock = threading.RLock()
+        self._files = {}  # ✅ path -> (signature, parsed contents)
+        os.makedirs(folder, exist_ok=True)
+        recover_pending_commits(folder)  # ✅ Commits journal next to VERSION, their first file
+
+    @property
+    def _version_path(self):
+        return os.path.join(self.folder, "VERSION")
+
+    def _document_folder(self, filename):
+        return os.path.join(self.folder, SHARDED_DOCUMENTS[filename])
+
+    def _bucket_path(self, filename, bucket):
+        return os.path.join(self._document_folder(filename), f"{bucket:02d}.json")
+
+    def _index_path(self, filename):
+        return os.path.join(self._document_folder(filename), "index.json")
+
+    def version(self):
+        """Changes whenever any process commits to the store."""
+        return file_signature(self._version_path)
+
+    def _read(self, path, default):
+        """A shard file's contents, re-parsed only when the file changed. Don't mutate the result."""
+        signature = file_signature(path)
+        with self._lock:
+            cached = self._files.get(path)
+            if cached and cached[0] == signature:
+                return cached[1]
+        if signature is None:
+            return default
+        data = read_document(path)
+        with self._lock:
+            self._files[path] = (signature, data)
+        return data
+
+    def _index(self, filename):
+        return self._read(self._index_path(filename), {"buckets": self.buckets, "keys": []})
+
+    def _bucket(self, filename, bucket):
+        return self._read(self._bucket_path(filename, bucket), {})
+
+    # ✅ Reading
+
+    def keys(self, filename):
+        """Every key (player ID) in a document, from its index: no shard is read."""
+        with file_lock(self._version_path, shared=True):
+            return list(self._index(filename)["keys"])
+
+    def load_document(self, filename):
+        with file_lock(self._version_path, shared=True):
+            document = {}
+            for bucket in range(self._index(filename)["buckets"]):
+                document.update(self._bucket(filename, bucket))
+        return clone(document)
+
+    def load_record(self, filename, key, default=None):
+        with file_lock(self._version_path, shared=True):
+            bucket = self._bucket(filename, bucket_of(key, self._index(filename)["buckets"]))
+            return clone(bucket[str(key)]) if str(key) in bucket else default
+
+    # ✅ Writing
+
+    def save_document(self, filename, data):
+        """Rewrites only the buckets whose records changed. Returns the number of records written."""
+        return self.save_documents({filename: data})
+
+    def save_documents(self, documents):
+        """Saves several documents in one journaled commit. Returns the number of records written."""
+        for filename, data in documents.items():
+            if not isinstance(data, dict):
+                raise TypeError(f"`{filename}` must be a dict to be sharded.")
+
+        with self._lock, file_lock(self._version_path):
+            files, written = {}, 0
+            for filename, data in documents.items():
+                buckets = self._index(filename)["buckets"]
+                grouped = [{} for _ in range(buckets)]
+                for key, value in data.items():
+                    grouped[bucket_of(key, buckets)][str(key)] = value
+                for bucket, records in enumerate(grouped):
+                    current = self._bucket(filename, bucket)
+                    if records != current:
+                        written += sum(1 for key in records.keys() | current.keys() if records.get(key) != current.get(key))
+                        files[self._bucket_path(filename, bucket)] = records
+                self._stage_index(filename, files, set(map(str, data)))
+            self._commit(files)
+        return written
+
+    def save_record(self, filename, key, value):
+        """Writes one player's record, touching only their bucket (`None` removes it)."""
+        self.save_records(filename, {key: value})
+
+    def save_records(self, filename, records):
+        """Writes several records in one commit, touching only their buckets (`None` removes an entry)."""
+        with self._lock, file_lock(self._version_path):
+            index = self._index(filename)
+            files, keys = {}, set(index["keys"])
+            for key, value in records.items():
+                key, path = str(key), self._bucket_path(filename, bucket_of(key, index["buckets"]))
+                if path not in files:
+                    files[path] = dict(self._read(path, {}))
+                if value is None:
+                    files[path].pop(key, None)
+                    keys.discard(key)
+                else:
+                    files[path][key] = value
+                    keys.add(key)
+            self._stage_index(filename, files, keys)
+            self._commit(files)
+
+    def replace_document(self, filename, data):
+        """Wipes and rewrites every bucket of a document (used by the migration tool)."""
+        with self._lock, file_lock(self._version_path):
+            buckets = self._index(filename)["buckets"]
+            grouped = [{} for _ in range(buckets)]
+            for key, value in data.items():
+                grouped[bucket_of(key, buckets)][str(key)] = value
+            files = {self._bucket_path(filename, bucket): records for bucket, records in enumerate(grouped)}
+            files[self._index_path(filename)] = {"buckets": buckets, "keys": sorted(map(str, data))}
+            self._commit(files)
+
+    def _stage_index(self, filename, files, keys):
+        index = self._index(filename)
+        if keys != set(index["keys"]):
+            files[self._index_path(filename)] = {"buckets": index["buckets"], "keys": sorted(keys)}
+
+    def _commit(self, files):
+        """Writes the staged files and a new VERSION as one commit, then caches what was written."""
+        if not files:
+            return
+        os.makedirs(self.folder, exist_ok=True)
+        payloads = {self._version_path: uuid.uuid4().hex.encode("utf-8")}  # ✅ First, so the commit journal lives here
+        for path, data in files.items():
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            payloads[path] = encode(_DOCUMENT_OF_FOLDER[os.path.basename(os.path.dirname(path))], data)  # ✅ The document's codec
+        atomic_write_many(payloads)
+        for path, data in files.items():
+            self._files[path] = (file_signature(path), clone(data))  # ✅ Callers may keep mutating their records
+
+    def close(self):
+        with self._lock:
+            self._files.clear()
+
+_stores = {}
+_stores_lock = threading.Lock()
+
+def open_sharded_store(folder=None):
+    """Returns the process-wide store for a shard folder, opening it on first use."""
+    folder = os.path.abspath(folder or os.getenv("SHARD_PATH", DEFAULT_SHARD_DIR))
+    with _stores_lock:
+        if folder not in _stores:
+            _stores[folder] = ShardedStore(folder)
+            logger.info(f"🗂️ Opened sharded storage at `{folder}`.")
+        return _stores[folder]
@@ -0,0 +1,168 @@
+import json
+import os
+import threading
+from contextlib import contextmanager
+from logging import getLogger
+from .atomic_io import atomic_write_bytes, atomic_write_json, restore_latest_backup, quarantine_file
+from .changes import file_signature
+from .document_codec import encode, read_document
+from .file_lock import file_lock
+from .state_client import get_state_client
+from .storage import get_record_store
+
+logger = getLogger(__name__)
+
+SHARED_DIR = os.path.dirname(os.path.abspath(__file__))
+BACKUP_GENERATIONS = 2  # ✅ Same rolling backups the bots keep for shared files
+
+def version_token(filename, path, fresh=False):
+    """A cheap token that changes whenever a document changes, whichever backend holds it.
+
+    The state daemon's version (the last one it pushed, unless `fresh`: then it's asked),
+    the SQLite data version or shard VERSION, or else the file's signature at `path`.
+    """
+    client = get_state_client(filename)
+    if client:
+        pushed = None if fresh else client.pushed_version(filename)
+        return ("daemon", pushed or client.version(filename))
+    store = get_record_store(filename)
+    if store:
+        return (store.kind, store.version())
+    return file_signature(path)
+
+def write_record(filename, key, value, update_json):
+    """Writes one top-level entry (`value=None` removes it) without rewriting the others.
+
+    Row-level in the daemon and on the SQLite & sharded backends; otherwise a locked
+    read-modify-write of the file through the bot's `update_json`. Returns True when the
+    entry was written past `update_json`, so a bot's cached copy of the document is stale.
+    """
+    client = get_state_client(filename)
+    if client:
+        client.save_records(filename, {key: value})
+        return True
+
+    store = get_record_store(filename)
+    if store:
+        store.save_record(filename, key, value)
+        return True
+
+    with update_json(filename) as data:
+        if value is None:
+            data.pop(key, None)
+        else:
+            data[key] = value
+    return False
+
+class SharedDocument:
+    """One shared `{player_id: record}` document, cached in memory for both bots.
+
+    The records are kept normalised (`normalise(record)`) and only re-read when the
+    document's version token changes (file signature, SQLite data version, shard VERSION or daemon
+    version), so writes made by the other bot are picked up on the next read.
+    Read-modify-writes go inside `with document.lock():` and end with `save_records`,
+    which writes only the touched records where the backend allows it.
+    """
+
+    def __init__(self, filename, path=None, normalise=None):
+        self.filename = filename
+        self.path = path or os.path.join(SHARED_DIR, filename)
+        self.normalise = normalise or (lambda record: record)
+        self._lock = threading.RLock()
+        self._version = None
+        self._data = None
+        self._held = 0  # ✅ Depth of `lock()`; only its holder can get past `self._lock` while it's > 0
+
+    def client(self):
+        return get_state_client(self.filename)
+
+    def _store(self):
+        return get_record_store(self.filename)
+
+    def version(self, fresh=False):
+        """A cheap token that changes whenever the document changes (see `version_token`).
+
+        Inside `lock()` the state daemon is always asked, so read-modify-writes start current.
+        """
+        return version_token(self.filename, self.path, fresh=fresh or bool(self._held))
+
+    def _read(self, retry=True):
+        client = self.client()
+        if client:
+            return client.load(self.filename, copy=False)[1]  # ✅ Normalised into new records right after
+
+        store = self._store()
+        if store:
+            return store.load_document(self.filename)  # ✅ STORAGE_BACKEND=sqlite / sharded
+
+        if not os.path.exists(self.path):
+            atomic_write_json(self.path, {})
+            logger.warning(f"⚠️ `{self.filename}` was missing! Created an empty one.")
+        try:
+            with file_lock(self.path, shared=True):
+                return read_document(self.path)
+        except json.JSONDecodeError as e:
+            logger.error(f"❌ `{self.filename}` is corrupted! Moved it to `{quarantine_file(self.path)}`. Error: {e}")
+            if retry and restore_latest_backup(self.path, BACKUP_GENERATIONS):
+                return self._read(retry=False)
+            return {}
+
+    def current(self):
+        """The cached, normalised records. Don't mutate them or hand them out: copy what you return."""
+        with self._lock:
+            version = self.version()
+            if self._data is None or version != self._version:
+                self._data = {key: self.normalise(record) for key, record in self._read().items()}
+                self._version = version  # ✅ Taken before reading: a write during the read just means one more reload
+            return self._data
+
+    def keys(self):
+        """Every key (player ID); from the shard index or SQLite keys when the records aren't cached."""
+        with self._lock:
+            store = self._store()
+            if store and not self.client() and (self._data is None or self._version != self.version()):
+                return store.keys(self.filename)  # ✅ No record is decoded
+            return list(self.current())
+
+    @contextmanager
+    def lock(self):
+        """Exclusive across threads and both bots, for a read-modify-write."""
+        with self._lock, file_lock(self.path):
+            self._held += 1
+            try:
+                yield
+            finally:
+                self._held -= 1
+
+    def save_records(self, records):
+        """Writes `records` ({key: record}) over the current ones. Hold `lock()` around the read-modify-write."""
+        client, store = self.client(), self._store()
+        data = self.current()
+        try:
+            if client:
+                client.save_records(self.filename, records)
+                data.update(records)
+            elif store:
+                store.save_records(self.filename, records)  # ✅ Only the touched rows
+                data.update(records)
+            else:
+                data.update(records)
+                atomic_write_bytes(self.path, encode(self.filename, data), backups=BACKUP_GENERATIONS)
+        except Exception:
+            self._data = None  # ✅ Unknown state, re-read on the next call
+            raise
+        self._version = self.version()
+
+    def mirror(self, version_before, version_after, change):
+        """Replays a change someone else (the daemon) already made, if our copy was current before it."""
+        with self._lock:
+            if self._data is not None and self._version == version_before:
+                change(self._data)
+                self._version = version_after
+            else:
+                self._data = None
+
+    def invalidate(self):
+        """Drops the cached records so the next call re-reads them."""
+        with self._lock:
+            self._data = None
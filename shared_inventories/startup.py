@@ -0,0 +1,94 @@
+"""Boot helpers shared by both bots: phase timings, cache pre-warm and command syncs that only run when needed.
+
+    STARTUP = StartupTimer(started)     # `started` = time.perf_counter() at the top of the bot file
+    ...
+    await prewarm({"recipes.json": lambda: load_json("recipes.json", readonly=True)})
+    STARTUP.mark("prewarm")
+    synced = await sync_if_changed(bot.tree, guild, state_path)
+    STARTUP.mark("command sync")
+    logger.info(STARTUP.summary())      # "imports 0.41s · login 0.22s · prewarm 0.05s · ... = 1.90s"
+
+Discord rate-limits `tree.sync()` and it's slow, so `sync_if_changed` hashes the
+command definitions and skips the call when they match the last sync's.
+FORCE_COMMAND_SYNC=1 syncs anyway. Don't call `tree.sync()` directly: the recorded
+hash would go stale and a later boot could skip a sync it needed.
+"""
+import asyncio
+import hashlib
+import json
+import os
+import time
+from logging import getLogger
+from .async_store import run_blocking
+from .atomic_io import atomic_write_json
+
+logger = getLogger(__name__)
+
+class StartupTimer:
+    """Time spent in each boot phase: each `mark(phase)` closes the phase that ran since the last one."""
+
+    def __init__(self, started=None):
+        self.started = self._last = started if started is not None else time.perf_counter()
+        self.phases = []
+
+    def mark(self, phase):
+        now = time.perf_counter()
+        self.phases.append((phase, now - self._last))
+        self._last = now
+
+    def total(self):
+        return self._last - self.started
+
+    def summary(self):
+        return " · ".join(f"{phase} {seconds:.2f}s" for phase, seconds in self.phases) + f" = {self.total():.2f}s"
+
+async def prewarm(loads):
+    """Runs `{name: load}` side by side on the storage pool, so the first commands hit warm caches.
+
+    Returns the names that failed (logged; the bot still starts, they'll just load on first use).
+    """
+    names = list(loads)
+    results = await asyncio.gather(*(run_blocking(loads[name]) for name in names), return_exceptions=True)
+    failed = [name for name, result in zip(names, results) if isinstance(result, Exception)]
+    for name, result in zip(names, results):
+        if isinstance(result, Exception):
+            logger.warning(f"⚠️ Couldn't pre-warm `{name}`: {result}")
+    return failed
+
+def command_tree_hash(tree, guild=None):
+    """A hash of every command definition `tree.sync(guild=guild)` would upload."""
+    payloads = []
+    for command in tree.get_commands(guild=guild):
+        try:
+            payloads.append(command.to_dict(tree))
+        except TypeError:
+            payloads.append(command.to_dict())  # ✅ discord.py before 2.4 takes no tree
+    payloads.sort(key=lambda payload: (payload.get("type", 1), payload["name"]))
+    return hashlib.sha256(json.dumps(payloads, sort_keys=True, default=str).encode("utf-8")).hexdigest()
+
+def _read_hashes(state_path):
+    try:
+        with open(state_path, "r", encoding="utf-8") as file:
+            return json.load(file)
+    except (OSError, ValueError):
+        return {}
+
+async def sync_if_changed(tree, guild, state_path, force=False):
+    """Syncs the tree only if its commands changed since the last sync recorded in `state_path`.
+
+    Returns the synced commands, or None when the sync was skipped. Manual syncs go
+    through here too, with `force=True`, so the recorded hash always matches Discord's.
+    """
+    scope = f"{tree.client.application_id}:{guild.id if guild else 'global'}"  # ✅ Per app & guild
+    digest = command_tree_hash(tree, guild)
+    hashes = _read_hashes(state_path)
+    force = force or os.getenv("FORCE_COMMAND_SYNC", "").strip().lower() in ("1", "true", "yes")
+    if not force and hashes.get(scope) == digest:
+        logger.info(f"⏭️ Command definitions unchanged ({digest[:12]}), skipping sync.")
+        return None
+
+    synced = await tree.sync(guild=guild)
+    hashes[scope] = digest
+    await run_blocking(atomic_write_json, state_path, hashes)
+    logger.info(f"✅ Synced {len(synced)} commands ({digest[:12]}).")
+    return synced
@@ -0,0 +1,212 @@
+import json
+import os
+import socket
+import threading
+from logging import getLogger
+from .changes import clone
+
+logger = getLogger(__name__)
+
+SHARED_DIR = os.path.dirname(os.path.abspath(__file__))
+DEFAULT_SOCKET = os.path.join(SHARED_DIR, "shared_state.sock")
+
+# ✅ Documents the state daemon owns while it's running; everything else stays in files.
+# The shop is held too, so a purchase (shop + gold + inventories) is one daemon commit.
+DAEMON_DOCUMENTS = ("gold_data.json", "player_inventories.json", "player_stats.json", "stanley_shop.json")
+
+class StateDaemonError(RuntimeError):
+    """The daemon refused a request, or the connection to it was lost."""
+
+def encode_message(message):
+    """One message per line, UTF-8 JSON."""
+    return json.dumps(message, separators=(",", ":")).encode("utf-8") + b"\n"
+
+class StateClient:
+    """Blocking client for the state daemon (see `state_daemon.py`), safe to share between threads.
+
+    Loaded documents are cached with the version they were read at; a load sends that
+    version along and the daemon only sends the document back if it has changed since.
+    After `follow()`, `pushed_version` knows each document's latest version without asking.
+    """
+
+    def __init__(self, socket_path):
+        self.socket_path = socket_path
+        self._lock = threading.Lock()
+        self._connection = None
+        self._cache = {}  # document -> (version, data)
+        self._pushed = {}  # document -> latest version the daemon told the watcher about
+
+    def _connect(self):
+        connection = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        connection.connect(self.socket_path)
+        return connection, connection.makefile("rb")
+
+    def request(self, op, **fields):
+        """Sends one request and waits for its reply. Raises `StateDaemonError` on failure."""
+        with self._lock:
+            try:
+                if self._connection is None:
+                    self._connection = self._connect()
+                connection, reader = self._connection
+                connection.sendall(encode_message({"op": op, **fields}))
+                line = reader.readline()
+                if not line:
+                    raise ConnectionError("the daemon closed the connection")
+            except OSError as e:
+                self._close()
+                raise StateDaemonError(f"Lost the state daemon at `{self.socket_path}`: {e}") from e
+
+        reply = json.loads(line)
+        if not reply.get("ok"):
+            raise StateDaemonError(reply.get("error", f"`{op}` failed"))
+        return reply
+
+    def _close(self):
+        if self._connection:
+            connection, reader = self._connection
+            reader.close()
+            connection.close()
+        self._connection = None
+
+    def close(self):
+        with self._lock:
+            self._close()
+
+    def ping(self):
+        self.request("ping")
+
+    def version(self, document):
+        return self.request("version", document=document)["version"]
+
+    def load(self, document, copy=True):
+        """Returns (version, data). With `copy=False` the data is shared with the client's cache: don't mutate it."""
+        cached = self._cache.get(document)
+        reply = self.request("load", document=document, since=cached[0] if cached else None)
+        if "data" in reply:
+            cached = (reply["version"], reply["data"])
+            self._cache[document] = cached  # ✅ Replaced, never mutated, so shared views stay valid
+        return cached[0], clone(cached[1]) if copy else cached[1]
+
+    def save(self, documents):
+        """Replaces whole documents in one step. Returns {document: new version}."""
+        for document, data in documents.items():
+            self._cache.pop(document, None)
+        return self.request("save", documents=documents)["versions"]
+
+    def save_records(self, document, records):
+        """Writes (or with `None`, removes) some top-level entries. Returns the new version."""
+        self._cache.pop(document, None)
+        return self.request("save_records", document=document, records=records)["version"]
+
+    def apply_inventory_deltas(self, deltas, clamp=False):
+        """Runs `inventory_service.apply_deltas` inside the daemon.
+
+        Returns (quantities, moved, version_before, version_after), where `moved` is what
+        each item actually moved by; quantities is None when a removal couldn't be
+        covered and nothing changed.
+        """
+        reply = self.request("apply_inventory_deltas", deltas=deltas, clamp=clamp)
+        return reply["quantities"], reply["moved"], reply["version_before"], reply["version_after"]
+
+    def flush(self):
+        """Waits until every acknowledged change is on disk."""
+        self.request("flush")
+
+    def watch(self, callback, on_subscribed=None, on_lost=None):
+        """Calls `callback(document, version)` from a background thread whenever a document changes.
+
+        `on_subscribed(versions)` gets every document's version as of the subscription, and
+        `on_lost()` is called once if the connection to the daemon drops.
+        """
+        def listen():
+            try:
+                connection, reader = self._connect()
+                connection.sendall(encode_message({"op": "subscribe"}))
+                for line in reader:
+                    event = json.loads(line)
+                    if event.get("event") == "changed":
+                        callback(event["document"], event["version"])
+                    elif "versions" in event and on_subscribed:
+                        on_subscribed(event["versions"])
+            except OSError as e:
+                logger.warning(f"⚠️ Stopped watching the state daemon: {e}")
+            finally:
+                if on_lost:
+                    on_lost()
+
+        thread = threading.Thread(target=listen, name="state-daemon-watch", daemon=True)
+        thread.start()
+        return thread
+
+    def follow(self):
+        """Tracks every document's version from the daemon's events and passes them to `on_change` listeners."""
+        def changed(document, version):
+            self._pushed[document] = version  # ✅ One connection, so events arrive in order
+            _notify(document, version)
+
+        def lost():
+            self._pushed.clear()  # ✅ Back to asking the daemon every time
+            _notify(None, None)
+
+        return self.watch(changed, on_subscribed=self._pushed.update, on_lost=lost)
+
+    def pushed_version(self, document):
+        """The latest version the daemon pushed for `document`, or None when it isn't being followed.
+
+        It can lag a write that was just acknowledged, so only use it for reads that may be
+        a moment behind; read-modify-writes ask the daemon.
+        """
+        return self._pushed.get(document)
+
+_listeners = []
+
+def on_change(listener):
+    """Calls `listener(document, version)` whenever a followed daemon document changes.
+
+    `(None, None)` means the daemon was lost and any cached copy may be out of date.
+    """
+    _listeners.append(listener)
+
+def _notify(document, version):
+    for listener in list(_listeners):
+        try:
+            listener(document, version)
+        except Exception as e:
+            logger.error(f"❌ A state daemon listener failed on `{document}`. Error: {e}")
+
+def state_socket():
+    """The daemon's socket path from SHARED_STATE_SOCKET, or None when the daemon isn't configured."""
+    return os.getenv("SHARED_STATE_SOCKET", "").strip() or None
+
+_client = None
+_client_lock = threading.Lock()
+_unavailable = False
+
+def get_state_client(filename):
+    """Returns the daemon client for `filename`, or None when it's read from and written to files.
+
+    The daemon is only used if SHARED_STATE_SOCKET is set and it answers the first time
+    it's needed; otherwise the bot stays in file mode for the rest of its run, so one
+    process never switches storage halfway through.
+    """
+    global _client, _unavailable
+    if filename not in DAEMON_DOCUMENTS or _unavailable:
+        return None
+    if _client is not None:
+        return _client
+
+    path = state_socket()
+    if not path:
+        return None
+    with _client_lock:
+        if _client is None and not _unavailable:
+            client = StateClient(path)
+            try:
+                client.ping()
+                client.follow()  # ✅ Change events keep the bots' caches current without a round trip per read
+                _client = client
+                logger.info(f"🔌 Using the state daemon at `{path}` for shared documents.")
+            except StateDaemonError as e:
+                _unavailable = True
+                logger.warning(f"⚠️ State daemon not reachable, falling back to files. {e}")
+    return _client
@@ -0,0 +1,244 @@
+"""Optional local daemon that keeps the shared player documents in memory for both bots.
+
+    python -m shared_inventories.state_daemon [--socket PATH] [--folder DIR] [--flush-delay SECONDS]
+
+Start it, then run both bots with SHARED_STATE_SOCKET pointing at the same socket
+(default: shared_inventories/shared_state.sock). The daemon owns `gold_data.json`,
+`player_inventories.json`, `player_stats.json` and `stanley_shop.json`: bots load them
+over the socket instead of re-reading the files, every mutation is applied in order on the daemon's
+event loop, and changes are written back in batches (at most `--flush-delay` seconds
+after they're acknowledged, and on shutdown). Clients that subscribe get every
+document's version, then a notification each time a document changes (sent before the
+writer's reply).
+
+Without SHARED_STATE_SOCKET, or if the daemon isn't running when a bot first needs it,
+the bots keep reading & writing the files directly.
+
+Protocol: one JSON object per line. Requests carry an "op"; replies have "ok" and
+either the result fields or "error".
+"""
+import argparse
+import asyncio
+import json
+import logging
+import os
+import signal
+import uuid
+from logging import getLogger
+
+from .atomic_io import atomic_write_many, atomic_write_json, recover_pending_commits, restore_latest_backup, quarantine_file
+from .document_codec import encode, read_document
+from .file_lock import file_locks
+from .inventory_service import INVENTORY_FILE, apply_deltas, movements
+from .changes import clone
+from .state_client import DAEMON_DOCUMENTS, DEFAULT_SOCKET, SHARED_DIR, encode_message
+from .storage import get_record_store
+
+logger = getLogger(__name__)
+
+FLUSH_DELAY = 0.25  # ✅ Seconds a change may wait so bursts are written together
+BACKUP_GENERATIONS = 2
+MAX_MESSAGE_BYTES = 64 * 1024 * 1024  # ✅ Whole documents travel as single lines
+
+class StateDaemon:
+    """In-memory owner of the shared documents; see the module docstring."""
+
+    def __init__(self, folder=SHARED_DIR, flush_delay=FLUSH_DELAY):
+        self.folder = folder
+        self.flush_delay = flush_delay
+        self.documents = {}
+        self.boot = uuid.uuid4().hex[:8]  # ✅ Versions from a previous run never match this one's
+        self.counters = {}
+        self.dirty = set()
+        self.subscribers = set()
+        self.flushes = 0
+        self._flush_handle = None
+        self._flush_lock = None
+
+    def _path(self, document):
+        return os.path.join(self.folder, document)
+
+    def load_documents(self):
+        recover_pending_commits(self.folder)
+        for document in DAEMON_DOCUMENTS:
+            self.documents[document] = self._read(document)
+            self.counters[document] = 0
+        logger.info(f"📂 Loaded {', '.join(f'`{name}`' for name in DAEMON_DOCUMENTS)} into memory.")
+
+    def _read(self, document):
+        store = get_record_store(document)
+        if store:
+            return store.load_document(document)
+        path = self._path(document)
+        if not os.path.exists(path):
+            atomic_write_json(path, {})
+        try:
+            return read_document(path)
+        except json.JSONDecodeError as e:
+            logger.error(f"❌ `{document}` is corrupted! Moved it to `{quarantine_file(path)}`. Error: {e}")
+            if restore_latest_backup(path, BACKUP_GENERATIONS):
+                return read_document(path)
+            return {}
+
+    def version(self, document):
+        return f"{self.boot}:{self.counters[document]}"
+
+    def _changed(self, document):
+        """Bumps a document's version, schedules a flush and tells subscribers."""
+        self.counters[document] += 1
+        self.dirty.add(document)
+        if self._flush_handle is None:
+            self._flush_handle = asyncio.get_running_loop().call_later(
+                self.flush_delay, lambda: asyncio.ensure_future(self.flush())
+            )
+
+        event = encode_message({"event": "changed", "document": document, "version": self.version(document)})
+        for writer in list(self.subscribers):
+            if writer.is_closing():
+                self.subscribers.discard(writer)
+            else:
+                writer.write(event)
+
+    async def flush(self):
+        """Writes every dirty document: one SQLite transaction (or shard commit) and one journaled file commit.
+
+        Returns False if the write failed (the documents stay dirty for the next flush).
+        """
+        if self._flush_handle is not None:
+            self._flush_handle.cancel()
+            self._flush_handle = None
+        async with self._flush_lock:
+            if not self.dirty:
+                return True
+            store, store_documents, payloads, backups = None, {}, {}, {}
+            for document in self.dirty:  # ✅ Snapshot on the loop, write off it
+                if get_record_store(document):
+                    store = get_record_store(document)
+                    store_documents[document] = clone(self.documents[document])
+                else:
+                    payloads[self._path(document)] = encode(document, self.documents[document])
+                    backups[self._path(document)] = BACKUP_GENERATIONS
+            written = sorted(self.dirty)
+            self.dirty.clear()
+
+            def write():
+                if store_documents:
+                    store.save_documents(store_documents)
+                with file_locks(list(payloads)):
+                    atomic_write_many(payloads, backups)
+
+            try:
+                await asyncio.get_running_loop().run_in_executor(None, write)
+            except Exception as e:
+                self.dirty.update(written)  # ✅ Try again with the next flush
+                logger.error(f"❌ Failed to flush {', '.join(written)}. Error: {e}")
+                return False
+            self.flushes += 1
+            logger.info(f"💾 Flushed {', '.join(f'`{name}`' for name in written)}.")
+            return True
+
+    def _document(self, request):
+        document = request.get("document")
+        if document not in self.documents:
+            raise KeyError(f"`{document}` isn't held by the state daemon.")
+        return document
+
+    async def handle(self, request, writer):
+        """Runs one request and returns the reply's fields."""
+        op = request.get("op")
+        if op == "ping":
+            return {}
+        if op == "version":
+            document = self._document(request)
+            return {"version": self.version(document)}
+        if op == "load":
+            document = self._document(request)
+            if request.get("since") == self.version(document):
+                return {"version": self.version(document)}  # ✅ The client's copy is current
+            return {"version": self.version(document), "data": self.documents[document]}
+        if op == "save":
+            documents = request["documents"]
+            for document in documents:
+                self._document({"document": document})
+            for document, data in documents.items():
+                self.documents[document] = data
+                self._changed(document)
+            return {"versions": {document: self.version(document) for document in documents}}
+        if op == "save_records":
+            document = self._document(request)
+            data = self.documents[document]
+            for key, value in request["records"].items():
+                if value is None:
+                    data.pop(key, None)
+                else:
+                    data[key] = value
+            self._changed(document)
+            return {"version": self.version(document)}
+        if op == "apply_inventory_deltas":
+            version_before = self.version(INVENTORY_FILE)
+            document = self.documents[INVENTORY_FILE]
+            before = {str(player_id): document.get(str(player_id), {}) for player_id in request["deltas"]}  # ✅ Replaced, not mutated
+            quantities = apply_deltas(document, request["deltas"], clamp=request.get("clamp", False))
+            moved = None
+            if quantities is not None:
+                self._changed(INVENTORY_FILE)
+                moved = movements(before, quantities)
+            return {"quantities": quantities, "moved": moved, "version_before": version_before, "version_after": self.version(INVENTORY_FILE)}
+        if op == "flush":
+            if not await self.flush():
+                raise OSError("Writing the documents failed; see the daemon's log.")
+            return {}
+        if op == "subscribe":
+            self.subscribers.add(writer)
+            return {"versions": {document: self.version(document) for document in self.documents}}
+        raise ValueError(f"Unknown op `{op}`.")
+
+    async def serve_client(self, reader, writer):
+        try:
+            while line := await reader.readline():
+                try:
+                    reply = {"ok": True, **await self.handle(json.loads(line), writer)}
+                except Exception as e:
+                    reply = {"ok": False, "error": f"{type(e).__name__}: {e}"}
+                writer.write(encode_message(reply))
+                await writer.drain()
+        except (ConnectionError, asyncio.IncompleteReadError):
+            pass
+        finally:
+            self.subscribers.discard(writer)
+            writer.close()
+
+    async def serve(self, socket_path):
+        """Serves until cancelled or sent SIGINT/SIGTERM, then flushes everything once more."""
+        self._flush_lock = asyncio.Lock()
+        self.load_documents()
+        if os.path.exists(socket_path):
+            os.remove(socket_path)  # ✅ Left over from a daemon that didn't shut down cleanly
+        server = await asyncio.start_unix_server(self.serve_client, path=socket_path, limit=MAX_MESSAGE_BYTES)
+        logger.info(f"🔌 State daemon listening on `{socket_path}`.")
+
+        stop = asyncio.Event()
+        loop = asyncio.get_running_loop()
+        for signum in (signal.SIGINT, signal.SIGTERM):
+            loop.add_signal_handler(signum, stop.set)
+        try:
+            async with server:
+                await stop.wait()
+        finally:
+            await self.flush()
+            if os.path.exists(socket_path):
+                os.remove(socket_path)
+            logger.info(f"👋 State daemon stopped after {self.flushes} flushes.")
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Keep the shared player documents in memory for both bots.")
+    parser.add_argument("--socket", default=os.getenv("SHARED_STATE_SOCKET") or DEFAULT_SOCKET, help="Unix socket path")
+    parser.add_argument("--folder", default=SHARED_DIR, help="Folder holding the shared JSON files")
+    parser.add_argument("--flush-delay", type=float, default=FLUSH_DELAY, help="Seconds to batch changes before writing them")
+    args = parser.parse_args(argv)
+
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s - %(levelname)s - %(message)s")
+    asyncio.run(StateDaemon(args.folder, args.flush_delay).serve(args.socket))
+
+if __name__ == "__main__":
+    main()
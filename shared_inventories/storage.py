@@ -0,0 +1,183 @@
+import json
+import os
+import sqlite3
+import threading
+from logging import getLogger
+from .sharded_store import SHARDED_DOCUMENTS, open_sharded_store
+
+logger = getLogger(__name__)
+
+SHARED_DIR = os.path.dirname(os.path.abspath(__file__))
+DEFAULT_SQLITE_PATH = os.path.join(SHARED_DIR, "shared_data.sqlite3")
+
+# ✅ Shared documents that move into SQLite (one table each, one row per top-level key)
+SQLITE_DOCUMENTS = {
+    "gold_data.json": "gold_data",
+    "player_inventories.json": "player_inventories",
+    "player_stats.json": "player_stats",
+    "stanley_shop.json": "stanley_shop",
+    "crafted_items.json": "crafted_items",
+}
+
+def storage_backend():
+    """The configured backend: `json` (default), `sqlite` or `sharded`, from the STORAGE_BACKEND env var."""
+    return os.getenv("STORAGE_BACKEND", "json").strip().lower()
+
+class SQLiteStore:
+    """Keeps each shared document in its own table as `key → JSON value` rows.
+
+    Saving a whole document only rewrites the rows that changed, so one player's
+    purchase touches one row instead of rewriting everyone's data.
+    """
+
+    kind = "sqlite"
+    label = "SQLite"
+
+    def __init__(self, db_path):
+        self.db_path = db_path
+        self._lock = threading.RLock()
+        self._local_writes = 0
+        self._conn = sqlite3.connect(db_path, check_same_thread=False, isolation_level=None, timeout=30)
+        self._conn.execute("PRAGMA journal_mode=WAL")  # ✅ Readers never block the writer
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        for table in SQLITE_DOCUMENTS.values():
+            self._conn.execute(f'CREATE TABLE IF NOT EXISTS "{table}" (key TEXT PRIMARY KEY, value TEXT NOT NULL)')
+
+    @staticmethod
+    def _table(filename):
+        return SQLITE_DOCUMENTS[filename]
+
+    def version(self):
+        """Changes whenever any connection (ours or another bot's) commits."""
+        with self._lock:
+            data_version = self._conn.execute("PRAGMA data_version").fetchone()[0]
+            return (data_version, self._local_writes)
+
+    def load_document(self, filename):
+        with self._lock:
+            rows = self._conn.execute(f'SELECT key, value FROM "{self._table(filename)}"').fetchall()
+        return {key: json.loads(value) for key, value in rows}
+
+    def keys(self, filename):
+        """Every key (player ID) in a document, without decoding any values."""
+        with self._lock:
+            return [key for key, in self._conn.execute(f'SELECT key FROM "{self._table(filename)}"')]
+
+    def load_record(self, filename, key, default=None):
+        with self._lock:
+            row = self._conn.execute(f'SELECT value FROM "{self._table(filename)}" WHERE key = ?', (key,)).fetchone()
+        return json.loads(row[0]) if row else default
+
+    def save_document(self, filename, data):
+        """Diffs `data` against the table and writes only changed/removed rows in one transaction."""
+        return self.save_documents({filename: data})
+
+    def save_documents(self, documents):
+        """Saves several documents in a single SQLite transaction. Returns the number of rows written."""
+        for filename, data in documents.items():
+            if not isinstance(data, dict):
+                raise TypeError(f"`{filename}` must be a dict to be stored in SQLite.")
+
+        written = 0
+        with self._lock:
+            self._conn.execute("BEGIN IMMEDIATE")
+            try:
+                for filename, data in documents.items():
+                    written += self._write_rows(self._table(filename), data)
+                self._conn.execute("COMMIT")
+            except BaseException:
+                self._conn.execute("ROLLBACK")
+                raise
+            self._local_writes += 1
+        return written
+
+    def _write_rows(self, table, data):
+        new_rows = {str(key): json.dumps(value) for key, value in data.items()}
+        old_rows = dict(self._conn.execute(f'SELECT key, value FROM "{table}"').fetchall())
+        changed = [(key, value) for key, value in new_rows.items() if old_rows.get(key) != value]
+        removed = [(key,) for key in old_rows.keys() - new_rows.keys()]
+        if changed:
+            self._conn.executemany(f'INSERT OR REPLACE INTO "{table}" (key, value) VALUES (?, ?)', changed)
+        if removed:
+            self._conn.executemany(f'DELETE FROM "{table}" WHERE key = ?', removed)
+        return len(changed) + len(removed)
+
+    def save_record(self, filename, key, value):
+        """Row-level write: one player's balance or inventory."""
+        with self._lock:
+            if value is None:
+                self._conn.execute(f'DELETE FROM "{self._table(filename)}" WHERE key = ?', (str(key),))
+            else:
+                self._conn.execute(
+                    f'INSERT OR REPLACE INTO "{self._table(filename)}" (key, value) VALUES (?, ?)',
+                    (str(key), json.dumps(value))
+                )
+            self._local_writes += 1
+
+    def save_records(self, filename, records):
+        """Row-level write of several entries in one transaction (`None` removes an entry)."""
+        table = self._table(filename)
+        with self._lock:
+            self._conn.execute("BEGIN IMMEDIATE")
+            try:
+                for key, value in records.items():
+                    if value is None:
+                        self._conn.execute(f'DELETE FROM "{table}" WHERE key = ?', (str(key),))
+                    else:
+                        self._conn.execute(
+                            f'INSERT OR REPLACE INTO "{table}" (key, value) VALUES (?, ?)',
+                            (str(key), json.dumps(value))
+                        )
+                self._conn.execute("COMMIT")
+            except BaseException:
+                self._conn.execute("ROLLBACK")
+                raise
+            self._local_writes += 1
+
+    def replace_document(self, filename, data):
+        """Wipes and reloads a whole table (used by the migration tool)."""
+        table = self._table(filename)
+        with self._lock:
+            self._conn.execute("BEGIN IMMEDIATE")
+            try:
+                self._conn.execute(f'DELETE FROM "{table}"')
+                self._conn.executemany(
+                    f'INSERT INTO "{table}" (key, value) VALUES (?, ?)',
+                    [(str(key), json.dumps(value)) for key, value in data.items()]
+                )
+                self._conn.execute("COMMIT")
+            except BaseException:
+                self._conn.execute("ROLLBACK")
+                raise
+            self._local_writes += 1
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
+
+_stores = {}
+_stores_lock = threading.Lock()
+
+def open_sqlite_store(db_path=None):
+    """Returns the process-wide store for a database file, opening it on first use."""
+    db_path = os.path.abspath(db_path or os.getenv("SQLITE_PATH", DEFAULT_SQLITE_PATH))
+    with _stores_lock:
+        if db_path not in _stores:
+            _stores[db_path] = SQLiteStore(db_path)
+            logger.info(f"🗄️ Opened SQLite storage at `{db_path}`.")
+        return _stores[db_path]
+
+def get_sqlite_store(filename):
+    """Returns the SQLite store for `filename`, or None when it lives in a plain JSON file."""
+    if filename not in SQLITE_DOCUMENTS or storage_backend() != "sqlite":
+        return None
+    return open_sqlite_store()
+
+def get_record_store(filename):
+    """Returns the row-level store (SQLite or shards) for `filename`, or None when it lives in a plain JSON file."""
+    backend = storage_backend()
+    if backend == "sharded" and filename in SHARDED_DOCUMENTS:
+        return open_sharded_store()
+    if backend == "sqlite" and filename in SQLITE_DOCUMENTS:
+        return open_sqlite_store()
+    return None
@@ -0,0 +1,104 @@
+from dataclasses import dataclass
+from logging import getLogger
+from .journal import JOURNAL
+from .shared_document import SharedDocument
+
+logger = getLogger(__name__)
+
+GOLD_FILE = "gold_data.json"
+COPPER_PER = {"gp": 100, "sp": 10, "cp": 1}
+
+@dataclass(frozen=True, order=True)
+class Money:
+    """An amount of coin, held as a whole number of copper pieces."""
+
+    cp: int = 0
+
+    @classmethod
+    def of(cls, gp=0, sp=0, cp=0):
+        return cls(gp * COPPER_PER["gp"] + sp * COPPER_PER["sp"] + cp)
+
+    @property
+    def gp(self):
+        """Whole gold pieces (what prices are quoted in)."""
+        return self.cp // COPPER_PER["gp"]
+
+    def parts(self):
+        """(gp, sp, cp), using the largest coins first."""
+        gp, rest = divmod(self.cp, COPPER_PER["gp"])
+        return (gp, *divmod(rest, COPPER_PER["sp"]))
+
+    def __add__(self, other):
+        return Money(self.cp + other.cp)
+
+    def __sub__(self, other):
+        return Money(self.cp - other.cp)
+
+    def __str__(self):
+        gp, sp, cp = self.parts()
+        return f"{gp} gp, {sp} sp, {cp} cp"
+
+def to_copper(record):
+    """A stored balance as copper: wallets hold an int, older files a {"gp", "sp", "cp"} dict."""
+    if isinstance(record, dict):
+        return sum(int(record.get(coin, 0)) * value for coin, value in COPPER_PER.items())
+    return int(record or 0)
+
+def balance(document, player_id):
+    """A player's balance in a loaded `gold_data.json` (e.g. inside a transaction)."""
+    return Money(to_copper(document.get(str(player_id), 0)))
+
+def apply_changes(document, changes):
+    """Adds `{player_id: Money}` (negative to take) to a loaded `gold_data.json` in place.
+
+    Nothing changes and False is returned if any balance would go below zero.
+    Use it directly inside a multi-document transaction, otherwise go through `WALLETS`.
+    """
+    updated = {str(player_id): to_copper(document.get(str(player_id), 0)) + change.cp for player_id, change in changes.items()}
+    if any(copper < 0 for copper in updated.values()):
+        return False
+    document.update(updated)
+    return True
+
+class WalletStore:
+    """Every player's balance as one integer of copper in `gold_data.json`.
+
+    A transfer is an integer add per player and one write of just those records
+    (a row per player on SQLite or the state daemon). Balances still in the old
+    gp/sp/cp format are converted the first time they're written. Every change is
+    recorded in the shared journal under the caller's `action`.
+    """
+
+    def __init__(self, path=None):
+        self.document = SharedDocument(GOLD_FILE, path, to_copper)
+
+    def balance(self, player_id):
+        return Money(self.document.current().get(str(player_id), 0))
+
+    def apply(self, changes, action="adjust"):
+        """Applies `{player_id: Money}` in one locked write. Returns False (and writes nothing) if anyone can't cover it."""
+        with self.document.lock():  # ✅ Exclusive across both bots for the read-modify-write
+            updated = {str(player_id): self.balance(player_id).cp for player_id in changes}
+            if not apply_changes(updated, changes):
+                return False
+            self.document.save_records(updated)
+        for player_id, change in changes.items():
+            if change.cp:
+                JOURNAL.record(action, player_id, cp=change.cp)
+        logger.info(f"💰 Applied balance changes: {changes}")
+        return True
+
+    def credit(self, player_id, amount, action="credit"):
+        return self.apply({player_id: amount}, action)
+
+    def debit(self, player_id, amount, action="debit"):
+        """Takes `amount` if the player has it. Returns True on success."""
+        return self.apply({player_id: Money(-amount.cp)}, action)
+
+    def transfer(self, giver_id, receiver_id, amount, action="transfer"):
+        """Moves `amount` from one player to another in one write. Returns True on success."""
+        if str(giver_id) == str(receiver_id):
+            return self.balance(giver_id) >= amount
+        return self.apply({giver_id: Money(-amount.cp), receiver_id: amount}, action)
+
+WALLETS = WalletStore()
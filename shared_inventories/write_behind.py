@@ -0,0 +1,159 @@
+"""Write-behind for documents that are saved many times in a burst.
+
+A save marks the document dirty and returns; the disk write happens once the
+window (`WRITE_BEHIND_MS`, default 250 ms) has passed, so every save made in the
+meantime becomes one write of the latest data:
+
+    WRITES = WriteBehind(path_of, write)
+    WRITES.save("in_game_time.json", data)   # queued
+    WRITES.get("in_game_time.json")          # the queued data, until it's on disk
+    WRITES.flush()                           # write everything now (bot.close(), exit)
+
+Only use it for files a single process writes. Each flush takes the file's lock, so
+readers in other processes still see whole files, just up to one window late.
+`WRITE_BEHIND_MS=0` turns it off (every save writes straight through).
+"""
+import atexit
+import os
+import signal
+import threading
+import time
+from logging import getLogger
+from .file_lock import file_lock
+
+logger = getLogger(__name__)
+
+DEFAULT_WINDOW_MS = 250
+MAX_SAMPLES = 1000  # ✅ Flush timings kept for the percentiles
+
+def window_seconds():
+    """The coalescing window from `WRITE_BEHIND_MS`, read on use so a late `.env` load still applies."""
+    try:
+        return max(0, int(os.getenv("WRITE_BEHIND_MS", DEFAULT_WINDOW_MS))) / 1000
+    except ValueError:
+        return DEFAULT_WINDOW_MS / 1000
+
+class WriteBehind:
+    """Dirty documents waiting to be written: filename -> latest data."""
+
+    def __init__(self, path_of, write, window=None):
+        self.path_of = path_of  # ✅ filename -> path, for the file lock
+        self.write = write  # ✅ write(filename, data): the real (atomic) save
+        self.window = window  # ✅ Seconds; None = `WRITE_BEHIND_MS`
+        self._pending = {}
+        self._dirty_since = {}
+        self._lock = threading.Lock()
+        self._timer = None
+        self._saves = 0
+        self._writes = 0
+        self._flush_ms = []
+        self._ages_ms = []
+
+    def enabled(self):
+        return (self.window if self.window is not None else window_seconds()) > 0
+
+    def save(self, filename, data):
+        """Queues `data` as the next contents of `filename`. The caller must not mutate it afterwards."""
+        with self._lock:
+            self._pending[filename] = data
+            self._dirty_since.setdefault(filename, time.perf_counter())
+            self._saves += 1
+            if self._timer is None:
+                window = self.window if self.window is not None else window_seconds()
+                self._timer = threading.Timer(window, self._flush_due)
+                self._timer.daemon = True
+                self._timer.start()
+
+    def get(self, filename):
+        """The data queued for `filename`, or None when disk is up to date."""
+        with self._lock:
+            return self._pending.get(filename)
+
+    def pending(self):
+        with self._lock:
+            return list(self._pending)
+
+    def discard(self, filenames):
+        """Drops queued data that a direct save has just superseded. Call it holding those files' locks."""
+        with self._lock:
+            for filename in filenames:
+                if self._pending.pop(filename, None) is not None:
+                    self._dirty_since.pop(filename, None)
+
+    def _flush_due(self):
+        with self._lock:
+            self._timer = None
+        self.flush()
+
+    def flush(self, filenames=None):
+        """Writes the queued documents now (all of them by default). Returns how many were written."""
+        written = 0
+        for filename in (filenames if filenames is not None else self.pending()):
+            start = time.perf_counter()
+            try:
+                with file_lock(self.path_of(filename)):
+                    with self._lock:
+                        data = self._pending.get(filename)  # ✅ The newest data, read under the file lock
+                    if data is None:
+                        continue  # ✅ Already flushed or superseded by a direct save
+                    self.write(filename, data)
+            except Exception as e:
+                logger.error(f"❌ Failed to flush `{filename}`; it stays queued. Error: {e}")
+                self._retry_later()
+                continue
+
+            now = time.perf_counter()
+            with self._lock:
+                if self._pending.get(filename) is data:  # ✅ Not saved again while we were writing
+                    del self._pending[filename]
+                    dirty_since = self._dirty_since.pop(filename, start)
+                else:
+                    dirty_since = self._dirty_since.get(filename, start)
+                    self._dirty_since[filename] = start  # ✅ The newer save came in after this write began
+                self._writes += 1
+                self._record(self._flush_ms, (now - start) * 1000)
+                self._record(self._ages_ms, (now - dirty_since) * 1000)
+            written += 1
+        return written
+
+    def _retry_later(self):
+        with self._lock:
+            if self._timer is None:
+                self._timer = threading.Timer(max(self.window or window_seconds(), 1.0), self._flush_due)
+                self._timer.daemon = True
+                self._timer.start()
+
+    @staticmethod
+    def _record(samples, value):
+        samples.append(value)
+        if len(samples) > MAX_SAMPLES:
+            del samples[: len(samples) - MAX_SAMPLES]
+
+    def metrics(self):
+        """Saves vs disk writes, and how long flushes take / how stale data got before reaching disk."""
+        with self._lock:
+            flush_ms, ages_ms = sorted(self._flush_ms), sorted(self._ages_ms)
+            return {
+                "saves": self._saves,
+                "writes": self._writes,
+                "coalescing_ratio": round(self._saves / self._writes, 2) if self._writes else None,
+                "pending": len(self._pending),
+                "flush_ms_p50": _percentile(flush_ms, 0.5),
+                "flush_ms_p99": _percentile(flush_ms, 0.99),
+                "dirty_ms_p99": _percentile(ages_ms, 0.99),
+            }
+
+    def flush_at_exit(self):
+        """Flushes on interpreter exit, and turns SIGTERM into a normal shutdown (so `bot.close()` runs)."""
+        atexit.register(self.flush)
+        if threading.current_thread() is threading.main_thread() and hasattr(signal, "SIGTERM"):
+            if signal.getsignal(signal.SIGTERM) is signal.SIG_DFL:
+                signal.signal(signal.SIGTERM, _raise_interrupt)
+
+def _raise_interrupt(signum, frame):
+    raise KeyboardInterrupt  # ✅ discord.py's `bot.run()` closes the bot on this, like Ctrl+C
+
+def _percentile(values, fraction):
+    if not values:
+        return None
+    return round(values[min(len(values) - 1, int(len(values) * fraction))], 2)